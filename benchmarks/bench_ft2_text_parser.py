@@ -0,0 +1,143 @@
+"""Benchmark for the streaming Fridge-tag 2 text parser (src/ingestion/ft2_parser.py).
+
+Generates synthetic multi-year FT2 history exports and reports throughput
+(lines/sec) and peak memory for both the streaming generator and the
+`parse()` compatibility wrapper. Throughput is timed without tracemalloc;
+memory (tracemalloc peak and peak RSS) is measured in a fresh process per
+scenario.
+
+Usage:
+    python -m benchmarks.bench_ft2_text_parser --days 1095 --files 20
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.ingestion.ft2_parser import FT2Parser
+
+
+def write_synthetic_export(path: str, days: int, serial: str = "130600112764", seed: int = 0) -> int:
+    """Writes a synthetic FT2 text export with `days` history records. Returns the line count."""
+    rng = random.Random(seed)
+    lines = [
+        "Device: Q-tag Fridge-tag 2 E",
+        "Vers: 0.5",
+        "Conf:",
+        f" Serial: {serial}",
+        " Temp unit: C",
+        " Alarm:",
+        "  0:",
+        "   T AL: -0.5, t AL: 60",
+        "  1:",
+        "   T AL: +8.0, t AL: 600",
+        f" Report history length: {days}",
+        "Hist:",
+        " TS Actv: 2021-08-07 07:36",
+    ]
+    start = date(2026, 1, 1)
+    for i in range(1, days + 1):
+        base = rng.uniform(-3.0, 14.0)
+        t_min, t_max = base - rng.uniform(0, 2), base + rng.uniform(0, 4)
+        lines += [
+            f" {i}:",
+            f"  Date: {(start - timedelta(days=i)).isoformat()}",
+            f"  Min T: {t_min:+.1f}, TS Min T: 03:12",
+            f"  Max T: {t_max:+.1f}, TS Max T: 15:47",
+            f"  Avrg T: {base:+.1f}",
+            "  Alarm:",
+            "   0:",
+            f"    t Acc: {60 if t_min < -0.5 else 0}",
+            "   1:",
+            f"    t Acc: {rng.randint(0, 900) if t_max > 8.0 else 0}, TS A: 11:35, C A: 0",
+            "  Int Sensor timeout:",
+            "   t AccST: 0",
+            "  Events: 0",
+        ]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    return len(lines)
+
+
+def _count_stream(ft2: FT2Parser, path: str) -> int:
+    # The streaming path only holds one day record at a time
+    return sum(1 for _ in ft2.iter_history(path))
+
+
+def _count_wrapper(ft2: FT2Parser, path: str) -> int:
+    return len(ft2.parse(path)['history'])
+
+
+SCENARIOS = {
+    "iter_history (stream)": _count_stream,
+    "parse (wrapper)": _count_wrapper,
+}
+
+
+def _run(label: str, paths) -> int:
+    ft2, count = FT2Parser(), SCENARIOS[label]
+    return sum(count(ft2, p) for p in paths)
+
+
+def _memory_pass(label: str, paths):
+    """Runs in a fresh process: (tracemalloc peak in bytes, peak RSS in MiB or None)."""
+    tracemalloc.start()
+    _run(label, paths)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    try:
+        import resource
+    except ImportError:
+        # No getrusage on Windows: the tracemalloc peak is all we report there
+        return traced_peak, None
+    # ru_maxrss is reported in kilobytes on Linux
+    return traced_peak, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(label: str, paths, total_lines: int):
+    # Throughput without tracemalloc: tracing every allocation inflates the per-line cost
+    start = time.perf_counter()
+    records = _run(label, paths)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss never goes down, so each scenario's memory is measured in its own fresh process
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        traced_peak, rss_mb = pool.submit(_memory_pass, label, paths).result()
+
+    line = (f"{label:<22} {records:>10} records  {total_lines / elapsed:>12,.0f} lines/s  "
+            f"traced peak {traced_peak / 1024:>9,.1f} KiB")
+    if rss_mb is not None:
+        line += f"  peak RSS {rss_mb:,.1f} MiB"
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the streaming FT2 text parser")
+    parser.add_argument('--days', type=int, default=3 * 365, help='history days per export')
+    parser.add_argument('--files', type=int, default=10, help='number of exports')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths, total_lines = [], 0
+        for n in range(args.files):
+            p = os.path.join(tmp, f"bench_{n}.txt")
+            total_lines += write_synthetic_export(p, args.days, serial=f"1306001{n:05d}", seed=n)
+            paths.append(p)
+
+        print(f"{args.files} files x {args.days} days = {total_lines:,} lines")
+        for label in SCENARIOS:
+            _measure(label, paths, total_lines)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Regression benchmark for per-file processing in scripts/run_ft2_pipeline.py.
+
+`process_ft2_file_new` used to re-read the whole input directory for every
+file (F files -> F x F parses) and re-link everything each time. This
+benchmark processes F synthetic exports one by one, counts the parser calls
+and fails unless they equal the file count and every center holds exactly
+one batch per file.
+
+Usage:
+    python -m benchmarks.bench_process_ft2_files --files 50 --rows 2000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.application.dtos.center_dto import CenterDTO
+from src.ft2_reader.parser.ft2_parser import FT2Parser
+from src.ft2_reader.services.ft2_linker import DeviceIndex
+from scripts.run_ft2_pipeline import process_ft2_file_new
+
+
+def write_exports(directory: str, files: int, rows: int, seed: int = 0):
+    """One CSV per device (device D<i> belongs to center C<i>). Returns the paths."""
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(files):
+        temps = np.round(5.0 + rng.normal(0.0, 2.0, rows), 1)
+        path = os.path.join(directory, f"d{i}.csv")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("device_id,timestamp,temperature\n")
+            for k, temp in enumerate(temps.tolist()):
+                f.write(f"D{i},2024-01-{1 + k // 96:02d}T{(k % 96) // 4:02d}:{15 * (k % 4):02d}:00,{temp}\n")
+        paths.append(path)
+    return paths
+
+
+class ParseCounter:
+    """Counts FT2Parser calls (object and columnar paths) while active."""
+
+    def __init__(self):
+        self.calls = 0
+        self._originals = {}
+
+    def __enter__(self):
+        for name in ('parse_file', 'parse_file_columnar'):
+            original = getattr(FT2Parser, name)
+            self._originals[name] = original
+
+            def counted(*args, _original=original, **kwargs):
+                self.calls += 1
+                return _original(*args, **kwargs)
+
+            setattr(FT2Parser, name, staticmethod(counted))
+        return self
+
+    def __exit__(self, *exc):
+        for name, original in self._originals.items():
+            setattr(FT2Parser, name, staticmethod(original))
+
+
+def run(files: int, rows: int) -> dict:
+    """Processes `files` exports one by one; returns parse calls, batches per center and seconds."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_exports(tmp, files, rows)
+        centers = [CenterDTO(id=f"C{i}", name=f"Center {i}", device_ids=[f"D{i}"]) for i in range(files)]
+        device_index = DeviceIndex(centers)
+
+        with ParseCounter() as counter:
+            start = time.perf_counter()
+            for path in paths:
+                process_ft2_file_new(path, centers, device_index)
+            seconds = time.perf_counter() - start
+
+    return {
+        'files': files,
+        'parse_calls': counter.calls,
+        'batches_per_center': sorted({len(c.reading_batches) for c in centers}),
+        'seconds': seconds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that per-file processing parses each file once")
+    parser.add_argument('--files', type=int, default=50, help='number of exports (one device each)')
+    parser.add_argument('--rows', type=int, default=2000, help='readings per export')
+    args = parser.parse_args(argv)
+
+    result = run(args.files, args.rows)
+    print(f"{result['files']} files x {args.rows:,} rows: {result['parse_calls']} parse calls, "
+          f"{result['seconds'] * 1e3:,.1f} ms ({result['seconds'] * 1e3 / result['files']:.2f} ms/file)")
+
+    if result['parse_calls'] != result['files'] or result['batches_per_center'] != [1]:
+        raise SystemExit(f"regression: {result['parse_calls']} parse calls for {result['files']} files, "
+                         f"batches per center {result['batches_per_center']}")
+
+
+if __name__ == "__main__":
+    main()
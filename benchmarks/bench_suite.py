@@ -0,0 +1,316 @@
+"""Timed end-to-end scenarios for the FT2 pipeline on a synthetic fleet.
+
+Generates a fleet with benchmarks/fleet.py, writes it as CSV and FT2 text
+exports, then times each stage on its own: parsing, linking,
+calculate_center_stats, apply_rules, EvaluateColdChainSafetyUC.execute, the
+centers CSV report and the PDF report. Every scenario runs `--repeat` times
+with a fresh, untimed setup and the best wall time is kept.
+
+Results are written as JSON. With `--baseline` the run is compared against a
+stored result for the same fleet and exits non-zero when a scenario is more
+than `--tolerance` slower.
+
+Usage:
+    python -m benchmarks.bench_suite --devices 100 --days 30 --output data/output/bench.json
+    python -m benchmarks.bench_suite --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import importlib.util
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.fleet import Fleet, FleetSpec, generate_fleet
+from src.application.dtos.center_dto import CenterDTO
+from src.application.use_cases.evaluate_cold_chain_safety_uc import EvaluateColdChainSafetyUC
+from src.core.entities.temperature_reading import TemperatureReading
+from src.core.entities.vaccine import Vaccine
+from src.core.services.rules_engine import apply_rules, calculate_center_stats
+from src.ft2_reader.parser.ft2_parser import FT2Parser
+from src.ft2_reader.services.ft2_linker import DeviceIndex, FT2Linker
+from src.ingestion.ft2_parser import FT2Parser as FT2TextParser
+from src.reporting.csv_reporter import generate_centers_report
+
+
+class Workspace:
+    """The fleet and everything derived from it, built once and shared by the scenarios."""
+
+    def __init__(self, fleet: Fleet, directory: str, devices_per_center: int = 1):
+        self.fleet = fleet
+        self.directory = directory
+        self.devices_per_center = devices_per_center
+        self._cache: Dict[str, Any] = {}
+
+    def _cached(self, key: str, build: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def csv_paths(self) -> List[str]:
+        return self._cached('csv', lambda: self.fleet.write_csv(os.path.join(self.directory, 'csv')))
+
+    @property
+    def text_paths(self) -> List[str]:
+        return self._cached('ft2', lambda: self.fleet.write_ft2_text(os.path.join(self.directory, 'ft2')))
+
+    @property
+    def batches(self) -> list:
+        return self._cached('batches', lambda: [FT2Parser.parse_file_columnar(p) for p in self.csv_paths])
+
+    @property
+    def report_path(self) -> str:
+        def build():
+            path = os.path.join(self.directory, 'centers_report.tsv')
+            generate_centers_report(self.evaluated_centers, path)
+            return path
+        return self._cached('report', build)
+
+    @property
+    def reader(self) -> '_FleetReader':
+        return self._cached('reader', lambda: _FleetReader(self.fleet))
+
+    @property
+    def evaluated_centers(self) -> List[CenterDTO]:
+        def build():
+            centers = self.linked_centers()
+            for center in centers:
+                apply_rules(center)
+            return centers
+        return self._cached('evaluated', build)
+
+    def centers(self) -> List[CenterDTO]:
+        """Fresh, unlinked centers (`devices_per_center` consecutive devices each)."""
+        ids = self.fleet.device_ids
+        step = self.devices_per_center
+        return [CenterDTO(id=f"C{k // step}", name=f"Center {k // step}", device_ids=list(ids[k:k + step]))
+                for k in range(0, len(ids), step)]
+
+    def linked_centers(self) -> List[CenterDTO]:
+        centers = self.centers()
+        index = DeviceIndex(centers)
+        for batch in self.batches:
+            FT2Linker.link_batch(batch, index)
+        return centers
+
+
+class _FleetReader:
+    """In-memory reader for EvaluateColdChainSafetyUC: one vaccine per device."""
+
+    def __init__(self, fleet: Fleet):
+        self.vaccine_ids = fleet.device_ids
+        stamps = [datetime.fromtimestamp(t, tz=timezone.utc).replace(tzinfo=None) for t in fleet.timestamps.tolist()]
+        self.readings = [TemperatureReading(device_id, value, recorded_at)
+                         for device_id, temps in zip(fleet.device_ids, fleet.temperatures.tolist())
+                         for value, recorded_at in zip(temps, stamps)]
+
+    def get_vaccines(self) -> List[Vaccine]:
+        return [Vaccine(id=v, name=v, full_loss_threshold_low=-0.5, full_loss_threshold_high=40.0,
+                        shelf_life_days=30, reference_table=[]) for v in self.vaccine_ids]
+
+    def read_all(self) -> List[TemperatureReading]:
+        return self.readings
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    unit: str
+    setup: Callable[[Workspace], Any]   # untimed, once per repeat
+    run: Callable[[Any], int]           # timed; returns the number of units processed
+    requires: Optional[str] = None      # optional module the scenario needs
+
+
+def _parse_csv(paths):
+    return sum(len(FT2Parser.parse_file_columnar(p)) for p in paths)
+
+
+def _parse_csv_objects(paths):
+    return sum(len(FT2Parser.parse_file(p)) for p in paths)
+
+
+def _parse_ft2_text(paths):
+    parser = FT2TextParser()
+    return sum(sum(1 for _ in parser.iter_history(p)) for p in paths)
+
+
+def _link(state):
+    batches, index = state
+    return sum(FT2Linker.link_batch(batch, index).linked for batch in batches)
+
+
+def _center_stats(centers):
+    for center in centers:
+        calculate_center_stats(center)
+    return len(centers)
+
+
+def _apply_rules(centers):
+    for center in centers:
+        apply_rules(center)
+    return len(centers)
+
+
+def _csv_report(state):
+    centers, path = state
+    generate_centers_report(centers, path)
+    return len(centers)
+
+
+def _pdf_report(state):
+    from src.reporting.unified_pdf_generator import ReportType, UnifiedPDFGenerator
+
+    output_dir, tsv_path, rows = state
+    UnifiedPDFGenerator(output_dir=output_dir).generate(ReportType.TECHNICAL, tsv_path, filename="bench.pdf")
+    return rows
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario('parse_csv', 'readings', lambda ws: ws.csv_paths, _parse_csv),
+    Scenario('parse_csv_objects', 'readings', lambda ws: ws.csv_paths, _parse_csv_objects),
+    Scenario('parse_ft2_text', 'days', lambda ws: ws.text_paths, _parse_ft2_text),
+    Scenario('link', 'readings', lambda ws: (ws.batches, DeviceIndex(ws.centers())), _link),
+    Scenario('center_stats', 'centers', lambda ws: ws.linked_centers(), _center_stats),
+    Scenario('apply_rules', 'centers', lambda ws: ws.linked_centers(), _apply_rules),
+    Scenario('evaluate_uc', 'vaccines',
+             lambda ws: EvaluateColdChainSafetyUC(ws.reader),
+             lambda uc: len(uc.execute())),
+    Scenario('csv_report', 'centers',
+             lambda ws: (ws.evaluated_centers, os.path.join(ws.directory, 'bench_report.tsv')), _csv_report),
+    Scenario('pdf_report', 'centers',
+             lambda ws: (os.path.join(ws.directory, 'pdf'), ws.report_path, len(ws.evaluated_centers)),
+             _pdf_report, requires='reportlab'),
+]
+
+
+def run_scenario(scenario: Scenario, workspace: Workspace, repeat: int) -> Dict[str, Any]:
+    if scenario.requires and importlib.util.find_spec(scenario.requires) is None:
+        return {'skipped': f"{scenario.requires} is not installed"}
+
+    times, items = [], 0
+    for _ in range(repeat):
+        state = scenario.setup(workspace)
+        start = time.perf_counter()
+        items = scenario.run(state)
+        times.append(time.perf_counter() - start)
+
+    best = min(times)
+    return {
+        'seconds': best,
+        'mean_seconds': sum(times) / len(times),
+        'items': items,
+        'unit': scenario.unit,
+        'per_second': items / best if best > 0 else None,
+    }
+
+
+def run_suite(spec: FleetSpec, repeat: int = 3, devices_per_center: int = 1,
+              only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Runs the selected scenarios on a fresh fleet; returns the JSON-ready results."""
+    unknown = set(only or ()) - {s.name for s in SCENARIOS}
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {sorted(unknown)}")
+
+    fleet = generate_fleet(spec)
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Workspace(fleet, tmp, devices_per_center)
+        for scenario in SCENARIOS:
+            if only and scenario.name not in only:
+                continue
+            results[scenario.name] = run_scenario(scenario, workspace, repeat)
+
+    return {
+        'fleet': dict(asdict(spec), readings=len(fleet), devices_per_center=devices_per_center),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+        },
+        'repeat': repeat,
+        'scenarios': results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25,
+            min_delta_seconds: float = 0.005) -> List[str]:
+    """
+    Regressions against a baseline: scenarios more than `tolerance` slower (best time).
+    Slowdowns under `min_delta_seconds` are timer noise on tiny scenarios and are ignored.
+    """
+    if results['fleet'] != baseline.get('fleet'):
+        return [f"baseline fleet {baseline.get('fleet')} differs from this run {results['fleet']}"]
+
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name, {})
+        if 'seconds' not in current or 'seconds' not in previous:
+            continue
+        if (current['seconds'] > previous['seconds'] * (1 + tolerance)
+                and current['seconds'] - previous['seconds'] > min_delta_seconds):
+            regressions.append(f"{name}: {current['seconds'] * 1e3:,.1f} ms vs baseline "
+                               f"{previous['seconds'] * 1e3:,.1f} ms (+{current['seconds'] / previous['seconds'] - 1:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the FT2 pipeline stages on a synthetic fleet")
+    parser.add_argument('--devices', type=int, default=100)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--cadence', type=int, default=15, help='minutes between readings')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--devices-per-center', type=int, default=1, dest='devices_per_center')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', nargs='+', choices=[s.name for s in SCENARIOS], help='scenarios to run')
+    parser.add_argument('--output', help='write the results JSON here')
+    parser.add_argument('--baseline', help='results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown vs baseline (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, dest='min_delta_ms',
+                        help='ignore slowdowns smaller than this')
+    parser.add_argument('--verbose', action='store_true', help='keep per-file INFO logs')
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    spec = FleetSpec(devices=args.devices, days=args.days, cadence_minutes=args.cadence, seed=args.seed)
+    results = run_suite(spec, repeat=args.repeat, devices_per_center=args.devices_per_center, only=args.only)
+
+    print(f"{spec.devices} devices x {spec.days} days every {spec.cadence_minutes} min = "
+          f"{results['fleet']['readings']:,} readings, best of {args.repeat}")
+    for name, r in results['scenarios'].items():
+        if 'skipped' in r:
+            print(f"  {name:<18} skipped ({r['skipped']})")
+        else:
+            print(f"  {name:<18} {r['seconds'] * 1e3:>10,.1f} ms  {r['per_second'] or 0:>14,.0f} {r['unit']}/s")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"results -> {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta_ms / 1e3)
+        if regressions:
+            raise SystemExit("regression:\n  " + "\n  ".join(regressions))
+        print(f"no regression vs {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
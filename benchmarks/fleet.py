@@ -0,0 +1,242 @@
+"""Synthetic fleet generator for the benchmark suite.
+
+Builds temperature traces for a whole fleet of Fridge-tag devices in a few
+NumPy passes (no per-reading Python loop) and writes them as CSV exports
+(FT2Parser / run_ft2_pipeline input) or FT2 text history exports
+(src/ingestion/ft2_parser.py input).
+
+Each device follows an excursion profile: a base temperature with a daily
+cycle and noise, plus randomly placed excursions (heat, freeze, power
+outage) of fixed magnitude and length.
+
+Usage:
+    python -m benchmarks.fleet --devices 200 --days 30 --out data/bench_fleet --format csv ft2
+"""
+
+import os
+import sys
+import argparse
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.ft2_reader.models.reading_batch import ReadingBatch
+
+
+@dataclass(frozen=True)
+class ExcursionProfile:
+    """Temperature behaviour of one device class."""
+    base_temp: float
+    noise: float = 0.5
+    daily_amplitude: float = 1.0
+    excursions_per_day: float = 0.0     # probability of one excursion starting on a given day
+    excursion_delta: float = 0.0        # °C added during an excursion
+    excursion_hours: float = 0.0
+
+
+EXCURSION_PROFILES: Dict[str, ExcursionProfile] = {
+    'stable': ExcursionProfile(base_temp=5.0),
+    'heat': ExcursionProfile(base_temp=6.0, excursions_per_day=0.3, excursion_delta=7.0, excursion_hours=3.0),
+    'freeze': ExcursionProfile(base_temp=3.0, excursions_per_day=0.2, excursion_delta=-6.0, excursion_hours=2.0),
+    'outage': ExcursionProfile(base_temp=5.0, excursions_per_day=0.05, excursion_delta=15.0, excursion_hours=8.0),
+}
+
+
+@dataclass(frozen=True)
+class FleetSpec:
+    devices: int = 100
+    days: int = 30
+    cadence_minutes: int = 15
+    # profile name -> share of the fleet
+    profile_mix: Dict[str, float] = field(default_factory=lambda: {'stable': 0.7, 'heat': 0.15,
+                                                                   'freeze': 0.1, 'outage': 0.05})
+    start: str = "2024-01-01"
+    seed: int = 0
+
+    @property
+    def readings_per_day(self) -> int:
+        return 24 * 60 // self.cadence_minutes
+
+    @property
+    def readings_per_device(self) -> int:
+        return self.days * self.readings_per_day
+
+
+@dataclass(frozen=True, eq=False)
+class Fleet:
+    """Dense fleet traces: every device shares the same timestamp grid."""
+    spec: FleetSpec
+    device_ids: Tuple[str, ...]
+    profiles: Tuple[str, ...]           # profile name per device
+    timestamps: np.ndarray              # int64 epoch seconds, shape (readings,)
+    temperatures: np.ndarray            # float32 °C, shape (devices, readings)
+
+    def __len__(self) -> int:
+        return self.temperatures.size
+
+    def to_batch(self) -> ReadingBatch:
+        """The whole fleet as one columnar batch (device-major order)."""
+        devices, readings = self.temperatures.shape
+        return ReadingBatch(
+            timestamps=np.tile(self.timestamps, devices),
+            temperatures=self.temperatures.ravel(),
+            durations=np.full(devices * readings, self.spec.cadence_minutes, dtype=np.float32),
+            device_codes=np.repeat(np.arange(devices, dtype=np.int32), readings),
+            vaccine_codes=np.zeros(devices * readings, dtype=np.int32),
+            batch_codes=np.zeros(devices * readings, dtype=np.int32),
+            device_ids=self.device_ids, vaccine_types=("UNKNOWN",), batches=("UNKNOWN",),
+        )
+
+    def write_csv(self, directory: str) -> List[str]:
+        """One CSV export per device (FT2Parser header). Returns the paths."""
+        os.makedirs(directory, exist_ok=True)
+        stamps = [s + "," for s in np.datetime_as_string(self.timestamps.astype('datetime64[s]'), unit='s').tolist()]
+        # Temperatures are on a 0.1 °C grid: format each distinct value once and index into the table
+        tenths = np.rint(self.temperatures * 10).astype(np.int64)
+        low = int(tenths.min()) if tenths.size else 0
+        table = np.array([f"{v / 10:.1f}" for v in range(low, int(tenths.max(initial=low)) + 1)], dtype=object)
+
+        paths = []
+        for k, device_id in enumerate(self.device_ids):
+            prefix = f"{device_id},"
+            temps = table[tenths[k] - low].tolist()
+            path = os.path.join(directory, f"{self.profiles[k]}_{device_id}.csv")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("device_id,timestamp,temperature\n")
+                f.write("\n".join([prefix + stamp + temp for stamp, temp in zip(stamps, temps)]))
+                f.write("\n")
+            paths.append(path)
+        return paths
+
+    def daily_summaries(self) -> Dict[str, np.ndarray]:
+        """Per device and day: min/max/avg, time of min/max and alarm minutes (shape (devices, days))."""
+        per_day = self.spec.readings_per_day
+        days = self.temperatures.reshape(len(self.device_ids), self.spec.days, per_day).astype(np.float64)
+        cadence = self.spec.cadence_minutes
+        return {
+            'min': days.min(axis=2),
+            'max': days.max(axis=2),
+            'avg': days.mean(axis=2),
+            'min_minute': days.argmin(axis=2) * cadence,
+            'max_minute': days.argmax(axis=2) * cadence,
+            'freeze_minutes': (days < -0.5).sum(axis=2) * cadence,
+            'heat_minutes': (days > 8.0).sum(axis=2) * cadence,
+        }
+
+    def write_ft2_text(self, directory: str) -> List[str]:
+        """One FT2 text history export per device (most recent day first). Returns the paths."""
+        os.makedirs(directory, exist_ok=True)
+        s = self.daily_summaries()
+        first_day = self.timestamps[0].astype('datetime64[s]').astype('datetime64[D]')
+        dates = np.datetime_as_string(first_day + np.arange(self.spec.days), unit='D').tolist()
+
+        paths = []
+        for k, device_id in enumerate(self.device_ids):
+            lines = [
+                "Device: Q-tag Fridge-tag 2 E",
+                "Vers: 0.5",
+                "Conf:",
+                f" Serial: {device_id}",
+                " Temp unit: C",
+                " Alarm:",
+                "  0:",
+                "   T AL: -0.5, t AL: 60",
+                "  1:",
+                "   T AL: +8.0, t AL: 600",
+                f" Report history length: {self.spec.days}",
+                "Hist:",
+                f" TS Actv: {dates[0]} 00:00",
+            ]
+            for i, d in enumerate(range(self.spec.days - 1, -1, -1), start=1):
+                lines += [
+                    f" {i}:",
+                    f"  Date: {dates[d]}",
+                    f"  Min T: {s['min'][k, d]:+.1f}, TS Min T: {_clock(s['min_minute'][k, d])}",
+                    f"  Max T: {s['max'][k, d]:+.1f}, TS Max T: {_clock(s['max_minute'][k, d])}",
+                    f"  Avrg T: {s['avg'][k, d]:+.1f}",
+                    "  Alarm:",
+                    "   0:",
+                    f"    t Acc: {s['freeze_minutes'][k, d]}",
+                    "   1:",
+                    f"    t Acc: {s['heat_minutes'][k, d]}, TS A: 00:00, C A: 0",
+                    "  Int Sensor timeout:",
+                    "   t AccST: 0",
+                    "  Events: 0",
+                ]
+            path = os.path.join(directory, f"{self.profiles[k]}_{device_id}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines))
+            paths.append(path)
+        return paths
+
+
+def _clock(minute_of_day: int) -> str:
+    return f"{int(minute_of_day) // 60:02d}:{int(minute_of_day) % 60:02d}"
+
+
+def generate_fleet(spec: FleetSpec) -> Fleet:
+    """Vectorized traces for `spec.devices` devices over `spec.days` days."""
+    if (24 * 60) % spec.cadence_minutes:
+        raise ValueError("Cadence must divide a day evenly.")
+    unknown = set(spec.profile_mix) - set(EXCURSION_PROFILES)
+    if unknown:
+        raise ValueError(f"Unknown excursion profiles: {sorted(unknown)}")
+
+    rng = np.random.default_rng(spec.seed)
+    names = list(spec.profile_mix)
+    weights = np.array([spec.profile_mix[n] for n in names], dtype=np.float64)
+    assigned = rng.choice(len(names), size=spec.devices, p=weights / weights.sum())
+    params = [EXCURSION_PROFILES[names[i]] for i in assigned]
+
+    def column(attr):
+        return np.array([getattr(p, attr) for p in params], dtype=np.float64)[:, None]
+
+    per_day, n = spec.readings_per_day, spec.readings_per_device
+    start = int(datetime.fromisoformat(spec.start).replace(tzinfo=timezone.utc).timestamp())
+    timestamps = start + np.arange(n, dtype=np.int64) * spec.cadence_minutes * 60
+
+    phase = 2 * np.pi * (np.arange(n) % per_day) / per_day
+    temps = (column('base_temp') + column('daily_amplitude') * np.sin(phase)[None, :]
+             + column('noise') * rng.standard_normal((spec.devices, n)))
+
+    # Excursions: +delta at each start, -delta at its end, then one cumulative sum per device
+    starts = (rng.random((spec.devices, spec.days)) < column('excursions_per_day'))
+    device_idx, day_idx = np.nonzero(starts)
+    begin = day_idx * per_day + rng.integers(0, per_day, len(day_idx))
+    length = np.ceil(column('excursion_hours')[device_idx, 0] * 60 / spec.cadence_minutes).astype(np.int64)
+    delta = column('excursion_delta')[device_idx, 0]
+    steps = np.zeros((spec.devices, n + 1))
+    np.add.at(steps, (device_idx, begin), delta)
+    np.add.at(steps, (device_idx, np.minimum(begin + length, n)), -delta)
+    temps += np.cumsum(steps, axis=1)[:, :n]
+
+    device_ids = tuple(str(130600000000 + i) for i in range(spec.devices))
+    return Fleet(spec, device_ids, tuple(names[i] for i in assigned), timestamps,
+                 np.round(temps, 1).astype(np.float32))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic Fridge-tag fleet")
+    parser.add_argument('--devices', type=int, default=100)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--cadence', type=int, default=15, help='minutes between readings')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True, help='output directory')
+    parser.add_argument('--format', nargs='+', choices=['csv', 'ft2'], default=['csv'])
+    args = parser.parse_args(argv)
+
+    fleet = generate_fleet(FleetSpec(devices=args.devices, days=args.days,
+                                     cadence_minutes=args.cadence, seed=args.seed))
+    if 'csv' in args.format:
+        print(f"{len(fleet.write_csv(args.out)):,} CSV exports ({len(fleet):,} readings) -> {args.out}")
+    if 'ft2' in args.format:
+        print(f"{len(fleet.write_ft2_text(args.out)):,} FT2 text exports -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
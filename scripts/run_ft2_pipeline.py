@@ -3,7 +3,7 @@ import os
 import sys
 import argparse
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 from pathlib import Path
 
@@ -14,10 +14,17 @@ from src.utils.yaml_loader import load_yaml
 from src.infrastructure.logging import get_logger
 from src.shared.di_container import create_evaluate_cold_chain_uc
 from src.infrastructure.adapters.ft2_reader_adapter import FT2ReaderAdapter
+from src.infrastructure.staged_pipeline import Stage, StagedPipeline
+from src.ft2_reader.parser.ft2_parser import FT2Parser
+from src.ft2_reader.services.ft2_linker import DeviceIndex, FT2Linker
 from src.application.dtos.center_dto import CenterDTO
 from scripts.create_test_data import create_test_data
-from src.core.services.rules_engine import calculate_center_stats, apply_rules
-from src.reporting.csv_reporter import generate_centers_report
+from src.core.services.rules_engine import (calculate_center_stats, apply_rules, has_readings, count_readings,
+                                            decision_fingerprint, RULESET_VERSION,
+                                            enable_rule_metrics, disable_rule_metrics)
+from src.reporting.csv_reporter import CentersReportWriter
+from src.infrastructure.persistence.ingestion_manifest import IngestionManifest
+from src.infrastructure import profiling
 
 
 
@@ -35,7 +42,7 @@ def setup_directories():
     
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
-        logger.debug(f"تم إنشاء/التحقق من المجلد: {directory}")
+        logger.debug("تم إنشاء/التحقق من المجلد: %s", directory)
 
 def load_centers(config_path: str = "config/center_profiles.yaml") -> List:
     """تحميل مراكز التطعيم من ملف التكوين"""
@@ -81,110 +88,336 @@ def load_centers(config_path: str = "config/center_profiles.yaml") -> List:
             except Exception:
                 centers.append(profile)
 
-        logger.info(f"تم تحميل {len(centers)} مركز تطعيم (Entities/Profiles)")
+        logger.info("تم تحميل %d مركز تطعيم (Entities/Profiles)", len(centers))
         return centers
     except Exception as e:
-        logger.critical(f"❌ خطأ حرج في تحميل تكوين المراكز: {e}")
+        logger.critical("❌ خطأ حرج في تحميل تكوين المراكز: %s", e)
         # تحسين الصمود: عدم استخدام قيم افتراضية في الأنظمة الطبية
         raise RuntimeError("فشل تحميل تكوين المراكز. تم إيقاف التشغيل لسلامة البيانات.") from e
 
 
 
-def process_ft2_file_new(file_path: str, centers: list, device_map: Dict[str, object] = None) -> Optional[dict]:
+def process_ft2_file_new(file_path: str, centers: list, device_index=None) -> Optional[dict]:
     """
-    معالجة ملف FT2 باستخدام النظام الجديد
-    
+    معالجة ملف FT2 واحد: تحليل هذا الملف فقط وربط قراءاته فقط، ثم تطبيق القواعد
+    على المراكز المتأثرة به.
+
+    Args:
+        device_index: فهرس الأجهزة (DeviceIndex) المبني مرة واحدة لكل التشغيل؛
+            يُبنى من centers إذا لم يُمرر (مكلف عند استدعائه لكل ملف).
+
     Returns:
         dict: نتائج التحليل
     """
     try:
-        logger.info(f"🔍 معالجة الملف (نظام جديد): {os.path.basename(file_path)}")
-        
-        # استخدام النظام الجديد عبر الـ Adapter والـ Use Case
-        # هذا الدّور الآن يُعهد إلى Use Case التي تتلقى Reader Adapter
-        # (التحويل الكامل إلى DTOs يحدث تدريجيًا عبر المappers)
-        reader = FT2ReaderAdapter()
-        entries = reader.read_all()
+        logger.info("🔍 معالجة الملف (نظام جديد): %s", os.path.basename(file_path))
+
+        index = DeviceIndex.of(device_index if device_index is not None else centers)
+
+        # تحليل الملف المعطى فقط (وليس كل مجلد الإدخال) وربط قراءاته فقط
+        batch = FT2Parser.parse_file_columnar(file_path)
+        FT2Linker.link_batch(batch, index)
 
-        # أثناء المرحلة المرحلية، سنبقي الربط القديم كقيمة احتياطية
-        try:
-            from src.ft2_reader.services.ft2_linker import FT2Linker
-            FT2Linker.link(entries, centers)
-        except Exception:
-            pass
-        
-        # تحليل النتائج لكل مركز
         analysis = {
             'file_path': file_path,
             'parsed_at': datetime.now().isoformat(),
-            'entries_count': len(entries),
+            'entries_count': len(batch),
             'centers_affected': [],
             'analysis': {}
         }
-        
-        # تحديد الأجهزة الموجودة في الملف الحالي لتصفية التقرير
-        current_file_device_ids = set(entry.device_id for entry in entries)
-        affected_centers = set()
-
-        # تحسين الأداء: البحث المباشر باستخدام الخريطة O(1) بدلاً من الحلقات المتداخلة
-        if device_map:
-            for device_id in current_file_device_ids:
-                if device_id in device_map:
-                    affected_centers.add(device_map[device_id])
-        else:
-            # الطريقة القديمة (للاحتياط)
-            for center in centers:
-                if any(d_id in current_file_device_ids for d_id in center.device_ids):
-                    affected_centers.add(center)
-        
-        # تجميع النتائج
-        for center in affected_centers:
-            if center.ft2_entries: # التأكد من وجود بيانات مرتبطة
-                
-                # 1. تطبيق القواعد لتحديث القرار
-                apply_rules(center)
-                
-                # 2. الحصول على الإحصائيات للتقرير
-                stats = calculate_center_stats(center)
-
-                center_analysis = {
-                    'center_id': center.id,
-                    'center_name': center.name,
-                    'entries_count': len(center.ft2_entries),
-                    'decision': center.decision,
-                    'has_freeze': stats['has_freeze'],
-                    'has_ccm_violation': stats['has_ccm_violation']
-                }
-                analysis['centers_affected'].append(center_analysis)
-        
-        logger.info(f"✅ تم معالجة {len(entries)} إدخال لـ {len(analysis['centers_affected'])} مركز")
-        
+
+        # المراكز المتأثرة: أجهزة هذا الملف عبر الفهرس O(1) لكل جهاز
+        for center in index.centers_for(batch.device_ids):
+            if not has_readings(center): # التأكد من وجود بيانات مرتبطة
+                continue
+
+            # 1. تطبيق القواعد لتحديث القرار
+            apply_rules(center)
+
+            # 2. الحصول على الإحصائيات للتقرير
+            stats = calculate_center_stats(center)
+
+            analysis['centers_affected'].append({
+                'center_id': center.id,
+                'center_name': center.name,
+                'entries_count': count_readings(center),
+                'decision': center.decision,
+                'has_freeze': stats['has_freeze'],
+                'has_ccm_violation': stats['has_ccm_violation']
+            })
+
+        logger.info("✅ تم معالجة %d إدخال لـ %d مركز", len(batch), len(analysis['centers_affected']))
+
         return analysis
-        
+
     except Exception as e:
-        logger.error(f"❌ خطأ في معالجة الملف {file_path}: {e}")
+        logger.error("❌ خطأ في معالجة الملف %s: %s", file_path, e)
         return None
 
+def _center_outcome(center) -> dict:
+    """نتيجة القرار القابلة للتخزين في سجل الإدخال"""
+    return {
+        'decision': center.decision,
+        'vvm_stage': getattr(center.vvm_stage, 'value', center.vvm_stage),
+        'decision_reasons': list(getattr(center, 'decision_reasons', [])),
+        'has_warning': getattr(center, 'has_warning', False),
+    }
+
+def _restore_center_outcome(center, outcome: dict):
+    center.decision = outcome['decision']
+    center.vvm_stage = outcome['vvm_stage']
+    center.decision_reasons = list(outcome['decision_reasons'])
+    if outcome.get('has_warning'):
+        center.has_warning = True
+
+def _parsed_files(ft2_dir: str, ft2_files: List[str], manifest: Optional[IngestionManifest],
+                  device_index: DeviceIndex, workers: int, failed_files: list,
+                  file_devices: Dict[str, Optional[List[str]]]):
+    """
+    مصدر خط المعالجة: (اسم الملف، الدفعة) لكل ملف. الملفات غير المتغيرة من سجل
+    الإدخال، والباقي بالتحليل (مجمع عمليات عند workers > 1 بعدد محدود قيد التحليل).
+
+    الملفات مجهولة الأجهزة (file_devices[f] is None) تأتي أولاً: بعد ربطها تُعرف
+    كل مراكز الملفات المتبقية، فيُمرر كل مركز للقواعد عند ربط آخر ملفاته. الملف
+    الفاشل يُسجل في failed_files ويُمرر بدفعة None ليُحتسب في خطة الملفات.
+    """
+    reader = FT2ReaderAdapter(ft2_dir, workers=workers)
+    unknown = [f for f in ft2_files if file_devices.get(f) is None]
+    known = [f for f in ft2_files if file_devices.get(f) is not None]
+    for group in (unknown, known):
+        to_parse = []
+        for ft2_file in group:
+            ft2_path = os.path.join(ft2_dir, ft2_file)
+            try:
+                batch = manifest.lookup(ft2_path) if manifest else None
+            except Exception as e:
+                logger.error("❌ فشل معالجة %s: %s", ft2_file, e)
+                failed_files.append((ft2_file, str(e)))
+                yield ft2_file, None
+                continue
+            if batch is None:
+                to_parse.append(ft2_path)
+            else:
+                yield ft2_file, batch
+
+        for ft2_path, batch in reader.iter_parsed(to_parse, columnar=True):
+            ft2_file = os.path.basename(ft2_path)
+            if manifest:
+                try:
+                    linked_centers = {c.id for c in device_index.centers_for(batch.device_ids)}
+                    manifest.store(ft2_path, batch, linked_centers)
+                except Exception as e:
+                    logger.error("❌ فشل معالجة %s: %s", ft2_file, e)
+                    failed_files.append((ft2_file, str(e)))
+                    yield ft2_file, None
+                    continue
+            yield ft2_file, batch
+        # failed_files يعاد ضبطه في كل استدعاء لـ iter_parsed
+        for path, error in reader.failed_files:
+            failed_files.append((os.path.basename(path), error))
+            yield os.path.basename(path), None
+
+class _LinkStage(Stage):
+    """
+    ربط دفعة كل ملف بالمراكز، وتمرير كل مركز للقواعد فور ربط آخر ملف من ملفاته
+    (قد يمتد المركز على عدة ملفات) بدلاً من انتظار نهاية الربط.
+
+    خطة الملفات من سجل الإدخال (file_devices): لكل مركز عدد ملفاته المعروفة التي لم
+    تُربط بعد. الملفات مجهولة الأجهزة (جديدة أو متغيرة) قد تضيف قراءات لأي مركز،
+    فلا يُمرر أي مركز قبل ربطها كلها. الملف الفاشل (دفعة None) يُحتسب كمربوط.
+
+    الخطة تُؤخذ قبل التحليل: ملف معروف تغير أثناء التشغيل قد يحمل أجهزة أخرى. أجهزته
+    الفعلية تُقارن بالخطة، وإذا كان سيضيف قراءات لمركز مُرر للقواعد بالفعل يُسجل
+    الملف فاشلاً ولا يُربط (فلا يأخذ المركز قراراً أو بصمة من قراءات ناقصة).
+    """
+    name = "link"
+
+    def __init__(self, centers: list, device_index: DeviceIndex, manifest: Optional[IngestionManifest],
+                 ft2_dir: str, ft2_files: List[str], failed_files: list,
+                 file_devices: Dict[str, Optional[List[str]]]):
+        self.centers = centers
+        self.device_index = device_index
+        self.manifest = manifest
+        self.ft2_dir = ft2_dir
+        self.ft2_paths = [os.path.join(ft2_dir, f) for f in ft2_files]
+        self.failed_files = failed_files
+        self.file_devices = file_devices
+        self.processed_files = 0
+        # معرف المركز -> مسارات الملفات التي رُبطت منها قراءاته (مصادر بصمة القرار)
+        self.center_files: Dict[str, List[str]] = {}
+
+        # معرف المركز -> عدد ملفاته المعروفة التي لم تُربط بعد
+        self.pending_files: Dict[str, int] = {}
+        self.unknown_files = 0
+        for ft2_file in ft2_files:
+            devices = file_devices.get(ft2_file)
+            if devices is None:
+                self.unknown_files += 1
+                continue
+            for center in device_index.centers_for(devices):
+                self.pending_files[center.id] = self.pending_files.get(center.id, 0) + 1
+        self.released: Set[str] = set()
+
+    def process(self, item):
+        ft2_file, batch = item
+        devices = self.file_devices.get(ft2_file)
+        if batch is not None:
+            late = self._released_outside_plan(batch, devices) if devices is not None else []
+            if late:
+                error = f"تغير الملف أثناء التشغيل وأجهزته تخص مراكز مُررت للقواعد: {', '.join(late)}"
+                logger.error("❌ فشل معالجة %s: %s", ft2_file, error)
+                self.failed_files.append((ft2_file, error))
+            else:
+                self._link(ft2_file, batch)
+
+        if devices is None:
+            self.unknown_files -= 1
+            if self.unknown_files:
+                return ()
+            # ربط آخر ملف مجهول: كل مركز لم يبق له ملف معروف جاهز
+            return self._release(self.centers)
+        for center in self.device_index.centers_for(devices):
+            self.pending_files[center.id] -= 1
+        if self.unknown_files:
+            return ()
+        return self._release(self.device_index.centers_for(devices))
+
+    def _link(self, ft2_file: str, batch):
+        try:
+            # دفعة عمودية واحدة لكل مركز
+            FT2Linker.link_batch(batch, self.device_index)
+            for center in self.device_index.centers_for(batch.device_ids):
+                self.center_files.setdefault(center.id, []).append(os.path.join(self.ft2_dir, ft2_file))
+            self.processed_files += 1
+            logger.info("✅ تمت معالجة وربط: %s", ft2_file)
+        except Exception as e:
+            logger.error("❌ فشل معالجة %s: %s", ft2_file, e)
+            self.failed_files.append((ft2_file, str(e)))
+
+    def _released_outside_plan(self, batch, planned_devices: List[str]) -> List[str]:
+        """المراكز المُمررة بالفعل التي سيربط بها الملف خارج خطته (قائمة فارغة إذا طابقها)"""
+        if set(batch.device_ids) == set(planned_devices):
+            return []
+        planned = {c.id for c in self.device_index.centers_for(planned_devices)}
+        return [c.id for c in self.device_index.centers_for(batch.device_ids)
+                if c.id not in planned and c.id in self.released]
+
+    def _release(self, candidates) -> list:
+        ready = []
+        for center in candidates:
+            if center.id not in self.released and not self.pending_files.get(center.id):
+                self.released.add(center.id)
+                ready.append(center)
+        return ready
+
+    def finish(self):
+        if self.manifest:
+            self.manifest.prune(self.ft2_paths)
+        return [c for c in self.centers if c.id not in self.released]
+
+class _RulesStage(Stage):
+    """تطبيق القواعد على كل مركز (أو استعادة قراره المخزن إذا لم تتغير مدخلاته)"""
+    name = "rules"
+
+    def __init__(self, manifest: Optional[IngestionManifest], center_files: Dict[str, List[str]]):
+        self.manifest = manifest
+        self.center_files = center_files
+        self.evaluated_centers = 0
+        self.skipped_centers = 0
+
+    def process(self, center):
+        if has_readings(center):
+            # المركز "نظيف" إذا لم تتغير قراءاته ولا إعداداته ولا نسخة القواعد منذ آخر تشغيل
+            outcome = fingerprint = None
+            if self.manifest:
+                fingerprint = self._fingerprint(center)
+            if fingerprint:
+                outcome = self.manifest.get_center_outcome(center.id)
+                if outcome and outcome.get('fingerprint') != fingerprint:
+                    outcome = None
+
+            if outcome:
+                _restore_center_outcome(center, outcome)
+                self.skipped_centers += 1
+            else:
+                apply_rules(center)
+                self.evaluated_centers += 1
+                if fingerprint:
+                    self.manifest.set_center_outcome(center.id, dict(_center_outcome(center), fingerprint=fingerprint))
+        return (center,)
+
+    def _fingerprint(self, center) -> Optional[str]:
+        """بصمة القرار من بصمات ملفات المركز في سجل الإدخال (None إذا لم يُسجل أحدها)"""
+        sources = [self.manifest.file_identity(path) for path in self.center_files.get(center.id, [])]
+        if None in sources:
+            return None
+        return decision_fingerprint(center, sources)
+
 def run_pipeline(config_path: str = "config/center_profiles.yaml", 
                  input_dir: str = "data/input_raw",
-                 output_dir: str = "data/output"):
-    """تشغيل خط المعالجة الكامل"""
+                 output_dir: str = "data/output",
+                 incremental: bool = True,
+                 cache_dir: Optional[str] = None,
+                 rule_metrics: bool = False,
+                 workers: int = 1,
+                 queue_depth: int = 4,
+                 profile: bool = False,
+                 profile_dir: Optional[str] = None):
+    """
+    تشغيل خط المعالجة الكامل
+
+    Args:
+        incremental: استخدام سجل الإدخال لإعادة تحليل الملفات المتغيرة فقط
+            وإعادة تقييم المراكز التي تغيرت قراءاتها أو إعداداتها فقط
+        cache_dir: مجلد سجل الإدخال (افتراضياً output_dir/ingestion_cache)
+        rule_metrics: قياس زمن كل قاعدة وعدد تقييماتها وقراراتها؛ يُكتب في
+            rule_metrics.json بجانب centers_report.tsv
+        workers: عمليات التحليل المتوازية (1 = في خيط المصدر)
+        queue_depth: سعة كل طابور بين المراحل (تحليل -> ربط -> قواعد -> تقرير)؛
+            المرحلة البطيئة توقف ما قبلها فلا تتراكم الدفعات المحللة في الذاكرة
+        profile: قياس الزمن الفعلي وزمن المعالج وذروة الذاكرة (tracemalloc) لكل مرحلة
+            (setup، load_centers، parse، link، rules، report) وعرض جدول في النهاية
+        profile_dir: عند تحديده مع profile تُكتب فيه ملفات cProfile (.prof) وأكبر
+            مواقع التخصيص وجدول المراحل (JSON)
+
+    Returns:
+        dict: ملخص التشغيل (الملفات المعالجة/الفاشلة، المراكز المقيّمة/المتخطاة،
+            ومقاييس القواعد والمراحل عند تفعيلها)
+    """
+    options = dict(config_path=config_path, input_dir=input_dir, output_dir=output_dir,
+                   incremental=incremental, cache_dir=cache_dir, rule_metrics=rule_metrics,
+                   workers=workers, queue_depth=queue_depth)
+    if not profile:
+        return _run_pipeline(**options)
+
+    profiling.enable_profiling(cprofile=profile_dir is not None,
+                               top_allocations=profiling.PROFILE_TOP_ALLOCATIONS if profile_dir else 0)
+    try:
+        summary = _run_pipeline(**options)
+    finally:
+        profiler = profiling.disable_profiling()
+        profiler.log_report(logger, profile_dir, label="run_ft2_pipeline")
+    if summary is not None:
+        summary['profile'] = profiler.to_dict()
+    return summary
+
+def _run_pipeline(config_path: str, input_dir: str, output_dir: str, incremental: bool,
+                  cache_dir: Optional[str], rule_metrics: bool, workers: int, queue_depth: int):
+    """جسم run_pipeline (المراحل مُعلّمة لـ profiling.stage)"""
     
     logger.info("🚀 بدء تشغيل خط معالجة FT2")
     
     # 1. إعداد المجلدات
-    setup_directories()
+    with profiling.stage("setup"):
+        setup_directories()
     
     # 2. تحميل مراكز التطعيم
-    centers = load_centers(config_path)
-    
-    # تحسين الأداء: إنشاء خريطة البحث السريع (Hash Map) للأجهزة
-    # التعقيد: O(1) للبحث بدلاً من O(N)
-    device_map = {}
-    for center in centers:
-        device_ids = getattr(center, 'device_ids', []) if not isinstance(center, dict) else center.get('device_ids', [])
-        for device_id in device_ids:
-            device_map[device_id] = center
+    with profiling.stage("load_centers"):
+        centers = load_centers(config_path)
+
+        # تحسين الأداء: فهرس الأجهزة (Hash Map) يُبنى مرة واحدة ويُعاد استخدامه لكل ملف
+        # التعقيد: O(1) للبحث بدلاً من O(N)
+        device_index = DeviceIndex(centers)
     
     # 3. تحويل الملفات الخام (إذا كانت موجودة)
     ft2_files = []
@@ -193,67 +426,69 @@ def run_pipeline(config_path: str = "config/center_profiles.yaml",
     # النظام الجديد يعالج ملفات CSV/TSV مباشرة
     ft2_dir = input_dir
     if os.path.exists(ft2_dir):
-        ft2_files = [f for f in os.listdir(ft2_dir) if f.endswith(('.csv', '.tsv'))]
+        ft2_files = sorted(f for f in os.listdir(ft2_dir) if f.endswith(('.csv', '.tsv')))
             
     if not ft2_files:
-        logger.warning(f"⚠️ لم يتم العثور على ملفات للمعالجة في: {ft2_dir}")
+        logger.warning("⚠️ لم يتم العثور على ملفات للمعالجة في: %s", ft2_dir)
         
         # اقتراح ذكي للمستخدم
         if not os.listdir(input_dir):
             logger.info("💡 تلميح: المجلد فارغ. يمكنك إنشاء بيانات اختبار باستخدام الخيار: --generate-data")
         return
 
-    logger.info(f"📁 وجد {len(ft2_files)} ملف للمعالجة في {ft2_dir}")
+    logger.info("📁 وجد %d ملف للمعالجة في %s", len(ft2_files), ft2_dir)
     
     failed_files = []
-    
-    # --- الإصلاح المعماري ---
-    # إزالة حالة الاستخدام (Use Case) والعودة إلى منطق التحليل والربط البسيط
-    # الذي يتوافق مع بنية البرنامج النصي.
-    from src.ft2_reader.parser.ft2_parser import FT2Parser
-    from src.ft2_reader.services.ft2_linker import FT2Linker
-
-    for ft2_file in ft2_files:
-        ft2_path = os.path.join(ft2_dir, ft2_file)
-        try:
-            # 1. التحليل (Parse)
-            entries = FT2Parser.parse_file(ft2_path)
-
-            # 2. الربط (Link)
-            # FT2Linker expects objects with `device_ids` and `add_ft2_entry`.
-            # Create lightweight adapters around DTOs that delegate additions to the DTO.ft2_entries list.
-            class CenterAdapter:
-                def __init__(self, dto):
-                    self._dto = dto
-                    self.device_ids = getattr(dto, 'device_ids', [])
-                def add_ft2_entry(self, entry):
-                    if not hasattr(self._dto, 'ft2_entries'):
-                        self._dto.ft2_entries = []
-                    self._dto.ft2_entries.append(entry)
-                def __getattr__(self, item):
-                    return getattr(self._dto, item)
-
-            adapters = [CenterAdapter(c) for c in centers]
-            FT2Linker.link(entries, adapters)
-
-            logger.info(f"✅ تمت معالجة وربط: {ft2_file}")
-        except Exception as e:
-            logger.error(f"❌ فشل معالجة {ft2_file}: {e}")
-            failed_files.append((ft2_file, str(e)))
-    
-    # 5. تطبيق القواعد وإنشاء التقارير
-    logger.info(" Applying rules and generating reports...")
-    
-    all_results = [] # للتوافق مع بنية التقرير القديمة
-    for center in centers:
-        if center.ft2_entries:
-            apply_rules(center)
-            all_results.append({'file_path': 'Multiple sources', 'centers_affected': [{'center_name': center.name, 'entries_count': len(center.ft2_entries)}]})
 
+    # سجل الإدخال التزايدي: الملفات غير المتغيرة تُقرأ من التخزين المؤقت
+    manifest = None
+    if incremental:
+        # القرارات المخزنة مرتبطة ببصمة كل مركز (decision_fingerprint)، والسجل كله بنسخة القواعد
+        manifest = IngestionManifest(cache_dir or os.path.join(output_dir, "ingestion_cache"),
+                                     config_fingerprint=RULESET_VERSION)
+
+    # خط معالجة مرحلي بطوابير محدودة: تحليل (المصدر) -> ربط -> قواعد -> كتابة التقرير.
+    # تحليل الملف التالي يتداخل مع ربط السابق، وكتابة صفوف التقرير مع تقييم المراكز التالية.
+    # خطة الملفات: أجهزة كل ملف غير متغير من السجل (None = غير معروفة قبل التحليل)
+    file_devices = {f: manifest.cached_device_ids(os.path.join(ft2_dir, f)) if manifest else None
+                    for f in ft2_files}
+    link_stage = _LinkStage(centers, device_index, manifest, ft2_dir, ft2_files, failed_files, file_devices)
+    rules_stage = _RulesStage(manifest, link_stage.center_files)
+    source = _parsed_files(ft2_dir, ft2_files, manifest, device_index, workers, failed_files, file_devices)
 
-    # تقرير المراكز
+    os.makedirs(output_dir, exist_ok=True)
     centers_report_path = os.path.join(output_dir, "centers_report.tsv")
-    generate_centers_report(centers, centers_report_path)
+    logger.info(" Applying rules and generating reports...")
+    if rule_metrics:
+        enable_rule_metrics()
+    try:
+        with profiling.stage("stream"), CentersReportWriter(centers_report_path) as report:
+            def write_row(center):
+                report.write(center)
+                # صف المركز كُتب: تحرير دفعات قراءاته، فالذاكرة تتبع المراكز قيد المعالجة لا الأسطول كله
+                batches = getattr(center, 'reading_batches', None)
+                if batches:
+                    batches.clear()
+
+            StagedPipeline(source, [link_stage, rules_stage], write_row, maxsize=queue_depth,
+                           profiler=profiling.active_profiler(), source_name="parse", sink_name="report").run()
+    finally:
+        metrics = disable_rule_metrics() if rule_metrics else None
+    logger.info("✅ تم إنشاء تقرير المراكز: %s", centers_report_path)
+
+    processed_files = link_stage.processed_files
+    evaluated_centers = rules_stage.evaluated_centers
+    skipped_centers = rules_stage.skipped_centers
+
+    with profiling.stage("save"):
+        if manifest:
+            manifest.save()
+            logger.info("♻️ سجل الإدخال: %d ملف من التخزين المؤقت، %d ملف أعيد تحليله",
+                        manifest.hits, manifest.misses)
+
+        if metrics:
+            metrics_path = os.path.join(output_dir, "rule_metrics.json")
+            metrics.write_json(metrics_path)
     
     # التقارير التفصيلية (تم تبسيطها لأن الربط شامل)
     reports_dir = os.path.join(output_dir, "detailed_reports")
@@ -263,17 +498,31 @@ def run_pipeline(config_path: str = "config/center_profiles.yaml",
     logger.info("%s", "\n" + ("="*70))
     logger.info("ملخص تشغيل خط المعالجة")
     logger.info("%s", "="*70)
-    logger.info("الملفات المعالجة: %d من أصل %d", len(all_results), len(ft2_files))
+    logger.info("الملفات المعالجة: %d من أصل %d", processed_files, len(ft2_files))
     logger.info("الملفات الفاشلة: %d", len(failed_files))
+    logger.info("المراكز المعاد تقييمها: %d، المتخطاة (بدون تغيير): %d", evaluated_centers, skipped_centers)
     logger.info("تقرير المراكز: %s", centers_report_path)
     logger.info("التقارير التفصيلية: %s/", reports_dir)
+    if metrics:
+        logger.info("⏱️ مقاييس القواعد (%d مركز): %s", metrics.centers, metrics_path)
+        for line in metrics.summary_lines():
+            logger.info("  %s", line)
 
     if failed_files:
         logger.warning("الملفات الفاشلة:")
         for file, error in failed_files:
             logger.warning("  - %s: %s", file, error)
     
-    logger.info(f"🏁 اكتمل خط المعالجة. انظر {output_dir} للنتائج")
+    logger.info("🏁 اكتمل خط المعالجة. انظر %s للنتائج", output_dir)
+    summary = {
+        'processed_files': processed_files,
+        'failed_files': len(failed_files),
+        'evaluated_centers': evaluated_centers,
+        'skipped_centers': skipped_centers,
+    }
+    if metrics:
+        summary['rule_metrics'] = metrics.to_dict()
+    return summary
 
 def main():
     """الدالة الرئيسية"""
@@ -298,6 +547,20 @@ def main():
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='عرض معلومات تفصيلية')
     parser.add_argument('--generate-data', action='store_true', dest='generate_data', help='إنشاء بيانات اختبار في data/input_raw')
+    parser.add_argument('--full', action='store_true',
+                       help='تجاهل سجل الإدخال وإعادة تحليل جميع الملفات')
+    parser.add_argument('--cache-dir', default=None,
+                       help='مجلد سجل الإدخال التزايدي (افتراضياً <output>/ingestion_cache)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='عدد عمليات تحليل الملفات المتوازية')
+    parser.add_argument('--queue-depth', type=int, default=4, dest='queue_depth',
+                       help='سعة الطوابير بين مراحل خط المعالجة')
+    parser.add_argument('--rule-metrics', action='store_true', dest='rule_metrics',
+                       help='قياس زمن وعدد قرارات كل قاعدة (<output>/rule_metrics.json)')
+    parser.add_argument('--profile', action='store_true',
+                       help='قياس الزمن وزمن المعالج وذروة الذاكرة لكل مرحلة')
+    parser.add_argument('--profile-dump', action='store_true', dest='profile_dump',
+                       help='مع --profile: كتابة cProfile وأكبر مواقع التخصيص في <output>/profiles')
     
     args = parser.parse_args()
     
@@ -314,10 +577,17 @@ def main():
         run_pipeline(
             config_path=args.config,
             input_dir=args.input,
-            output_dir=args.output
+            output_dir=args.output,
+            incremental=not args.full,
+            cache_dir=args.cache_dir,
+            rule_metrics=args.rule_metrics,
+            workers=args.workers,
+            queue_depth=args.queue_depth,
+            profile=args.profile or args.profile_dump,
+            profile_dir=os.path.join(args.output, "profiles") if args.profile_dump else None
         )
     except Exception as e:
-        logger.error(f"❌ خطأ غير متوقع: {e}")
+        logger.error("❌ خطأ غير متوقع: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -8,6 +8,7 @@ class CenterDTO:
     name: str
     device_ids: List[str] = field(default_factory=list)
     ft2_entries: List[Any] = field(default_factory=list)
+    reading_batches: List[Any] = field(default_factory=list)
     decision: str = "UNKNOWN"
     vvm_stage: str = "NONE"
     alert_level: Optional[str] = None
@@ -7,6 +7,7 @@ def to_center_dto(center_obj) -> CenterDTO:
         name=getattr(center_obj, 'name', ''),
         device_ids=getattr(center_obj, 'device_ids', []),
         ft2_entries=getattr(center_obj, 'ft2_entries', []),
+        reading_batches=getattr(center_obj, 'reading_batches', []),
         decision=getattr(center_obj, 'decision', 'UNKNOWN'),
         vvm_stage=getattr(center_obj, 'vvm_stage', 'NONE'),
         alert_level=getattr(center_obj, 'alert_level', None),
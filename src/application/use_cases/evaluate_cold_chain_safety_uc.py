@@ -1,17 +1,56 @@
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+import numpy as np
 from src.core.calculators.ccm_calculator import CCMCalculator
 from src.core.calculators.vvm_q10_model import VVMQ10Model
+from src.core.calculators.time_at_temperature import TimeAtTemperatureHistogram
 from src.core.entities.temperature_reading import TemperatureReading
+from src.core.value_objects.reading_series import ReadingSeries
 from src.core.enums.vvm_stage import VVMStage
 from src.application.dtos.analysis_result_dto import (
     AnalysisResultDTO,
     VaccineStatus,
 )
 from src.core.services.rules_engine import apply_rules, RulesEngine
+from src.application.use_cases.what_if_her_uc import WhatIfHeatExposureUC
 from src.utils.vaccine_library_loader import VaccineLibraryLoader
 
 
+class EvaluationTarget:
+    """
+    The object evaluated by the Rules Engine for one vaccine.
+
+    Readings are exposed as a single array-backed ReadingSeries in
+    `reading_batches` (read column-wise by the engine), not as one object
+    per reading.
+    """
+
+    def __init__(self, v_id, series: ReadingSeries, vaccine_obj):
+        self.id = v_id
+        self.critical_temp_limit = vaccine_obj.get_critical_limit()
+        self.decision = "UNKNOWN"
+        self.decision_reasons = []
+        self.vvm_stage = VVMStage.NONE
+
+        # New stability fields (v1.1.0)
+        self.is_freeze_stable = getattr(vaccine_obj, 'is_freeze_stable', False)
+        self.actions = getattr(vaccine_obj, 'actions', None) or {}
+        self.ultra_cold_chain_required = getattr(vaccine_obj, 'ultra_cold_chain_required', False)
+        self.thaw_start_time = getattr(vaccine_obj, 'thaw_start_time', None)
+        self.thaw_duration_days = getattr(vaccine_obj, 'thaw_duration_days', 0)
+
+        # Range metadata for Rule Engine (v1.1.0)
+        self.temperature_ranges = {'min': 2.0, 'max': 8.0}
+        self.decision_thresholds = {
+            'freeze_threshold': 0.0,
+            'ccm_limit': 14400 # Default 10 days (safety margin)
+        }
+
+        # Rules engine reads temperatures / durations (minutes) as arrays
+        self.ft2_entries = []
+        self.reading_batches = [series]
+
+
 class EvaluateColdChainSafetyUC:
     """
     The central orchestrator for evaluating vaccine cold chain safety.
@@ -39,6 +78,9 @@ class EvaluateColdChainSafetyUC:
         self.repository = repository
         self.ccm_calculator = CCMCalculator()
         self.rules_engine = RulesEngine()
+        # Time-at-temperature histograms from the last execute(), for what-if HER
+        self.histograms: Dict[str, TimeAtTemperatureHistogram] = {}
+        self.shelf_life_hours: Dict[str, float] = {}
 
     def execute(self) -> List[AnalysisResultDTO]:
         """
@@ -49,7 +91,7 @@ class EvaluateColdChainSafetyUC:
             including decisions, VVM stages, and recommendations.
         """
         vaccines = self.reader.get_vaccines()
-        readings = self.reader.read_all()
+        readings_by_vaccine = self._group_readings_by_vaccine(self.reader.read_all())
 
         results: List[AnalysisResultDTO] = []
 
@@ -72,66 +114,32 @@ class EvaluateColdChainSafetyUC:
                 vaccine.ultra_cold_chain_required = lib_data.get('ultra_cold_chain_required', vaccine.ultra_cold_chain_required)
                 vaccine.thaw_duration_days = thaw_cfg.get('thaw_duration_days', vaccine.thaw_duration_days)
 
-            v_readings = [r for r in readings if r.vaccine_id == vaccine.id]
+            # Already in chronological order (see _group_readings_by_vaccine)
+            v_readings = readings_by_vaccine.get(vaccine.id)
 
             if not v_readings:
                 continue
-            
-            # Sort readings by timestamp to process them chronologically
-            v_readings.sort(key=lambda r: r.recorded_at)
 
-            # 1. CCM calculation
-            ccm_result = self.ccm_calculator.calculate(v_readings)
+            # Parallel temperature / duration arrays shared by Q10 and the rules engine
+            series = ReadingSeries.from_readings(v_readings)
+
+            # 1. CCM calculation (fused delta + AUC pass over the series arrays)
+            ccm_result = self.ccm_calculator.calculate(series)
             ccm_val = ccm_result.get("ccm_delta", 0.0)
 
             # 2. Q10 Model Calculation (Scientific Logic)
             model = VVMQ10Model(q10_value=vaccine.q10_value, ideal_temp=vaccine.ideal_temp)
-            q10_segments = self._prepare_readings_for_q10(v_readings)
-            degradation_hours = model.calculate_cumulative_degradation_hours(q10_segments)
+            q10_temps, q10_hours = self._prepare_q10_arrays(series)
+            degradation_hours = model.calculate_cumulative_degradation_hours_array(q10_temps, q10_hours)
 
             # 3. Calculate Heat Exposure Ratio (HER)
             shelf_life_hours = vaccine.shelf_life_days * 24
             her = degradation_hours / shelf_life_hours if shelf_life_hours > 0 else 1.0
+            self.histograms[vaccine.id] = TimeAtTemperatureHistogram.from_arrays(q10_temps, q10_hours * 60.0)
+            self.shelf_life_hours[vaccine.id] = shelf_life_hours
 
             # 4. Use Centralized Rules Engine for Decision
-            class EvaluationTarget:
-                def __init__(self, v_id, readings_list, vaccine_obj):
-                    self.id = v_id
-                    self.critical_temp_limit = vaccine_obj.get_critical_limit()
-                    self.decision = "UNKNOWN"
-                    self.decision_reasons = []
-                    self.vvm_stage = VVMStage.NONE
-                    
-                    # New stability fields (v1.1.0)
-                    self.is_freeze_stable = getattr(vaccine_obj, 'is_freeze_stable', False)
-                    self.actions = getattr(vaccine_obj, 'actions', {})
-                    self.ultra_cold_chain_required = getattr(vaccine_obj, 'ultra_cold_chain_required', False)
-                    self.thaw_start_time = getattr(vaccine_obj, 'thaw_start_time', None)
-                    self.thaw_duration_days = getattr(vaccine_obj, 'thaw_duration_days', 0)
-
-                    # Range metadata for Rule Engine (v1.1.0)
-                    self.temperature_ranges = {'min': 2.0, 'max': 8.0} 
-                    self.decision_thresholds = {
-                        'freeze_threshold': 0.0,
-                        'ccm_limit': 14400 # Default 10 days (safety margin)
-                    }
-
-                    # Rules engine needs an object with ft2_entries (with durations)
-                    self.ft2_entries = []
-                    for i in range(len(readings_list)):
-                        reading = readings_list[i]
-                        if i < len(readings_list) - 1:
-                            duration = (readings_list[i+1].recorded_at - reading.recorded_at).total_seconds() / 60.0
-                        else:
-                            duration = 0.0
-                        
-                        entry = type('obj', (object,), {
-                            'temperature': reading.value,
-                            'duration_minutes': duration
-                        })
-                        self.ft2_entries.append(entry)
-
-            target = EvaluationTarget(vaccine.id, v_readings, vaccine)
+            target = EvaluationTarget(vaccine.id, series, vaccine)
             apply_rules(target, extra_stats={
                 'her': her, 
                 'ccm_delta': ccm_val,
@@ -208,21 +216,31 @@ class EvaluateColdChainSafetyUC:
 
         return results
 
-    def _prepare_readings_for_q10(self, readings: List[TemperatureReading]) -> List[Tuple[float, float]]:
+    @staticmethod
+    def _group_readings_by_vaccine(readings: List[TemperatureReading]) -> Dict[str, List[TemperatureReading]]:
+        """
+        Partitions readings by vaccine_id in one pass after a single stable sort
+        by timestamp, so every group is already chronological (the "presorted"
+        contract passed on to the calculators).
         """
-        Converts a list of TemperatureReading objects into segments of (temperature, duration_in_hours)
+        groups: Dict[str, List[TemperatureReading]] = {}
+        for reading in sorted(readings, key=lambda r: r.recorded_at):
+            group = groups.get(reading.vaccine_id)
+            if group is None:
+                group = groups[reading.vaccine_id] = []
+            group.append(reading)
+        return groups
+
+    def what_if_her(self, q10_value: float, ideal_temp: float) -> Dict[str, float]:
         """
-        if len(readings) < 2:
-            return []
+        Re-evaluates HER per vaccine under hypothetical Q10 parameters using the
+        histograms kept from the last execute(), without re-reading any data.
+        """
+        return WhatIfHeatExposureUC(self.histograms, self.shelf_life_hours).evaluate(q10_value, ideal_temp)
 
-        q10_segments = []
-        for i in range(len(readings) - 1):
-            start_reading = readings[i]
-            end_reading = readings[i+1]
-            
-            duration_hours = (end_reading.recorded_at - start_reading.recorded_at).total_seconds() / 3600.0
-            temp_for_segment = start_reading.value
-            
-            q10_segments.append((temp_for_segment, duration_hours))
-            
-        return q10_segments
+    def _prepare_q10_arrays(self, series: ReadingSeries) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (temperature, duration_in_hours) arrays for each segment between consecutive
+        readings, reusing the durations the series took from one vectorized diff.
+        """
+        return series.temperatures[:-1], series.durations[:-1] / 60.0
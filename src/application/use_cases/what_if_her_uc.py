@@ -0,0 +1,114 @@
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from src.core.calculators.time_at_temperature import (
+    GRID_SIZE,
+    TimeAtTemperatureHistogram,
+    her_from_hours,
+)
+from src.core.calculators.vvm_q10_model import get_acceleration_table, temperature_grid_indices
+from src.core.value_objects.reading_series import segment_minutes
+
+if TYPE_CHECKING:
+    from src.ft2_reader.models.reading_batch import ReadingBatch
+
+DEFAULT_SHELF_LIFE_DAYS = 30
+
+
+def shelf_life_hours_by_vaccine(vaccines: Iterable) -> Dict[str, float]:
+    """مدة الصلاحية بالساعات لكل لقاح من ملفاته الشخصية (نفس ميزانية HER في حالة التقييم)"""
+    return {v.id: v.shelf_life_days * 24 for v in vaccines if getattr(v, 'shelf_life_days', None) is not None}
+
+
+class WhatIfHeatExposureUC:
+    """
+    إعادة تقييم HER تحت معاملات افتراضية ("ماذا لو كان Q10 = 2.5؟") من مدرجات
+    الوقت عند كل درجة حرارة وحدها، دون إعادة قراءة أو تحليل القراءات.
+
+    كل نقطة في شبكة المعاملات = ضرب مصفوفة المدرجات (مفاتيح × خانات) في متجه
+    معاملات التسارع المخزّن مؤقتاً لهذا الملف الشخصي.
+    """
+
+    def __init__(self, histograms: Mapping[str, TimeAtTemperatureHistogram],
+                 shelf_life_hours: Union[float, Mapping[str, float]] = DEFAULT_SHELF_LIFE_DAYS * 24):
+        self.keys: List[str] = sorted(histograms)
+        self.histograms = {k: histograms[k] for k in self.keys}
+        if isinstance(shelf_life_hours, Mapping):
+            self.shelf_life_hours = np.array([shelf_life_hours[k] for k in self.keys], dtype=np.float64)
+        else:
+            self.shelf_life_hours = np.full(len(self.keys), float(shelf_life_hours))
+
+        self._minutes = (np.vstack([self.histograms[k].minutes for k in self.keys])
+                         if self.keys else np.zeros((0, GRID_SIZE)))
+        self._outlier_keys = [i for i, k in enumerate(self.keys) if self.histograms[k].outliers]
+
+    @classmethod
+    def from_batch(cls, batch: 'ReadingBatch', shelf_life_hours: float = DEFAULT_SHELF_LIFE_DAYS * 24,
+                   vaccine_shelf_life_hours: Optional[Mapping[str, float]] = None) -> 'WhatIfHeatExposureUC':
+        """
+        بناء مدرج لكل (جهاز / لقاح) من دفعة عمودية في مرور واحد (bincount).
+        المفتاح: "device_id/vaccine_type".
+
+        المقاطع كما في EvaluateColdChainSafetyUC: قراءات كل مفتاح مرتبة زمنياً، ومدة كل
+        قراءة = الزمن حتى التالية (segment_minutes)، والقراءة الأخيرة لا تُحتسب.
+        مدة الصلاحية لكل لقاح من vaccine_shelf_life_hours، وإلا shelf_life_hours.
+        """
+        n_vaccines = max(len(batch.vaccine_types), 1)
+        pair_codes = batch.device_codes.astype(np.int64) * n_vaccines + batch.vaccine_codes
+        order = np.lexsort((batch.timestamps, pair_codes))
+        minutes, has_next = segment_minutes(pair_codes[order], batch.timestamps[order])
+        pairs, inverse = np.unique(pair_codes[order], return_inverse=True)
+        order, minutes, inverse = order[has_next], minutes[has_next], inverse[has_next]
+        vaccines = [batch.vaccine_types[p % n_vaccines] for p in pairs.tolist()]
+        keys = [f"{batch.device_ids[p // n_vaccines]}/{v}" for p, v in zip(pairs.tolist(), vaccines)]
+
+        temps = batch.temperatures[order].astype(np.float64)
+        idx, in_range = temperature_grid_indices(temps)
+        flat = inverse[in_range] * GRID_SIZE + idx[in_range]
+        matrix = np.bincount(flat, weights=minutes[in_range],
+                             minlength=len(keys) * GRID_SIZE).reshape(len(keys), GRID_SIZE)
+
+        histograms = {key: TimeAtTemperatureHistogram(matrix[i]) for i, key in enumerate(keys)}
+        for row in np.flatnonzero(~in_range).tolist():
+            histograms[keys[inverse[row]]].add(temps[row:row + 1], minutes[row:row + 1])
+
+        vaccine_shelf_life_hours = vaccine_shelf_life_hours or {}
+        shelf_life = {key: vaccine_shelf_life_hours.get(v, shelf_life_hours) for key, v in zip(keys, vaccines)}
+        return cls(histograms, shelf_life)
+
+    def degradation_hours(self, q10_value: float, ideal_temp: float) -> np.ndarray:
+        """ساعات التدهور لكل مفتاح (بترتيب self.keys)"""
+        table = get_acceleration_table(float(q10_value), float(ideal_temp))
+        if not np.isfinite(table.factors).all():
+            return np.array([self.histograms[k].degradation_hours(q10_value, ideal_temp) for k in self.keys])
+
+        hours = self._minutes @ table.factors / 60.0
+        for i in self._outlier_keys:
+            hours[i] = self.histograms[self.keys[i]].degradation_hours(q10_value, ideal_temp)
+        return hours
+
+    def evaluate(self, q10_value: float, ideal_temp: float) -> Dict[str, float]:
+        """HER لكل مفتاح تحت المعاملات المعطاة"""
+        her = her_from_hours(self.degradation_hours(q10_value, ideal_temp), self.shelf_life_hours)
+        return dict(zip(self.keys, her.tolist()))
+
+    def sweep(self, q10_values: Iterable[float], ideal_temps: Iterable[float]) -> List[Dict]:
+        """
+        تقييم شبكة معاملات كاملة. يعيد صفاً لكل (q10, ideal_temp) يحتوي HER لكل مفتاح
+        وملخصاً للأسطول.
+        """
+        ideal_temps = list(ideal_temps)
+        rows = []
+        for q10_value in q10_values:
+            for ideal_temp in ideal_temps:
+                her = her_from_hours(self.degradation_hours(q10_value, ideal_temp), self.shelf_life_hours)
+                rows.append({
+                    'q10_value': float(q10_value),
+                    'ideal_temp': float(ideal_temp),
+                    'her': dict(zip(self.keys, her.tolist())),
+                    'mean_her': float(her.mean()) if her.size else 0.0,
+                    'max_her': float(her.max()) if her.size else 0.0,
+                    'over_budget': int((her >= 1.0).sum()),
+                })
+        return rows
@@ -1,5 +1,7 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
+import numpy as np
 from src.core.entities.temperature_reading import TemperatureReading
+from src.core.value_objects.reading_series import ReadingSeries
 
 # ccm_calculator.py (مُحسّن)
 class CCMCalculator:
@@ -9,12 +11,16 @@ class CCMCalculator:
         self.threshold = threshold
         self.method = method  # "delta", "auc", "both"
     
-    def calculate_delta(self, readings: List[TemperatureReading]) -> float:
-        """الطريقة الأصلية (الفروقات المطلقة)"""
+    def calculate_delta(self, readings: List[TemperatureReading], presorted: bool = False) -> float:
+        """الطريقة الأصلية (الفروقات المطلقة)
+
+        presorted=True: المستدعي يضمن أن القراءات مرتبة زمنياً (يتم تخطي الفرز)
+        """
         if len(readings) < 2:
             return 0.0
         
-        readings = sorted(readings, key=lambda r: r.recorded_at)
+        if not presorted:
+            readings = sorted(readings, key=lambda r: r.recorded_at)
         ccm = 0.0
         prev_temp = readings[0].value
         
@@ -26,12 +32,14 @@ class CCMCalculator:
         
         return ccm
     
-    def calculate_auc(self, readings: List[TemperatureReading], base_temp: float = 8.0) -> float:
+    def calculate_auc(self, readings: List[TemperatureReading], base_temp: float = 8.0,
+                      presorted: bool = False) -> float:
         """حساب المساحة تحت المنحنى فوق درجة حرارة أساسية"""
         if len(readings) < 2:
             return 0.0
         
-        readings = sorted(readings, key=lambda r: r.recorded_at)
+        if not presorted:
+            readings = sorted(readings, key=lambda r: r.recorded_at)
         total_auc = 0.0
         
         for i in range(len(readings) - 1):
@@ -51,10 +59,68 @@ class CCMCalculator:
         
         return total_auc
     
-    def calculate(self, readings: List[TemperatureReading]) -> Dict[str, float]:
-        """إرجاع جميع المقاييس"""
+    def calculate(self, readings, presorted: bool = False) -> Dict[str, float]:
+        """إرجاع جميع المقاييس في مرور واحد مدمج (الفروقات + المساحة)
+
+        readings: قائمة TemperatureReading، أو ReadingSeries (مرتبة بطبيعتها) فتُحسب
+            مباشرة من مصفوفاتها. الدفعات العمودية الأخرى (مثل ReadingBatch: مدة لكل
+            قراءة وأجهزة مختلطة) مرفوضة؛ استخدم calculate_arrays لكل جهاز.
+        presorted=True: المستدعي يضمن أن القراءات مرتبة زمنياً (يتم تخطي الفرز)
+        """
+        if isinstance(readings, ReadingSeries):
+            return self.calculate_series(readings)
+        if hasattr(readings, 'temperatures'):
+            raise TypeError(f"Unsupported columnar readings ({type(readings).__name__}); "
+                            "use calculate_arrays with one device's sorted timestamps and temperatures.")
+
+        if not presorted:
+            readings = sorted(readings, key=lambda r: r.recorded_at)
+        n = len(readings)
+        if n < 2:
+            return self._result(0.0, 0.0)
+
+        # إزاحات زمنية بالثواني (طرح واحد لكل قراءة) بدلاً من طرح datetime لكل خطوة
+        t0 = readings[0].recorded_at
+        seconds = np.fromiter(((r.recorded_at - t0).total_seconds() for r in readings), dtype=np.float64, count=n)
+        temps = np.fromiter((r.value for r in readings), dtype=np.float64, count=n)
+        return self._result(*self._fused(temps, np.diff(seconds) / 60.0))
+
+    def calculate_arrays(self, epoch_seconds, temperatures, base_temp: float = 8.0) -> Dict[str, float]:
+        """نظير calculate لمصفوفتين متوازيتين مرتبتين زمنياً (ثواني epoch، درجات الحرارة)"""
+        seconds = np.asarray(epoch_seconds, dtype=np.float64)
+        temps = np.asarray(temperatures, dtype=np.float64)
+        if seconds.shape != temps.shape or temps.ndim != 1:
+            raise ValueError("Timestamps and temperatures must be 1-D arrays of equal length.")
+        return self._result(*self._fused(temps, np.diff(seconds) / 60.0, base_temp))
+
+    def calculate_series(self, series, base_temp: float = 8.0) -> Dict[str, float]:
+        """من ReadingSeries (مرتبة زمنياً): durations[i] = الدقائق حتى القراءة التالية"""
+        temps = np.asarray(series.temperatures, dtype=np.float64)
+        durations = np.asarray(series.durations, dtype=np.float64)
+        return self._result(*self._fused(temps, durations[:-1], base_temp))
+
+    def _fused(self, temps: np.ndarray, step_minutes: np.ndarray, base_temp: float = 8.0) -> Tuple[float, float]:
+        """(ccm_delta, ccm_auc) في مرور واحد: نفس منطق calculate_delta و calculate_auc"""
+        if temps.size < 2:
+            return 0.0, 0.0
+
+        deltas, areas = self.step_contributions(temps, step_minutes, base_temp)
+        return float(deltas.sum()), float(areas.sum())
+
+    def step_contributions(self, temps: np.ndarray, step_minutes: np.ndarray,
+                           base_temp: float = 8.0) -> Tuple[np.ndarray, np.ndarray]:
+        """مساهمة كل خطوة (قراءة i -> i+1) في الفروقات والمساحة (مصفوفتان بطول n-1)"""
+        deltas = np.abs(np.diff(temps))
+        deltas[deltas < self.threshold] = 0.0
+
+        excess = np.maximum(temps - base_temp, 0.0)
+        hot = (temps[:-1] > base_temp) | (temps[1:] > base_temp)
+        areas = np.where(hot, ((excess[:-1] + excess[1:]) / 2) * step_minutes, 0.0)
+        return deltas, areas
+
+    def _result(self, ccm_delta: float, ccm_auc: float) -> Dict[str, float]:
         return {
-            "ccm_delta": self.calculate_delta(readings),
-            "ccm_auc": self.calculate_auc(readings),
+            "ccm_delta": ccm_delta,
+            "ccm_auc": ccm_auc,
             "method_used": self.method
-        }
\ No newline at end of file
+        }
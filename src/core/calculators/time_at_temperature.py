@@ -0,0 +1,92 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.core.calculators.vvm_q10_model import (
+    LUT_MAX_TEMP,
+    LUT_MIN_TEMP,
+    LUT_RESOLUTION,
+    get_acceleration_table,
+    temperature_grid_indices,
+)
+
+# عدد خانات المدرج (نفس شبكة جدول معاملات التسارع: 0.1 °C من -30 إلى +60)
+GRID_SIZE = int(round((LUT_MAX_TEMP - LUT_MIN_TEMP) / LUT_RESOLUTION)) + 1
+
+
+def her_from_hours(degradation_hours, shelf_life_hours):
+    """HER = ساعات التدهور / مدة الصلاحية (1.0 إذا كانت المدة غير موجبة) - نفس منطق حالة الاستخدام"""
+    shelf = np.asarray(shelf_life_hours, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(shelf > 0, np.asarray(degradation_hours, dtype=np.float64) / shelf, 1.0)
+
+
+class TimeAtTemperatureHistogram:
+    """
+    مدرج تكراري للدقائق المقضية عند كل درجة حرارة (خانات 0.1 °C)
+
+    - قابل للدمج (جمع المدرجات) بين الملفات والأجهزة.
+    - يكفي وحده لإعادة حساب التدهور/HER تحت أي Q10 ودرجة مثالية في O(عدد الخانات)
+      دون الرجوع إلى القراءات.
+    - القراءات خارج الشبكة تُحفظ بدرجتها الدقيقة في `outliers` (نادرة).
+    """
+
+    def __init__(self, minutes: Optional[np.ndarray] = None, outliers: Optional[Dict[float, float]] = None):
+        if minutes is None:
+            minutes = np.zeros(GRID_SIZE, dtype=np.float64)
+        self.minutes = np.array(minutes, dtype=np.float64)
+        if self.minutes.shape != (GRID_SIZE,):
+            raise ValueError(f"Histogram must have {GRID_SIZE} bins.")
+        self.outliers: Dict[float, float] = dict(outliers or {})
+
+    @classmethod
+    def from_arrays(cls, temperatures, durations_minutes) -> 'TimeAtTemperatureHistogram':
+        histogram = cls()
+        histogram.add(temperatures, durations_minutes)
+        return histogram
+
+    def add(self, temperatures, durations_minutes):
+        """إضافة مقاطع (درجة الحرارة، المدة بالدقائق) إلى المدرج"""
+        temps = np.asarray(temperatures, dtype=np.float64)
+        durations = np.asarray(durations_minutes, dtype=np.float64)
+        if temps.shape != durations.shape or temps.ndim != 1:
+            raise ValueError("Temperatures and durations must be 1-D arrays of equal length.")
+
+        idx, in_range = temperature_grid_indices(temps)
+        self.minutes += np.bincount(idx[in_range], weights=durations[in_range], minlength=GRID_SIZE)
+
+        if not in_range.all():
+            outside = ~in_range
+            for temp, minutes in zip(temps[outside].tolist(), durations[outside].tolist()):
+                self.outliers[temp] = self.outliers.get(temp, 0.0) + minutes
+
+    def merge(self, other: 'TimeAtTemperatureHistogram') -> 'TimeAtTemperatureHistogram':
+        """دمج مدرج آخر في هذا المدرج (في المكان)"""
+        self.minutes += other.minutes
+        for temp, minutes in other.outliers.items():
+            self.outliers[temp] = self.outliers.get(temp, 0.0) + minutes
+        return self
+
+    def __add__(self, other: 'TimeAtTemperatureHistogram') -> 'TimeAtTemperatureHistogram':
+        return TimeAtTemperatureHistogram(self.minutes, self.outliers).merge(other)
+
+    @property
+    def total_minutes(self) -> float:
+        return float(self.minutes.sum()) + sum(self.outliers.values())
+
+    def degradation_hours(self, q10_value: float, ideal_temp: float) -> float:
+        """ساعات التدهور المكافئة تحت معاملات Q10 المعطاة (من المدرج وحده)"""
+        table = get_acceleration_table(float(q10_value), float(ideal_temp))
+        # الخانات الفارغة فقط تُتجاهل لتفادي 0 × inf
+        occupied = np.flatnonzero(self.minutes)
+        total = float(np.dot(self.minutes[occupied], table.factors[occupied]))
+
+        if self.outliers:
+            temps = np.fromiter(self.outliers.keys(), dtype=np.float64, count=len(self.outliers))
+            minutes = np.fromiter(self.outliers.values(), dtype=np.float64, count=len(self.outliers))
+            total += float(np.dot(minutes, table.model.calculate_acceleration_factors(temps)))
+
+        return total / 60.0
+
+    def her(self, q10_value: float, ideal_temp: float, shelf_life_hours: float) -> float:
+        return float(her_from_hours(self.degradation_hours(q10_value, ideal_temp), shelf_life_hours))
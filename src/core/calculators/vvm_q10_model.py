@@ -1,8 +1,41 @@
 # src/core/calculators/vvm_q10_model.py
 
 import math
+from functools import lru_cache
 from typing import List, Tuple
 
+import numpy as np
+
+# FT2 devices report temperatures at 0.1 °C over this range
+LUT_RESOLUTION = 0.1
+LUT_MIN_TEMP = -30.0
+LUT_MAX_TEMP = 60.0
+
+
+def _as_float_array(values, message: str) -> np.ndarray:
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(message)
+
+
+def temperature_grid_indices(
+    temperatures,
+    resolution: float = LUT_RESOLUTION,
+    min_temp: float = LUT_MIN_TEMP,
+    size: int = int(round((LUT_MAX_TEMP - LUT_MIN_TEMP) / LUT_RESOLUTION)) + 1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rounds temperatures to the nearest grid point. Returns (grid indices,
+    in-range mask); out-of-range and NaN entries get index 0 and False.
+    """
+    temps = _as_float_array(temperatures, "Temperatures must be numeric.")
+    with np.errstate(invalid='ignore'):
+        pos = np.rint((temps - min_temp) / resolution)
+    in_range = (pos >= 0) & (pos < size)
+    return np.where(in_range, pos, 0).astype(np.intp), in_range
+
+
 class VVMQ10Model:
     """
     A scientific utility to model vaccine shelf-life degradation using the
@@ -106,3 +139,142 @@ class VVMQ10Model:
             total_degradation_hours += degradation_for_segment
 
         return total_degradation_hours
+
+    def calculate_acceleration_factors(self, temperatures) -> np.ndarray:
+        """
+        Vectorized counterpart of `calculate_acceleration_factor`: computes the
+        factors for a whole array of temperatures in one expression.
+
+        Keeps the scalar semantics: 1.0 at or below the ideal temperature and
+        inf wherever the power overflows or is not finite.
+
+        Args:
+            temperatures (array-like): Temperature readings (°C).
+
+        Returns:
+            np.ndarray: float64 acceleration factors, same shape as the input.
+        """
+        temps = _as_float_array(temperatures, "Temperatures must be numeric.")
+
+        with np.errstate(over='ignore', invalid='ignore'):
+            factors = np.power(float(self.q10_value), (temps - self.ideal_temp) / 10.0)
+        factors = np.where(np.isfinite(factors), factors, np.inf)
+        return np.where(temps <= self.ideal_temp, 1.0, factors)
+
+    def acceleration_table(self) -> 'AccelerationFactorTable':
+        """Returns the cached 0.1 °C lookup table for this (q10_value, ideal_temp) profile."""
+        return get_acceleration_table(float(self.q10_value), float(self.ideal_temp))
+
+    def calculate_cumulative_degradation_hours_array(
+        self,
+        temperatures,
+        durations_hours,
+        quantized: bool = False
+    ) -> float:
+        """
+        Array form of `calculate_cumulative_degradation_hours`.
+
+        Takes parallel 1-D arrays instead of a list of tuples, so year-long
+        series are reduced with a single dot product instead of a Python loop.
+
+        Args:
+            temperatures (array-like): Segment temperatures (°C).
+            durations_hours (array-like): Segment durations in hours.
+            quantized (bool): Gather the factors from the profile's 0.1 °C
+                lookup table instead of computing them. Exact for inputs on
+                the grid; see `AccelerationFactorTable.max_relative_error`
+                for the bound on off-grid inputs.
+
+        Returns:
+            float: The total equivalent hours of shelf life consumed at the
+                   ideal temperature.
+        """
+        durations = _as_float_array(durations_hours, "Duration must be a non-negative number.")
+        if quantized:
+            factors = self.acceleration_table().lookup(temperatures)
+        else:
+            factors = self.calculate_acceleration_factors(temperatures)
+
+        if factors.ndim != 1 or factors.shape != durations.shape:
+            raise ValueError("Temperatures and durations must be 1-D arrays of equal length.")
+        if (durations < 0).any():
+            raise ValueError("Duration must be a non-negative number.")
+        if not durations.size:
+            return 0.0
+
+        return float(np.dot(durations, factors))
+
+
+class AccelerationFactorTable:
+    """
+    Precomputed Q10 acceleration factors for one (q10_value, ideal_temp)
+    profile on a fixed temperature grid (0.1 °C over -30…+60 °C by default).
+
+    A lookup rounds each temperature to the nearest grid point and gathers
+    its factor, so a degradation total becomes an index gather plus a dot
+    product. Temperatures outside the grid fall back to the exact formula.
+    """
+
+    def __init__(
+        self,
+        q10_value: float,
+        ideal_temp: float,
+        resolution: float = LUT_RESOLUTION,
+        min_temp: float = LUT_MIN_TEMP,
+        max_temp: float = LUT_MAX_TEMP
+    ):
+        if resolution <= 0 or max_temp < min_temp:
+            raise ValueError("Lookup table grid must have a positive resolution and max_temp >= min_temp.")
+
+        self.model = VVMQ10Model(q10_value=q10_value, ideal_temp=ideal_temp)
+        self.resolution = resolution
+        self.min_temp = min_temp
+        self.size = int(round((max_temp - min_temp) / resolution)) + 1
+
+        # Rounded so grid points equal the decimal readings the devices report
+        self.temperatures = np.round(min_temp + np.arange(self.size) * resolution, 6)
+        self.factors = self.model.calculate_acceleration_factors(self.temperatures)
+        self.temperatures.setflags(write=False)
+        self.factors.setflags(write=False)
+
+    @property
+    def max_relative_error(self) -> float:
+        """
+        Upper bound on |lookup(t) / exact(t) - 1| for any in-range t.
+
+        Rounding moves t by at most resolution / 2, and ln(factor) changes by
+        at most ln(q10) / 10 per °C (it is flat at or below ideal_temp), so the
+        error is at most q10 ** (resolution / 20) - 1 (~0.35% for Q10 = 2 at
+        0.1 °C). Inputs exactly on the grid are exact.
+        """
+        return math.expm1(abs(math.log(self.model.q10_value)) * self.resolution / 20.0)
+
+    def indices(self, temperatures) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (grid indices, in-range mask). Out-of-range and NaN entries get
+        index 0 and False in the mask.
+        """
+        return temperature_grid_indices(temperatures, self.resolution, self.min_temp, self.size)
+
+    def lookup(self, temperatures) -> np.ndarray:
+        """Acceleration factors for `temperatures` (exact outside the grid)."""
+        temps = _as_float_array(temperatures, "Temperatures must be numeric.")
+        idx, in_range = self.indices(temps)
+        factors = self.factors[idx]
+        if not in_range.all():
+            factors = np.array(factors)
+            outside = ~in_range
+            factors[outside] = self.model.calculate_acceleration_factors(temps[outside])
+        return factors
+
+
+@lru_cache(maxsize=64)
+def get_acceleration_table(
+    q10_value: float,
+    ideal_temp: float,
+    resolution: float = LUT_RESOLUTION,
+    min_temp: float = LUT_MIN_TEMP,
+    max_temp: float = LUT_MAX_TEMP
+) -> AccelerationFactorTable:
+    """Per-profile table cache: one table per (q10_value, ideal_temp) in use."""
+    return AccelerationFactorTable(q10_value, ideal_temp, resolution, min_temp, max_temp)
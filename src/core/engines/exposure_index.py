@@ -0,0 +1,135 @@
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.core.calculators.time_at_temperature import her_from_hours
+from src.core.calculators.vvm_q10_model import VVMQ10Model
+from src.core.value_objects.reading_series import segment_minutes
+
+if TYPE_CHECKING:
+    from src.ft2_reader.models.reading_batch import ReadingBatch
+
+
+class ExposureIndex:
+    """
+    فهرس تعرض تراكمي لكل جهاز لاستعلامات HER على أي مدى زمني.
+
+    لكل جهاز: توقيتات القراءات مرتبة ومجموعان تراكميان (ساعات التدهور المرجحة بـ Q10،
+    ودقائق تجاوز الحد الأعلى). أي استعلام [start, end) = بحثان ثنائيان وطرح.
+
+    كل قراءة تحمل مقطعها حتى القراءة التالية للجهاز (فرق التوقيتات، كما في حالة
+    التقييم)، فاستعلام المدى يجمع المقاطع بين قراءاته دون مقطع آخرها.
+
+    التخزين مسطح (CSR): مصفوفات كل الأجهزة متتالية و offsets[k]:offsets[k+1] شريحة
+    الجهاز k. التوقيتات بثوانٍ منذ 1970 (نفس ReadingBatch).
+    """
+
+    def __init__(self, device_ids: Tuple[str, ...], offsets: np.ndarray, timestamps: np.ndarray,
+                 cum_degradation_hours: np.ndarray, cum_above_limit_minutes: np.ndarray,
+                 q10_value: float, ideal_temp: float, max_limit: float):
+        self.device_ids = tuple(device_ids)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.cum_degradation_hours = np.asarray(cum_degradation_hours, dtype=np.float64)
+        self.cum_above_limit_minutes = np.asarray(cum_above_limit_minutes, dtype=np.float64)
+        self.q10_value = float(q10_value)
+        self.ideal_temp = float(ideal_temp)
+        self.max_limit = float(max_limit)
+        if len(self.offsets) != len(self.device_ids) + 1:
+            raise ValueError("Exposure index needs one offset per device plus one.")
+        self._positions = {d: k for k, d in enumerate(self.device_ids)}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __contains__(self, device_id: str) -> bool:
+        return device_id in self._positions
+
+    @classmethod
+    def from_batch(cls, batch: 'ReadingBatch', q10_model: VVMQ10Model, max_limit: float = 8.0) -> 'ExposureIndex':
+        """بناء الفهرس من دفعة عمودية (فرز واحد، ثم مجموع تراكمي لكل جهاز)"""
+        order = np.lexsort((batch.timestamps, batch.device_codes))
+        codes = batch.device_codes[order]
+        timestamps = batch.timestamps[order].astype(np.int64)
+        temps = batch.temperatures[order].astype(np.float64)
+        minutes, _ = segment_minutes(codes, timestamps)
+
+        degradation = minutes / 60.0 * q10_model.calculate_acceleration_factors(temps)
+        above = np.where(temps > max_limit, minutes, 0.0)
+
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.empty(0, dtype=np.int64)
+        ends = np.r_[starts[1:], len(codes)].astype(np.int64)
+        cum_degradation = np.empty(len(codes))
+        cum_above = np.empty(len(codes))
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            # مجموع لكل جهاز على حدة (بدون تراكم أخطاء تقريب بين الأجهزة)
+            np.cumsum(degradation[start:end], out=cum_degradation[start:end])
+            np.cumsum(above[start:end], out=cum_above[start:end])
+
+        device_ids = tuple(batch.device_ids[c] for c in codes[starts].tolist())
+        offsets = np.r_[starts, len(codes)].astype(np.int64)
+        return cls(device_ids, offsets, timestamps, cum_degradation, cum_above,
+                   q10_model.q10_value, q10_model.ideal_temp, max_limit)
+
+    def _cumulative_at(self, cumulative: np.ndarray, start: int, position: int) -> float:
+        """المجموع التراكمي لأول position قراءة من شريحة تبدأ عند start"""
+        return float(cumulative[start + position - 1]) if position > 0 else 0.0
+
+    def query(self, device_id: str, start: int, end: int, shelf_life_hours: Optional[float] = None
+              ) -> Dict[str, float]:
+        """
+        التعرض المتراكم للجهاز للقراءات ذات التوقيت في [start, end) (ثوانٍ منذ 1970):
+        مقاطع ما بين هذه القراءات، أي نفس HER لو قُيّمت وحدها في حالة التقييم.
+
+        Returns:
+            Dict: readings، degradation_hours، above_limit_minutes، و her إذا أُعطيت مدة الصلاحية.
+        """
+        k = self._positions.get(device_id)
+        if k is None:
+            raise KeyError(device_id)
+        first, last = int(self.offsets[k]), int(self.offsets[k + 1])
+        timestamps = self.timestamps[first:last]
+        lo = int(np.searchsorted(timestamps, start, side='left'))
+        hi = int(np.searchsorted(timestamps, end, side='left'))
+        hi = max(hi, lo)
+        # مقطع آخر قراءة في المدى يمتد إلى قراءة خارجه
+        last = max(hi - 1, lo)
+
+        result = {
+            'readings': hi - lo,
+            'degradation_hours': max(self._cumulative_at(self.cum_degradation_hours, first, last)
+                                     - self._cumulative_at(self.cum_degradation_hours, first, lo), 0.0),
+            'above_limit_minutes': max(self._cumulative_at(self.cum_above_limit_minutes, first, last)
+                                       - self._cumulative_at(self.cum_above_limit_minutes, first, lo), 0.0),
+        }
+        if shelf_life_hours is not None:
+            result['her'] = float(her_from_hours(result['degradation_hours'], shelf_life_hours))
+        return result
+
+    def save_npz(self, path: str):
+        """حفظ الفهرس في ملف .npz (بدون pickle)"""
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                device_ids=np.array(self.device_ids, dtype=str),
+                offsets=self.offsets,
+                timestamps=self.timestamps,
+                cum_degradation_hours=self.cum_degradation_hours,
+                cum_above_limit_minutes=self.cum_above_limit_minutes,
+                params=np.array([self.q10_value, self.ideal_temp, self.max_limit], dtype=np.float64),
+            )
+
+    @classmethod
+    def load_npz(cls, path: str) -> 'ExposureIndex':
+        with np.load(path, allow_pickle=False) as data:
+            q10_value, ideal_temp, max_limit = data['params'].tolist()
+            return cls(
+                device_ids=tuple(str(v) for v in data['device_ids']),
+                offsets=data['offsets'],
+                timestamps=data['timestamps'],
+                cum_degradation_hours=data['cum_degradation_hours'],
+                cum_above_limit_minutes=data['cum_above_limit_minutes'],
+                q10_value=q10_value,
+                ideal_temp=ideal_temp,
+                max_limit=max_limit,
+            )
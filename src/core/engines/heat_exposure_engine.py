@@ -1,35 +1,124 @@
 # heat_exposure_engine.py (مُحسّن)
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Hashable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
 class HeatExposureEngine:
+    """
+    حساب HER من الجدول المرجعي القديم (درجة الحرارة °C، أقصى دقائق تعرض).
+
+    الجدول يُرتب ويُحوّل إلى مصفوفات مرة واحدة عند الإنشاء: الاستيفاء الفردي
+    ببحث ثنائي (bisect) والدفعي بـ np.interp على مصفوفة درجات كاملة. للمسارين عقد
+    واحد: درجات الجدول منتهية وغير مكررة (وإلا ValueError)، ودرجة الحرارة NaN
+    تأخذ مدة آخر نقطة في الجدول كما في المسح الخطي الأصلي.
+    """
+
     def __init__(self, reference_table: List[Tuple[float, int]]):
         self.reference_table = sorted(reference_table, key=lambda x: x[0])
-    
+        self._temp_points = [float(t) for t, _ in self.reference_table]
+        if not all(np.isfinite(self._temp_points)):
+            raise ValueError("Reference table temperatures must be finite.")
+        duplicates = sorted({a for a, b in zip(self._temp_points, self._temp_points[1:]) if a == b})
+        if duplicates:
+            raise ValueError(f"Reference table repeats temperatures: {duplicates}")
+        self._temps = np.array(self._temp_points, dtype=np.float64)
+        self._durations = np.array([d for _, d in self.reference_table], dtype=np.float64)
+        self._temps.setflags(write=False)
+        self._durations.setflags(write=False)
+
+    @classmethod
+    def for_vaccine(cls, vaccine) -> 'HeatExposureEngine':
+        """المحرك المخزّن مؤقتاً لجدول اللقاح المرجعي (محرك واحد لكل جدول مميز)"""
+        return get_heat_exposure_engine(vaccine.reference_table)
+
     def compute_her(self, temperature: float, exposure_minutes: int) -> float:
         full_duration = self._linear_interpolate_duration(temperature)
         her = exposure_minutes / full_duration if full_duration > 0 else 0
         return min(her, 1.0)
-    
+
+    def compute_her_batch(self, temperatures, exposure_minutes) -> np.ndarray:
+        """نظير compute_her لمصفوفتين متوازيتين (درجات الحرارة، دقائق التعرض)"""
+        minutes = np.asarray(exposure_minutes, dtype=np.float64)
+        full_durations = self.interpolate_durations(temperatures)
+        if full_durations.shape != minutes.shape:
+            raise ValueError("Temperatures and exposure minutes must have the same shape.")
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            her = np.where(full_durations > 0, minutes / full_durations, 0.0)
+        return np.minimum(her, 1.0)
+
+    def interpolate_durations(self, temperatures) -> np.ndarray:
+        """استيفاء خطي دفعي (np.interp): القيم خارج الجدول تأخذ قيمة الطرف الأقرب"""
+        temps = np.asarray(temperatures, dtype=np.float64)
+        if not self._temps.size:
+            return np.zeros_like(temps)
+        return np.where(np.isnan(temps), self._durations[-1], np.interp(temps, self._temps, self._durations))
+
     def _linear_interpolate_duration(self, temp: float) -> float:
         """استيفاء خطي بين نقطتين في الجدول المرجعي"""
         if not self.reference_table:
             return 0
-        
+
+        # NaN لا يقع في أي فترة: مدة آخر نقطة (كالمسح الخطي الأصلي)
+        if temp != temp:
+            return float(self.reference_table[-1][1])
+
         # إذا كانت درجة الحرارة أقل من أو تساوي أول قيمة
         if temp <= self.reference_table[0][0]:
             return float(self.reference_table[0][1])
-        
+
         # إذا كانت درجة الحرارة أكبر من أو تساوي آخر قيمة
         if temp >= self.reference_table[-1][0]:
             return float(self.reference_table[-1][1])
-        
-        # البحث عن الفترة المناسبة للاستيفاء
-        for i in range(len(self.reference_table) - 1):
-            temp_low, duration_low = self.reference_table[i]
-            temp_high, duration_high = self.reference_table[i + 1]
-            
-            if temp_low <= temp <= temp_high:
-                # الاستيفاء الخطي
-                ratio = (temp - temp_low) / (temp_high - temp_low)
-                interpolated = duration_low + ratio * (duration_high - duration_low)
-                return interpolated
-        
-        return float(self.reference_table[-1][1])
\ No newline at end of file
+
+        # البحث الثنائي عن الفترة المناسبة: temp_low < temp <= temp_high
+        i = bisect_left(self._temp_points, temp)
+        temp_low, duration_low = self.reference_table[i - 1]
+        temp_high, duration_high = self.reference_table[i]
+
+        # الاستيفاء الخطي
+        ratio = (temp - temp_low) / (temp_high - temp_low)
+        return duration_low + ratio * (duration_high - duration_low)
+
+
+@lru_cache(maxsize=128)
+def _engine_for_table(table_key: Tuple[Tuple[float, int], ...]) -> HeatExposureEngine:
+    return HeatExposureEngine(list(table_key))
+
+
+def get_heat_exposure_engine(reference_table: Sequence[Tuple[float, int]]) -> HeatExposureEngine:
+    """محرك مخزّن مؤقتاً لكل جدول مرجعي مميز (يُعاد استخدامه بين اللقاحات والاستدعاءات)"""
+    return _engine_for_table(tuple((float(t), d) for t, d in reference_table))
+
+
+def compute_her_fleet(reference_tables: Mapping[Hashable, Sequence[Tuple[float, int]]],
+                      keys: Sequence[Hashable], temperatures, exposure_minutes) -> np.ndarray:
+    """
+    HER بالجدول المرجعي لأسطول كامل في استدعاء واحد.
+
+    Args:
+        reference_tables: الجدول المرجعي لكل مفتاح (مثل {vaccine.id: vaccine.reference_table}).
+        keys: مفتاح الجدول لكل صف.
+        temperatures / exposure_minutes: مصفوفات متوازية بنفس طول keys.
+
+    Returns:
+        np.ndarray: HER لكل صف (بنفس ترتيب المدخلات).
+    """
+    temps = np.asarray(temperatures, dtype=np.float64)
+    minutes = np.asarray(exposure_minutes, dtype=np.float64)
+    if not (len(keys) == temps.size == minutes.size):
+        raise ValueError("keys, temperatures and exposure minutes must have the same length.")
+
+    her = np.zeros(temps.size, dtype=np.float64)
+    if not temps.size:
+        return her
+
+    unique_keys, inverse = np.unique(np.asarray(keys, dtype=object), return_inverse=True)
+    for code, key in enumerate(unique_keys.tolist()):
+        rows = inverse == code
+        engine = get_heat_exposure_engine(reference_tables[key])
+        her[rows] = engine.compute_her_batch(temps[rows], minutes[rows])
+    return her
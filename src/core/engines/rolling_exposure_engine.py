@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from src.core.calculators.ccm_calculator import CCMCalculator
+from src.core.calculators.time_at_temperature import her_from_hours
+from src.core.calculators.vvm_q10_model import VVMQ10Model
+
+if TYPE_CHECKING:
+    from src.ft2_reader.models.reading_batch import ReadingBatch
+
+# اسم النافذة -> طولها بالثواني
+DEFAULT_WINDOWS: Dict[str, int] = {
+    '24h': 24 * 3600,
+    '7d': 7 * 24 * 3600,
+    '30d': 30 * 24 * 3600,
+}
+
+
+@dataclass(frozen=True, eq=False)
+class DeviceExposureSeries:
+    """
+    سلسلة زمنية لجهاز واحد: قيمة كل نافذة عند كل قراءة (بترتيب timestamps).
+
+    النافذة عند القراءة i تشمل القراءات ذات التوقيت في (t_i - طول النافذة، t_i]؛
+    كل مقطع (تدهور Q10 وخطوة CCM) يُنسب إلى قراءة نهايته.
+    """
+    device_id: str
+    timestamps: np.ndarray              # int64 - ثوانٍ منذ 1970
+    her: Dict[str, np.ndarray]          # نافذة -> HER
+    ccm_delta: Dict[str, np.ndarray]    # نافذة -> مجموع الفروقات (°C)
+    ccm_auc: Dict[str, np.ndarray]      # نافذة -> المساحة فوق درجة الأساس (°C·دقيقة)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    out = np.empty(len(values) + 1, dtype=np.float64)
+    out[0] = 0.0
+    np.cumsum(values, out=out[1:])
+    return out
+
+
+class RollingExposureEngine:
+    """
+    HER و CCM على نوافذ متحركة (24 ساعة / 7 أيام / 30 يوماً افتراضياً) لكل جهاز.
+
+    مرور واحد على القراءات: فرز واحد (جهاز، وقت)، ثم مساهمة كل قراءة (ساعات تدهور
+    Q10، فروقات ومساحة CCM) ومجاميعها التراكمية (prefix sums). مجموع أي نافذة = فرق
+    مجموعين تراكميين عند حدّيها، فلا يُعاد جمع النافذة لكل قراءة (O(n) للمجاميع، وحدود
+    النوافذ ببحث ثنائي متجه).
+    """
+
+    def __init__(self, q10_model: VVMQ10Model,
+                 shelf_life_hours: Union[float, Mapping[str, float]],
+                 ccm_calculator: Optional[CCMCalculator] = None,
+                 windows: Optional[Mapping[str, int]] = None,
+                 base_temp: float = 8.0):
+        self.q10_model = q10_model
+        self.shelf_life_hours = shelf_life_hours
+        self.ccm_calculator = ccm_calculator or CCMCalculator()
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.base_temp = base_temp
+
+    def _shelf_life_for(self, device_id: str) -> float:
+        if isinstance(self.shelf_life_hours, Mapping):
+            return float(self.shelf_life_hours[device_id])
+        return float(self.shelf_life_hours)
+
+    def contributions(self, timestamps: np.ndarray, temperatures: np.ndarray
+                      ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        مساهمة كل قراءة لجهاز واحد مرتبة زمنياً: (ساعات التدهور، فروقات CCM، مساحة CCM).
+
+        المقطع من القراءة i-1 إلى i يُنسب إلى i (صفر للقراءة الأولى). مدته من فرق
+        التوقيتات نفسه لـ HER و CCM؛ التدهور بدرجة بداية المقطع كما في حالة التقييم.
+        """
+        temps = np.asarray(temperatures, dtype=np.float64)
+        degradation = np.zeros(len(temps))
+        deltas = np.zeros(len(temps))
+        areas = np.zeros(len(temps))
+        if len(temps) > 1:
+            step_minutes = np.diff(np.asarray(timestamps, dtype=np.float64)) / 60.0
+            degradation[1:] = step_minutes / 60.0 * self.q10_model.calculate_acceleration_factors(temps[:-1])
+            deltas[1:], areas[1:] = self.ccm_calculator.step_contributions(temps, step_minutes, self.base_temp)
+        return degradation, deltas, areas
+
+    def compute(self, batch: 'ReadingBatch') -> Dict[str, DeviceExposureSeries]:
+        """السلاسل الزمنية لكل جهاز في الدفعة"""
+        if not len(batch):
+            return {}
+
+        order = np.lexsort((batch.timestamps, batch.device_codes))
+        codes = batch.device_codes[order]
+        timestamps = batch.timestamps[order].astype(np.int64)
+        temps = batch.temperatures[order]
+
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        ends = np.r_[starts[1:], len(codes)]
+
+        series: Dict[str, DeviceExposureSeries] = {}
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            device_id = batch.device_ids[codes[start]]
+            series[device_id] = self.compute_device(device_id, timestamps[start:end], temps[start:end])
+        return series
+
+    def compute_device(self, device_id: str, timestamps, temperatures) -> DeviceExposureSeries:
+        """سلسلة جهاز واحد من مصفوفات مرتبة زمنياً"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        degradation, deltas, areas = self.contributions(timestamps, temperatures)
+        cum_degradation, cum_deltas, cum_areas = _prefix(degradation), _prefix(deltas), _prefix(areas)
+
+        shelf_life_hours = self._shelf_life_for(device_id)
+        upper = np.arange(1, len(timestamps) + 1)
+        her, ccm_delta, ccm_auc = {}, {}, {}
+        for name, seconds in self.windows.items():
+            lower = np.searchsorted(timestamps, timestamps - seconds, side='right')
+            # الفرق قد يكون سالباً بمقدار ضئيل بسبب التقريب
+            her[name] = her_from_hours(np.maximum(cum_degradation[upper] - cum_degradation[lower], 0.0),
+                                       shelf_life_hours)
+            ccm_delta[name] = np.maximum(cum_deltas[upper] - cum_deltas[lower], 0.0)
+            ccm_auc[name] = np.maximum(cum_areas[upper] - cum_areas[lower], 0.0)
+
+        return DeviceExposureSeries(device_id, timestamps, her, ccm_delta, ccm_auc)
@@ -2,6 +2,7 @@
 from dataclasses import dataclass, field
 from typing import Dict, Any, List
 from enum import Enum, auto
+import numpy as np
 
 class FreezeTolerance(Enum):
     ZERO_TOLERANCE = auto()      # أي تجميد = رفض
@@ -18,17 +19,46 @@ class VaccinationCenter:
     
     # حقول اختيارية / محسوبة
     ft2_entries: List[Any] = field(default_factory=list)
+    reading_batches: List[Any] = field(default_factory=list)  # ReadingBatch (تخزين عمودي)
     decision: str = "NO_DATA"
     vvm_stage: str = "NONE"
     
     freeze_tolerance: FreezeTolerance = FreezeTolerance.ZERO_TOLERANCE
     freeze_event_counter: Dict[str, int] = field(default_factory=dict)  # device_id -> count
     
+    # عدادات تجميد تراكمية: تُحدّث بالإدخالات والدفعات الجديدة فقط بدلاً من إعادة المسح
+    freeze_event_total: int = field(default=0, init=False, repr=False, compare=False)
+    freeze_durations: List[float] = field(default_factory=list, init=False, repr=False, compare=False)
+    _initial_freeze_counter: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _counted_entries: int = field(default=0, init=False, repr=False, compare=False)
+    _counted_list: Any = field(default=None, init=False, repr=False, compare=False)
+    _counted_batches: int = field(default=0, init=False, repr=False, compare=False)
+    _counted_batch_list: Any = field(default=None, init=False, repr=False, compare=False)
+
+    # إحصائيات المركز (تقرأها القواعد والتقارير): لا تُحسب عند الربط، بل يبنيها أو يطوي
+    # فيها الجديد فقط CenterStatsAccumulator.for_center عند أول قراءة بعد كل ربط
+    stats_accumulator: Any = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # أحداث التجميد الممررة عند الإنشاء (مثلاً من تشغيل سابق) هي نقطة بداية العد
+        self._initial_freeze_counter = dict(self.freeze_event_counter)
+        self.freeze_event_total = sum(self._initial_freeze_counter.values())
+    
     def add_ft2_entry(self, entry):
         """إضافة إدخال FT2 وتحديث القرار"""
         self.ft2_entries.append(entry)
         self._update_decision()
 
+    def add_ft2_entries(self, entries):
+        """إضافة مجموعة إدخالات دفعة واحدة (مثلاً جميع قراءات جهاز) وتحديث القرار مرة واحدة"""
+        self.ft2_entries.extend(entries)
+        self._update_decision()
+
+    def add_reading_batch(self, batch):
+        """إضافة دفعة قراءات عمودية (ReadingBatch) وتحديث القرار دون إنشاء كائن لكل صف"""
+        self.reading_batches.append(batch)
+        self._update_decision()
+
     def _apply_zero_tolerance(self):
         self.decision = "REJECTED_FREEZE_SENSITIVE"
         self.vvm_stage = "D"
@@ -39,30 +69,55 @@ class VaccinationCenter:
 
     def _update_decision(self):
         """تحديث القرار"""
-        # حساب أحداث التجميد
-        freeze_events = self._count_freeze_events()
+        # حساب أحداث التجميد (الإدخالات والدفعات الجديدة فقط)
+        self._sync_freeze_counters()
         
         # تطبيق سياسة التجميد
         if self.freeze_tolerance == FreezeTolerance.ZERO_TOLERANCE:
-            if freeze_events["total"] > 0:
+            if self.freeze_event_total > 0:
                 self._apply_zero_tolerance()
-    
-    def _count_freeze_events(self) -> Dict[str, Any]:
-        """عد أحداث التجميد وتجميع مددها"""
-        events = {
-            "total": 0,
-            "durations": [],
-            "by_device": {}
-        }
-        
-        for entry in self.ft2_entries:
+
+    def _sync_freeze_counters(self):
+        """طي الإدخالات والدفعات التي لم تُحسب بعد في عدادات التجميد (O(1) لكل إدخال)"""
+        entries, batches = self.ft2_entries, self.reading_batches
+        if (entries is not self._counted_list or len(entries) < self._counted_entries
+                or batches is not self._counted_batch_list or len(batches) < self._counted_batches):
+            # تم استبدال إحدى القائمتين أو تقليصها: إعادة العد من نقطة البداية
+            self.freeze_event_counter = dict(self._initial_freeze_counter)
+            self.freeze_event_total = sum(self.freeze_event_counter.values())
+            self.freeze_durations = []
+            self._counted_entries = self._counted_batches = 0
+            self._counted_list, self._counted_batch_list = entries, batches
+
+        for entry in entries[self._counted_entries:]:
             if hasattr(entry, 'temperature') and entry.temperature < -0.5:
-                events["total"] += 1
-                duration = getattr(entry, 'duration_minutes', 15)
-                events["durations"].append(duration)
+                self.freeze_event_total += 1
+                self.freeze_durations.append(getattr(entry, 'duration_minutes', 15))
                 
                 # تجميع حسب الجهاز
                 device_id = getattr(entry, 'device_id', 'unknown')
-                events["by_device"][device_id] = events["by_device"].get(device_id, 0) + 1
-        
-        return events
\ No newline at end of file
+                self.freeze_event_counter[device_id] = self.freeze_event_counter.get(device_id, 0) + 1
+
+        self._counted_entries = len(entries)
+
+        for batch in batches[self._counted_batches:]:
+            # نفس قاعدة الإدخالات (كل قراءة أقل من -0.5 حدث)، والحد بنوع المصفوفة (float32)
+            frozen = batch.temperatures < batch.temperatures.dtype.type(-0.5)
+            if not frozen.any():
+                continue
+            self.freeze_event_total += int(frozen.sum())
+            self.freeze_durations.extend(batch.durations[frozen].tolist())
+            per_device = np.bincount(batch.device_codes[frozen], minlength=len(batch.device_ids))
+            for code in np.flatnonzero(per_device):
+                device_id = batch.device_ids[code]
+                self.freeze_event_counter[device_id] = self.freeze_event_counter.get(device_id, 0) + int(per_device[code])
+        self._counted_batches = len(batches)
+    
+    def _count_freeze_events(self) -> Dict[str, Any]:
+        """عد أحداث التجميد وتجميع مددها"""
+        self._sync_freeze_counters()
+        return {
+            "total": self.freeze_event_total,
+            "durations": list(self.freeze_durations),
+            "by_device": dict(self.freeze_event_counter)
+        }
\ No newline at end of file
@@ -1,58 +1,275 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from collections.abc import MutableMapping
 from abc import ABC, abstractmethod
 from datetime import datetime
+import hashlib
+import json
+import time
+import numpy as np
 from src.core.enums.vvm_stage import VVMStage
+from src.core.value_objects.center_stats import CenterStatsAccumulator
 
 def calculate_center_stats(center) -> Dict[str, Any]:
     """
     حساب إحصائيات المركز بناءً على القواعد الموحدة.
     يعيد قاموساً يحتوي على المدد الزمنية وحالة الانتهاكات.
+
+    تُقرأ من مُجمّع الإحصائيات المحفوظ على المركز (CenterStatsAccumulator) الذي يطوي
+    القراءات الجديدة فقط، فتقرأ القواعد والتقارير نفس النتيجة دون إعادة المسح.
     """
-    # استخراج الإعدادات (مع قيم افتراضية آمنة)
-    temp_ranges = getattr(center, 'temperature_ranges', {})
     thresholds = getattr(center, 'decision_thresholds', {})
-    
-    max_limit = temp_ranges.get('max', 8.0)
-    freeze_threshold = thresholds.get('freeze_threshold', 0.0)
     ccm_limit = thresholds.get('ccm_limit', 600)
-    
-    entries = getattr(center, 'ft2_entries', [])
-    
-    if not entries:
-        return {
-            'freeze_duration': 0,
-            'heat_duration': 0,
-            'has_freeze': False,
-            'has_ccm_violation': False,
-            'avg_temp': 0,
-            'min_temp': 0,
-            'max_temp': 0
-        }
+    return CenterStatsAccumulator.for_center(center).to_stats(ccm_limit)
 
-    temperatures = [e.temperature for e in entries if e.temperature is not None]
-    
-    # حساب المدد الزمنية بدقة
-    freeze_duration = sum(e.duration_minutes for e in entries if e.temperature < freeze_threshold)
-    heat_duration = sum(e.duration_minutes for e in entries if e.temperature > max_limit)
-    
-    return {
-        'freeze_duration': freeze_duration,
-        'heat_duration': heat_duration,
-        'has_freeze': freeze_duration > 0, # قاعدة عدم التسامح
-        'has_ccm_violation': heat_duration > ccm_limit, # قاعدة التراكم
-        'avg_temp': sum(temperatures) / len(temperatures) if temperatures else 0,
-        'min_temp': min(temperatures) if temperatures else 0,
-        'max_temp': max(temperatures) if temperatures else 0
-    }
+# مفاتيح calculate_center_stats (المشتقة من قراءات المركز)
+CENTER_STAT_FIELDS: Tuple[str, ...] = (
+    'freeze_duration', 'heat_duration', 'has_freeze', 'has_ccm_violation', 'avg_temp', 'min_temp', 'max_temp'
+)
+
+class LazyCenterStats(MutableMapping):
+    """
+    إحصائيات المركز كقاموس كسول: حقول القراءات لا تُحسب إلا عند أول قراءة لأحدها
+    (مرور واحد عبر مُجمّع الإحصائيات) ثم تُخزّن. القيم المُمررة (extra_stats مثل HER)
+    تتقدم على المحسوبة كما في stats.update(extra_stats).
+
+    مركز منتهي الصلاحية أو HER >= 1.0 يُحسم قبل أي قاعدة تقرأ الحرارة فلا تُمسح قراءاته.
+    """
+
+    def __init__(self, center, overrides: Optional[Dict[str, Any]] = None):
+        self.center = center
+        self._values: Dict[str, Any] = dict(overrides or {})
+        self._computed: Optional[Dict[str, Any]] = None
+
+    @property
+    def computed(self) -> bool:
+        """هل حُسبت حقول القراءات؟"""
+        return self._computed is not None
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        if key not in CENTER_STAT_FIELDS:
+            raise KeyError(key)
+        if self._computed is None:
+            self._computed = calculate_center_stats(self.center)
+        return self._computed[key]
+
+    def __setitem__(self, key: str, value: Any):
+        self._values[key] = value
+
+    def __delitem__(self, key: str):
+        del self._values[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._values or key in CENTER_STAT_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        yield from CENTER_STAT_FIELDS
+        yield from (k for k in self._values if k not in CENTER_STAT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(CENTER_STAT_FIELDS) + sum(1 for k in self._values if k not in CENTER_STAT_FIELDS)
+
+# نسخة مجموعة القواعد: تُرفع عند تغيير منطق أي قاعدة لإبطال القرارات المخزنة
+RULESET_VERSION = "1.1.0"
+
+# إعدادات المركز / ملف اللقاح التي تقرأها القواعد
+_DECISION_PROFILE_ATTRS = (
+    'temperature_ranges', 'decision_thresholds', 'freeze_tolerance', 'freeze_sensitive',
+    'is_freeze_stable', 'critical_temp_limit', 'actions', 'expiry_date',
+    'ultra_cold_chain_required', 'thaw_start_time', 'thaw_duration_days',
+)
+
+def decision_fingerprint(center, sources: Optional[Iterable[str]] = None) -> str:
+    """
+    بصمة مدخلات القرار لمركز: القراءات المرتبطة + الإعدادات + نسخة القواعد.
+    تطابق البصمة يعني أن إعادة تطبيق القواعد ستعطي نفس القرار.
+
+    sources: بصمات الملفات التي رُبطت منها قراءات المركز (مثل sha256 المسجل في سجل
+        الإدخال). عند تمريرها تحل محل القراءات مع أجهزة المركز، فلا تُمسح القراءات
+        نفسها؛ وبدونها تُبصم القراءات المرتبطة مباشرة.
+    """
+    profile = {name: getattr(center, name) for name in _DECISION_PROFILE_ATTRS if hasattr(center, name)}
+    if profile.get('expiry_date') or profile.get('ultra_cold_chain_required'):
+        # قواعد الصلاحية والذوبان تعتمد على تاريخ اليوم
+        profile['today'] = datetime.now().date().isoformat()
+
+    digest = hashlib.sha256(RULESET_VERSION.encode('utf-8'))
+    digest.update(json.dumps(profile, sort_keys=True, default=str).encode('utf-8'))
+
+    if sources is not None:
+        # أجهزة المركز تحدد أي صفوف الملفات تخصه؛ ترتيب الملفات لا يغير القرار
+        digest.update(json.dumps(sorted(map(str, getattr(center, 'device_ids', [])))).encode('utf-8'))
+        digest.update(json.dumps(sorted(sources)).encode('utf-8'))
+        return digest.hexdigest()
+
+    for entry in getattr(center, 'ft2_entries', []):
+        digest.update(repr((getattr(entry, 'timestamp', None), entry.temperature,
+                            getattr(entry, 'duration_minutes', None))).encode('utf-8'))
+
+    # الدفعات: بصمة لكل دفعة ثم ترتيبها (ترتيب الملفات لا يغير القرار)
+    batch_digests = []
+    for batch in getattr(center, 'reading_batches', []):
+        batch_digest = hashlib.sha256()
+        for column in ('timestamps', 'temperatures', 'durations'):
+            values = getattr(batch, column, None)
+            if values is not None:
+                batch_digest.update(np.ascontiguousarray(values).tobytes())
+        batch_digests.append(batch_digest.hexdigest())
+    for batch_digest in sorted(batch_digests):
+        digest.update(batch_digest.encode('ascii'))
+
+    return digest.hexdigest()
+
+def has_readings(center) -> bool:
+    """هل للمركز أي قراءات مرتبطة (كائنات FT2Entry أو دفعات عمودية)؟"""
+    if getattr(center, 'ft2_entries', []):
+        return True
+    return any(len(b) for b in getattr(center, 'reading_batches', []))
+
+def count_readings(center) -> int:
+    """عدد القراءات المرتبطة بالمركز (كائنات FT2Entry + صفوف الدفعات العمودية)"""
+    return len(getattr(center, 'ft2_entries', [])) + sum(len(b) for b in getattr(center, 'reading_batches', []))
 
 # ==========================================
 # 🏗️ هيكل القواعد الجديد (Design Pattern)
 # ==========================================
 
+_MISSING = object()  # قيمة غير موجودة في عمود إحصائيات (تعادل غياب المفتاح من القاموس)
+
+class StatsTable:
+    """
+    جدول إحصائيات عمودي لعدة مراكز (عمود -> قيمة لكل مركز) يُقيَّم دفعة واحدة.
+
+    الأعمدة تُحوَّل إلى مصفوفات NumPy عند الحاجة للشروط المتجهة، بينما تُستخدم القيم
+    الأصلية لصياغة الأسباب حتى تطابق نصوص المسار الفردي حرفياً.
+    """
+
+    def __init__(self, centers: Sequence[Any], table, lazy_center_stats: bool = False):
+        """
+        Args:
+            lazy_center_stats: الجدول لا يحتوي إحصائيات القراءات؛ تُحسب عبر `ensure`
+                للصفوف التي تصلها قاعدة تحتاجها فقط.
+        """
+        self.centers = list(centers)
+        self.n = len(self.centers)
+        self._values: Dict[str, List[Any]] = {}
+        for name in table:
+            values = table[name]
+            if np.isscalar(values) or values is None:
+                values = [values] * self.n
+            self._values[name] = list(values)
+        self._arrays: Dict[Any, np.ndarray] = {}
+        self._attrs: Dict[Any, List[Any]] = {}
+        self._stats_filled = np.full(self.n, not lazy_center_stats)
+
+    def ensure(self, fields: Optional[Iterable[str]], rows: np.ndarray):
+        """
+        حساب إحصائيات القراءات الناقصة للصفوف المعطاة (مرة واحدة لكل مركز) إذا كانت
+        الحقول المطلوبة تشملها (None = كل الحقول). القيم الموجودة مسبقاً تبقى كما هي.
+        """
+        if fields is not None and not any(f in CENTER_STAT_FIELDS for f in fields):
+            return
+        pending = rows[~self._stats_filled[rows]]
+        if not pending.size:
+            return
+
+        for i in pending.tolist():
+            for key, value in calculate_center_stats(self.centers[i]).items():
+                column = self._values.get(key)
+                if column is None:
+                    column = self._values[key] = [_MISSING] * self.n
+                if column[i] is _MISSING:
+                    column[i] = value
+        self._stats_filled[pending] = True
+        self._arrays = {k: v for k, v in self._arrays.items() if k[0] not in CENTER_STAT_FIELDS}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._values
+
+    def value(self, name: str, i: int, default: Any = None) -> Any:
+        values = self._values.get(name)
+        if values is None or values[i] is _MISSING:
+            return default
+        return values[i]
+
+    def column(self, name: str, default: float = 0.0) -> np.ndarray:
+        """العمود كمصفوفة float64 (القيم الغائبة تأخذ الافتراضية)"""
+        key = (name, default)
+        if key not in self._arrays:
+            values = self._values.get(name)
+            if values is None:
+                array = np.full(self.n, default, dtype=np.float64)
+            else:
+                array = np.array([default if v is _MISSING else v for v in values], dtype=np.float64)
+            self._arrays[key] = array
+        return self._arrays[key]
+
+    def flags(self, name: str) -> np.ndarray:
+        return self.column(name, 0.0) != 0
+
+    def attr(self, name: str, default: Any = None) -> List[Any]:
+        """سمة المركز لكل صف (getattr مرة واحدة لكل مركز)"""
+        key = (name, default)
+        if key not in self._attrs:
+            self._attrs[key] = [getattr(c, name, default) for c in self.centers]
+        return self._attrs[key]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """قاموس الإحصائيات لمركز واحد (للقواعد غير المتجهة)"""
+        return {k: v[i] for k, v in self._values.items() if v[i] is not _MISSING}
+
+    def reasons(self, i: int) -> List[str]:
+        center = self.centers[i]
+        reasons = getattr(center, 'decision_reasons', None)
+        if reasons is None:
+            reasons = center.decision_reasons = []
+        return reasons
+
+def build_stats_table(centers: Sequence[Any], extra_stats: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+                      center_stats: bool = True) -> Dict[str, List[Any]]:
+    """
+    بناء جدول الإحصائيات العمودي من calculate_center_stats (المحفوظة على كل مركز)
+    مع إحصائيات إضافية اختيارية لكل مركز (مثل HER).
+
+    Args:
+        center_stats: False = الإحصائيات الإضافية فقط (لجدول كسول، انظر StatsTable.ensure).
+    """
+    rows = []
+    for i, center in enumerate(centers):
+        stats = calculate_center_stats(center) if center_stats else {}
+        if extra_stats and extra_stats[i]:
+            stats.update(extra_stats[i])
+        rows.append(stats)
+
+    table: Dict[str, List[Any]] = {}
+    for i, stats in enumerate(rows):
+        for key, value in stats.items():
+            column = table.get(key)
+            if column is None:
+                column = table[key] = [_MISSING] * len(rows)
+            column[i] = value
+    return table
+
 class DecisionRule(ABC):
     """
     Abstract Base Class for all safety decision rules.
+
+    `requires` declares the stats keys the rule reads. Center stats are only
+    computed for centers that reach a rule requiring them; None (the default
+    for custom rules) means "may read anything".
     """
+    requires: Optional[Tuple[str, ...]] = None
+
+    def evaluate_batch(self, table: StatsTable, rows: np.ndarray) -> List[Optional[str]]:
+        """
+        Evaluates the rule for many centers at once (rows = indices into the table).
+
+        The default implementation falls back to `evaluate` per center; built-in
+        rules override it with vectorized predicates producing the same outcome.
+        """
+        return [self.evaluate(table.centers[i], table.row(i)) for i in rows.tolist()]
+
     @abstractmethod
     def evaluate(self, center: Any, stats: Dict[str, Any]) -> Optional[str]:
         """
@@ -70,63 +287,140 @@ class DecisionRule(ABC):
 
 class ExpiryRule(DecisionRule):
     """قاعدة التحقق من تاريخ الصلاحية (Expiry Date)"""
-    def evaluate(self, center, stats: Dict[str, Any]) -> Optional[str]:
-        expiry_date_str = getattr(center, 'expiry_date', None)
-        if not expiry_date_str:
-            return None
+    requires = ()
 
+    @staticmethod
+    def _check(expiry_date_str: str, today) -> Optional[str]:
+        """سبب الرفض لتاريخ صلاحية (أو None إذا كان صالحاً)"""
         try:
             expiry_date = datetime.strptime(expiry_date_str, "%Y-%m-%d").date()
         except ValueError:
-            center.decision_reasons.append(f"تنسيق تاريخ صلاحية غير صالح: {expiry_date_str}")
-            return "REJECTED_EXPIRED"
+            return f"تنسيق تاريخ صلاحية غير صالح: {expiry_date_str}"
 
-        if datetime.now().date() > expiry_date:
-            center.decision_reasons.append(f"لقاح منتهي الصلاحية بتاريخ: {expiry_date_str}")
-            return "REJECTED_EXPIRED"
+        if today > expiry_date:
+            return f"لقاح منتهي الصلاحية بتاريخ: {expiry_date_str}"
+        return None
+
+    def evaluate(self, center, stats: Dict[str, Any]) -> Optional[str]:
+        expiry_date_str = getattr(center, 'expiry_date', None)
+        if not expiry_date_str:
+            return None
 
+        reason = self._check(expiry_date_str, datetime.now().date())
+        if reason:
+            center.decision_reasons.append(reason)
+            return "REJECTED_EXPIRED"
         return None
 
+    def evaluate_batch(self, table: StatsTable, rows: np.ndarray) -> List[Optional[str]]:
+        expiry = table.attr('expiry_date')
+        today = datetime.now().date()
+        checked: Dict[str, Optional[str]] = {}  # كل تاريخ مميز يُحلل مرة واحدة
+        out: List[Optional[str]] = [None] * len(rows)
+        for k, i in enumerate(rows.tolist()):
+            expiry_date_str = expiry[i]
+            if not expiry_date_str:
+                continue
+            if expiry_date_str not in checked:
+                checked[expiry_date_str] = self._check(expiry_date_str, today)
+            reason = checked[expiry_date_str]
+            if reason:
+                table.reasons(i).append(reason)
+                out[k] = "REJECTED_EXPIRED"
+        return out
+
 class FreezeRule(DecisionRule):
     """
     قاعدة التجميد: ذكية وتعتمد على صنف اللقاح (v1.1.0)
     """
-    def evaluate(self, center, stats: Dict[str, Any]) -> Optional[str]:
+    requires = ('has_freeze', 'freeze_duration')
+    NO_FREEZE = "لم يتم رصد تجميد"
+
+    @staticmethod
+    def _on_freeze(center, freeze_duration) -> Optional[str]:
+        """تسجيل سبب التجميد وإرجاع القرار (حسب حساسية اللقاح للتجميد)"""
         # استخراج حالة التجميد من اللقاح أو المركز (دعم التوافق مع freeze_sensitive)
         is_freeze_stable = getattr(center, 'is_freeze_stable', not getattr(center, 'freeze_sensitive', True))
-        
+
+        if not is_freeze_stable:
+            # لقاح حساس للتجميد - رفض فوري أو توصية باختبار الرج
+            action = getattr(center, 'actions', {}).get('on_freeze', "تلف فوري محتمل")
+            center.decision_reasons.append(f"انتهاك تجميد: {freeze_duration} دقيقة < 0°C. {action}")
+            return "REJECTED_FREEZE"
+
+        # لقاح مقاوم للتجميد (مثل OPV)
+        center.decision_reasons.append(f"تم رصد تجميد ({freeze_duration} دقيقة) ولكن اللقاح مقاوم للتجميد وفق المكتبة العلمية.")
+        return None
+
+    def evaluate(self, center, stats: Dict[str, Any]) -> Optional[str]:
         if stats['has_freeze']:
-            if not is_freeze_stable:
-                # لقاح حساس للتجميد - رفض فوري أو توصية باختبار الرج
-                action = getattr(center, 'actions', {}).get('on_freeze', "تلف فوري محتمل")
-                center.decision_reasons.append(f"انتهاك تجميد: {stats['freeze_duration']} دقيقة < 0°C. {action}")
-                return "REJECTED_FREEZE"
-            else:
-                # لقاح مقاوم للتجميد (مثل OPV)
-                center.decision_reasons.append(f"تم رصد تجميد ({stats['freeze_duration']} دقيقة) ولكن اللقاح مقاوم للتجميد وفق المكتبة العلمية.")
-        else:
-            center.decision_reasons.append("لم يتم رصد تجميد")
+            return self._on_freeze(center, stats['freeze_duration'])
+        center.decision_reasons.append(self.NO_FREEZE)
         return None
 
+    def evaluate_batch(self, table: StatsTable, rows: np.ndarray) -> List[Optional[str]]:
+        has_freeze = table.flags('has_freeze')[rows]
+        out: List[Optional[str]] = [None] * len(rows)
+        for k, (i, frozen) in enumerate(zip(rows.tolist(), has_freeze.tolist())):
+            if frozen:
+                table.reasons(i)  # يضمن وجود decision_reasons على المركز
+                out[k] = self._on_freeze(table.centers[i], table.value('freeze_duration', i))
+            else:
+                table.reasons(i).append(self.NO_FREEZE)
+        return out
+
 class HeatCriticalRule(DecisionRule):
     """قاعدة الحرارة الحرجة بناءً على الميزانية الحرارية (v1.1.0)"""
+    requires = ('max_temp', 'has_ccm_violation', 'heat_duration', 'critical_temp_limit')
+    WITHIN_LIMITS = "المقاييس الحرارية اللحظية والتراكمية ضمن الحدود"
+
+    @staticmethod
+    def _critical_reason(center, max_temp, critical_limit) -> str:
+        action = getattr(center, 'actions', {}).get('on_heat', "حرارة حرجة")
+        return f"حرارة حرجة: {max_temp}°C > {critical_limit}°C. {action}"
+
+    @staticmethod
+    def _ccm_reason(heat_duration) -> str:
+        return f"تجاوز الحد التراكمي (CCM): {heat_duration} دقيقة"
+
     def evaluate(self, center, stats: Dict[str, Any]) -> Optional[str]:
         critical_limit = getattr(center, 'critical_temp_limit', stats.get('critical_temp_limit', 10.0))
         
         if stats['max_temp'] > critical_limit:
-            action = getattr(center, 'actions', {}).get('on_heat', "حرارة حرجة")
-            center.decision_reasons.append(f"حرارة حرجة: {stats['max_temp']}°C > {critical_limit}°C. {action}")
+            center.decision_reasons.append(self._critical_reason(center, stats['max_temp'], critical_limit))
             return "REJECTED_HEAT_C"
             
         if stats['has_ccm_violation']:
-            center.decision_reasons.append(f"تجاوز الحد التراكمي (CCM): {stats['heat_duration']} دقيقة")
+            center.decision_reasons.append(self._ccm_reason(stats['heat_duration']))
             return "REJECTED_HEAT_C"
         
-        center.decision_reasons.append("المقاييس الحرارية اللحظية والتراكمية ضمن الحدود")
+        center.decision_reasons.append(self.WITHIN_LIMITS)
         return None
 
+    def evaluate_batch(self, table: StatsTable, rows: np.ndarray) -> List[Optional[str]]:
+        idx = rows.tolist()
+        limits = [getattr(table.centers[i], 'critical_temp_limit', table.value('critical_temp_limit', i, 10.0))
+                  for i in idx]
+        critical = table.column('max_temp')[rows] > np.array(limits, dtype=np.float64)
+        ccm = table.flags('has_ccm_violation')[rows] & ~critical
+
+        out: List[Optional[str]] = [None] * len(rows)
+        for k, i in enumerate(idx):
+            if critical[k]:
+                reason = self._critical_reason(table.centers[i], table.value('max_temp', i), limits[k])
+                out[k] = "REJECTED_HEAT_C"
+            elif ccm[k]:
+                reason = self._ccm_reason(table.value('heat_duration', i))
+                out[k] = "REJECTED_HEAT_C"
+            else:
+                reason = self.WITHIN_LIMITS
+            table.reasons(i).append(reason)
+        return out
+
 class TemperatureWarningRule(DecisionRule):
     """قاعدة التحذير (0-2°C أو 8-10°C)"""
+    requires = ('min_temp', 'max_temp')
+
     def evaluate(self, center, stats: Dict[str, Any]) -> Optional[str]:
         if stats['min_temp'] < 2.0 or stats['max_temp'] > 8.0:
             # تسجيل التحذير كسمة إضافية دون تغيير القرار النهائي
@@ -136,10 +430,23 @@ class TemperatureWarningRule(DecisionRule):
         center.decision_reasons.append("درجات الحرارة ضمن النطاق الآمن (2-8°C)")
         return None
 
+    def evaluate_batch(self, table: StatsTable, rows: np.ndarray) -> List[Optional[str]]:
+        warn = (table.column('min_temp')[rows] < 2.0) | (table.column('max_temp')[rows] > 8.0)
+        for i, w in zip(rows.tolist(), warn.tolist()):
+            if w:
+                table.reasons(i).append(f"تحذير خروج عن النطاق: ({table.value('min_temp', i)}°C - "
+                                        f"{table.value('max_temp', i)}°C)")
+                table.centers[i].has_warning = True
+            else:
+                table.reasons(i).append("درجات الحرارة ضمن النطاق الآمن (2-8°C)")
+        return [None] * len(rows)
+
 class ThawRule(DecisionRule):
     """
     قاعدة تتبع الذوبان (Thawing Logic) لقاحات mRNA (v1.1.0)
     """
+    requires = ()
+
     def evaluate(self, center, stats: Dict[str, Any]) -> Optional[str]:
         if not getattr(center, 'ultra_cold_chain_required', False):
             return None
@@ -166,35 +473,121 @@ class ThawRule(DecisionRule):
                 
         return None
 
+    def evaluate_batch(self, table: StatsTable, rows: np.ndarray) -> List[Optional[str]]:
+        ucc = table.attr('ultra_cold_chain_required', False)
+        out: List[Optional[str]] = [None] * len(rows)
+        for k, i in enumerate(rows.tolist()):
+            if ucc[i]:
+                out[k] = self.evaluate(table.centers[i], table.row(i))
+        return out
+
 class VVMStageRule(DecisionRule):
     """قاعدة تحديد مرحلة VVM بناءً على نسبة التدهور (HER)"""
+    requires = ('her',)
+    # (الحد الأدنى لـ HER، المرحلة، السبب، القرار) بترتيب تنازلي
+    STAGES = [
+        (1.0, VVMStage.D, "VVM المرحلة D: اللقاح منتهي الصلاحية حرارياً", "REJECTED_HEAT_C"),
+        (0.7, VVMStage.C, "VVM المرحلة C: اقتراب شديد من نهاية الصلاحية", None),
+        (0.4, VVMStage.B, "VVM المرحلة B: تدهور ملحوظ", None),
+        (0.1, VVMStage.A, "VVM المرحلة A: بداية تأثر بالحرارة", None),
+    ]
+
     def evaluate(self, center, stats: Dict[str, Any]) -> Optional[str]:
         # إذا تم حساب HER مسبقاً في الإحصائيات
         her = stats.get('her', 0.0)
         
-        if her >= 1.0:
-            center.vvm_stage = VVMStage.D
-            center.decision_reasons.append("VVM المرحلة D: اللقاح منتهي الصلاحية حرارياً")
-            return "REJECTED_HEAT_C"
-        elif her >= 0.7:
-            center.vvm_stage = VVMStage.C
-            center.decision_reasons.append("VVM المرحلة C: اقتراب شديد من نهاية الصلاحية")
-        elif her >= 0.4:
-            center.vvm_stage = VVMStage.B
-            center.decision_reasons.append("VVM المرحلة B: تدهور ملحوظ")
-        elif her >= 0.1:
-            center.vvm_stage = VVMStage.A
-            center.decision_reasons.append("VVM المرحلة A: بداية تأثر بالحرارة")
-        else:
-            center.vvm_stage = VVMStage.NONE
-            
+        for threshold, stage, reason, decision in self.STAGES:
+            if her >= threshold:
+                center.vvm_stage = stage
+                center.decision_reasons.append(reason)
+                return decision
+
+        center.vvm_stage = VVMStage.NONE
         return None
 
+    def evaluate_batch(self, table: StatsTable, rows: np.ndarray) -> List[Optional[str]]:
+        her = table.column('her', 0.0)[rows]
+        # فهرس المرحلة لكل صف (len(STAGES) = بدون مرحلة)
+        stage_idx = np.full(len(rows), len(self.STAGES))
+        for k in range(len(self.STAGES) - 1, -1, -1):
+            stage_idx[her >= self.STAGES[k][0]] = k
+
+        out: List[Optional[str]] = [None] * len(rows)
+        for k, (i, s) in enumerate(zip(rows.tolist(), stage_idx.tolist())):
+            center = table.centers[i]
+            if s == len(self.STAGES):
+                center.vvm_stage = VVMStage.NONE
+                continue
+            _, stage, reason, decision = self.STAGES[s]
+            center.vvm_stage = stage
+            table.reasons(i).append(reason)
+            out[k] = decision
+        return out
+
 class DefaultRule(DecisionRule):
     """القاعدة الافتراضية: القبول"""
+    requires = ()
+
     def evaluate(self, center, stats: Dict[str, Any]) -> Optional[str]:
         return "ACCEPTED"
 
+    def evaluate_batch(self, table: StatsTable, rows: np.ndarray) -> List[Optional[str]]:
+        return ["ACCEPTED"] * len(rows)
+
+class RuleMetrics:
+    """
+    Aggregated per-rule instrumentation for RulesEngine runs.
+
+    For every rule (in precedence order) records the number of evaluations,
+    the number of times it produced the final decision (short-circuiting the
+    rules after it) and the cumulative wall time spent in it.
+    """
+    def __init__(self, rule_names: Sequence[str] = ()):
+        self.centers = 0
+        self.rules: Dict[str, Dict[str, Any]] = {}
+        for name in rule_names:
+            self._entry(name)
+
+    def _entry(self, rule_name: str) -> Dict[str, Any]:
+        entry = self.rules.get(rule_name)
+        if entry is None:
+            entry = self.rules[rule_name] = {'evaluations': 0, 'decisions': 0, 'total_seconds': 0.0}
+        return entry
+
+    def record(self, rule_name: str, seconds: float, evaluations: int = 1, decisions: int = 0):
+        entry = self._entry(rule_name)
+        entry['evaluations'] += evaluations
+        entry['decisions'] += decisions
+        entry['total_seconds'] += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: {'centers', 'total_seconds', 'rules': {name: {'evaluations',
+            'decisions', 'total_seconds', 'mean_us'}}}
+        """
+        rules = {}
+        for name, entry in self.rules.items():
+            mean_us = entry['total_seconds'] * 1e6 / entry['evaluations'] if entry['evaluations'] else 0.0
+            rules[name] = dict(entry, mean_us=mean_us)
+        return {
+            'centers': self.centers,
+            'total_seconds': sum(entry['total_seconds'] for entry in self.rules.values()),
+            'rules': rules,
+        }
+
+    def summary_lines(self) -> List[str]:
+        """Fixed-width table for logging, one line per rule."""
+        lines = [f"{'rule':<24}{'evals':>8}{'decided':>9}{'total ms':>11}{'mean us':>10}"]
+        for name, entry in self.to_dict()['rules'].items():
+            lines.append(f"{name:<24}{entry['evaluations']:>8}{entry['decisions']:>9}"
+                         f"{entry['total_seconds'] * 1e3:>11.2f}{entry['mean_us']:>10.1f}")
+        return lines
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
 class RulesEngine:
     """
     Engine that manages the priority-based execution of Decision Rules.
@@ -221,28 +614,124 @@ class RulesEngine:
             TemperatureWarningRule(), # Priority 5: Warnings
             DefaultRule()          # Priority 6: Fallback Accept
         ]
+        # Instrumentation is off by default; a disabled run costs one attribute check.
+        self.metrics: Optional[RuleMetrics] = None
+
+    def enable_metrics(self) -> RuleMetrics:
+        """Starts a fresh per-rule instrumentation session and returns it."""
+        self.metrics = RuleMetrics([type(rule).__name__ for rule in self.rules])
+        return self.metrics
+
+    def disable_metrics(self) -> Optional[RuleMetrics]:
+        """Stops instrumentation and returns the collected metrics (if any)."""
+        metrics, self.metrics = self.metrics, None
+        return metrics
 
     def run(self, center, stats: Dict[str, Any]):
+        if self.metrics is not None:
+            self._run_instrumented(center, stats)
+            return
+
+        for rule in self.rules:
+            decision = rule.evaluate(center, stats)
+            if decision:
+                center.decision = decision
+                return
+
+    def _run_instrumented(self, center, stats: Dict[str, Any]):
+        metrics = self.metrics
+        metrics.centers += 1
         for rule in self.rules:
+            start = time.perf_counter()
             decision = rule.evaluate(center, stats)
+            metrics.record(type(rule).__name__, time.perf_counter() - start, decisions=1 if decision else 0)
             if decision:
                 center.decision = decision
                 return
 
+    def evaluate_batch(self, centers: Sequence[Any], stats_table) -> List[Optional[str]]:
+        """
+        Evaluates many centers against a columnar stats table (column -> one value
+        per center, e.g. from `build_stats_table`, a dict of arrays or a DataFrame)
+        or a prebuilt StatsTable (possibly with lazily computed center stats).
+
+        Each rule evaluates all still-undecided centers at once with vectorized
+        predicates; decisions, reasons and side effects (vvm_stage, has_warning)
+        are identical to calling `run` per center.
+
+        Returns:
+            List[Optional[str]]: The decision per center (None if no rule decided).
+        """
+        table = stats_table if isinstance(stats_table, StatsTable) else StatsTable(centers, stats_table)
+        decisions: List[Optional[str]] = [None] * table.n
+        rows = np.arange(table.n)
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.centers += table.n
+
+        for rule in self.rules:
+            if not rows.size:
+                break
+            start = time.perf_counter() if metrics is not None else 0.0
+            table.ensure(rule.requires, rows)
+            outcomes = rule.evaluate_batch(table, rows)
+            decided = np.fromiter((bool(d) for d in outcomes), dtype=bool, count=len(rows))
+            if metrics is not None:
+                metrics.record(type(rule).__name__, time.perf_counter() - start,
+                               evaluations=len(rows), decisions=int(decided.sum()))
+            for k in np.flatnonzero(decided).tolist():
+                i = int(rows[k])
+                table.centers[i].decision = decisions[i] = outcomes[k]
+            rows = rows[~decided]
+
+        return decisions
+
+# القواعد عديمة الحالة: محرك واحد مشترك بدلاً من إنشاء سبعة كائنات قواعد لكل مركز
+_default_engine = RulesEngine()
+
+def enable_rule_metrics() -> RuleMetrics:
+    """تفعيل قياس القواعد (الزمن / عدد التقييمات / عدد القرارات) على المحرك المشترك"""
+    return _default_engine.enable_metrics()
+
+def disable_rule_metrics() -> Optional[RuleMetrics]:
+    """إيقاف القياس وإرجاع المقاييس المجمعة"""
+    return _default_engine.disable_metrics()
+
 def apply_rules(center, extra_stats: Optional[Dict[str, Any]] = None):
     """واجهة التطبيق المتوافقة مع الكود القديم"""
     # تهيئة قائمة الأسباب للتدقيق (Explainability)
     center.decision_reasons = []
     
-    stats = calculate_center_stats(center)
-    if extra_stats:
-        stats.update(extra_stats)
+    # إحصائيات كسولة: لا تُمسح القراءات إلا إذا وصلت قاعدة تحتاجها
+    stats = LazyCenterStats(center, extra_stats)
     
-    if not getattr(center, 'ft2_entries', []):
+    if not has_readings(center):
         center.decision_reasons.append("لا توجد بيانات للجهاز")
         center.decision = "NO_DATA"
         return
 
     # استخدام المحرك الجديد
-    engine = RulesEngine()
-    engine.run(center, stats)
\ No newline at end of file
+    _default_engine.run(center, stats)
+
+def apply_rules_batch(centers: Sequence[Any], extra_stats: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+                      ) -> List[str]:
+    """
+    نظير apply_rules لعدة مراكز دفعة واحدة (نفس القرارات والأسباب).
+
+    Args:
+        extra_stats: قائمة اختيارية (قاموس أو None لكل مركز) بنفس ترتيب المراكز.
+    """
+    centers = list(centers)
+    for center in centers:
+        center.decision_reasons = []
+
+    with_data = [i for i, c in enumerate(centers) if has_readings(c)]
+    for i in set(range(len(centers))) - set(with_data):
+        centers[i].decision_reasons.append("لا توجد بيانات للجهاز")
+        centers[i].decision = "NO_DATA"
+
+    subset = [centers[i] for i in with_data]
+    extras = [extra_stats[i] for i in with_data] if extra_stats else None
+    table = StatsTable(subset, build_stats_table(subset, extras, center_stats=False), lazy_center_stats=True)
+    _default_engine.evaluate_batch(subset, table)
+    return [c.decision for c in centers]
\ No newline at end of file
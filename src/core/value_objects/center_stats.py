@@ -0,0 +1,142 @@
+from typing import Any, Dict, Iterable, Optional
+
+
+class CenterStatsAccumulator:
+    """
+    مُجمّع إحصائيات المركز في مرور واحد (مدد التجميد/الحرارة، الأدنى، الأعلى، المتوسط، العدد).
+
+    - يُحدّث تزايدياً عند ربط الإدخالات أو الدفعات (يطوي الجديد فقط).
+    - قابل للدمج بين الأجزاء (shards) عبر merge / +.
+    - يُحفظ على المركز (stats_accumulator) لتقرأ القواعد والتقارير نفس النتيجة المحسوبة مسبقاً.
+
+    ملاحظة: الكشف عن التغيير يعتمد على هوية القوائم وأطوالها؛ استبدال عنصر في مكانه لا يُكتشف.
+    """
+
+    def __init__(self, freeze_threshold: float = 0.0, max_limit: float = 8.0):
+        self.freeze_threshold = freeze_threshold
+        self.max_limit = max_limit
+        self._reset()
+
+    def _reset(self):
+        self.freeze_duration = 0
+        self.heat_duration = 0
+        self.count = 0
+        self.total = 0
+        self.min_temp: Optional[float] = None
+        self.max_temp: Optional[float] = None
+        # ما تم طيّه من قوائم المركز
+        self._entries_ref = None
+        self._entries_seen = 0
+        self._batches_ref = None
+        self._batches_seen = 0
+
+    @classmethod
+    def for_center(cls, center) -> 'CenterStatsAccumulator':
+        """المُجمّع المحفوظ على المركز بعد طي القراءات الجديدة (يُنشأ عند الحاجة أو عند تغير الحدود)"""
+        temp_ranges = getattr(center, 'temperature_ranges', {})
+        thresholds = getattr(center, 'decision_thresholds', {})
+        freeze_threshold = thresholds.get('freeze_threshold', 0.0)
+        max_limit = temp_ranges.get('max', 8.0)
+
+        acc = getattr(center, 'stats_accumulator', None)
+        if not isinstance(acc, cls) or (acc.freeze_threshold, acc.max_limit) != (freeze_threshold, max_limit):
+            acc = cls(freeze_threshold, max_limit)
+            try:
+                center.stats_accumulator = acc
+            except AttributeError:
+                pass  # كائنات لا تقبل سمات جديدة: بدون حفظ
+
+        acc.sync(getattr(center, 'ft2_entries', []), getattr(center, 'reading_batches', []))
+        return acc
+
+    def _extend_extremes(self, lo: float, hi: float):
+        if self.min_temp is None or lo < self.min_temp:
+            self.min_temp = lo
+        if self.max_temp is None or hi > self.max_temp:
+            self.max_temp = hi
+
+    def add_entries(self, entries: Iterable[Any]):
+        """طي إدخالات (كائنات لها temperature و duration_minutes) في مرور واحد"""
+        freeze_threshold, max_limit = self.freeze_threshold, self.max_limit
+        lo, hi = self.min_temp, self.max_temp
+        for e in entries:
+            temp = e.temperature
+            if temp is None:
+                continue
+            if temp < freeze_threshold:
+                self.freeze_duration += e.duration_minutes
+            if temp > max_limit:
+                self.heat_duration += e.duration_minutes
+            self.count += 1
+            self.total += temp
+            if lo is None or temp < lo:
+                lo = temp
+            if hi is None or temp > hi:
+                hi = temp
+        self.min_temp, self.max_temp = lo, hi
+
+    def add_batch(self, batch):
+        """طي دفعة عمودية (temperatures / durations كمصفوفات)"""
+        temps = batch.temperatures
+        if not len(temps):
+            return
+        # الحدود تُقرّب إلى نوع المصفوفة (float32) مرة واحدة: القراءة المساوية للحد تبقى مساوية له
+        # كما في مسار الكائنات، بدلاً من مقارنة 8.05 المخزنة كـ 8.0500002 بالحد 8.05 (float64)
+        freeze_threshold, max_limit = temps.dtype.type(self.freeze_threshold), temps.dtype.type(self.max_limit)
+        self.freeze_duration += float(batch.durations[temps < freeze_threshold].sum())
+        self.heat_duration += float(batch.durations[temps > max_limit].sum())
+        self.count += len(temps)
+        self.total += float(temps.sum(dtype='float64'))
+
+        lo, hi = float(temps.min()), float(temps.max())
+        if temps.dtype.itemsize < 8:
+            # تقريب قيم float32 لتجنب ذيول مثل 5.519999980926514 في الأسباب والتقارير
+            lo, hi = round(lo, 4), round(hi, 4)
+        self._extend_extremes(lo, hi)
+
+    def sync(self, entries, batches):
+        """طي ما أُضيف إلى قوائم المركز منذ آخر مزامنة؛ إعادة البناء إذا استُبدلت القوائم أو تقلصت"""
+        if (entries is not self._entries_ref or len(entries) < self._entries_seen
+                or batches is not self._batches_ref or len(batches) < self._batches_seen):
+            self._reset()
+            self._entries_ref, self._batches_ref = entries, batches
+
+        if len(entries) > self._entries_seen:
+            self.add_entries(entries[self._entries_seen:])
+            self._entries_seen = len(entries)
+        if len(batches) > self._batches_seen:
+            for batch in batches[self._batches_seen:]:
+                self.add_batch(batch)
+            self._batches_seen = len(batches)
+
+    def merge(self, other: 'CenterStatsAccumulator') -> 'CenterStatsAccumulator':
+        """دمج مُجمّع جزء آخر (بنفس الحدود) في هذا المُجمّع"""
+        if (other.freeze_threshold, other.max_limit) != (self.freeze_threshold, self.max_limit):
+            raise ValueError("Cannot merge accumulators built with different thresholds.")
+        self.freeze_duration += other.freeze_duration
+        self.heat_duration += other.heat_duration
+        self.count += other.count
+        self.total += other.total
+        if other.min_temp is not None:
+            self._extend_extremes(other.min_temp, other.max_temp)
+        return self
+
+    def __add__(self, other: 'CenterStatsAccumulator') -> 'CenterStatsAccumulator':
+        merged = CenterStatsAccumulator(self.freeze_threshold, self.max_limit)
+        return merged.merge(self).merge(other)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def to_stats(self, ccm_limit: float = 600) -> Dict[str, Any]:
+        """نفس شكل قاموس calculate_center_stats"""
+        return {
+            'freeze_duration': self.freeze_duration,
+            'heat_duration': self.heat_duration,
+            'has_freeze': self.freeze_duration > 0,  # قاعدة عدم التسامح
+            'has_ccm_violation': self.heat_duration > ccm_limit,  # قاعدة التراكم
+            'avg_temp': self.mean,
+            'min_temp': self.min_temp if self.min_temp is not None else 0,
+            'max_temp': self.max_temp if self.max_temp is not None else 0
+        }
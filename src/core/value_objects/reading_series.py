@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from src.core.entities.temperature_reading import TemperatureReading
+
+
+def segment_minutes(group_codes: np.ndarray, timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    مدد المقاطع لقراءات مرتبة حسب (المجموعة، التوقيت)، كما في ReadingSeries.from_readings:
+    مدة كل قراءة = الزمن حتى القراءة التالية في مجموعتها (0 للأخيرة).
+
+    Returns:
+        (الدقائق float64، قناع القراءات التي تليها قراءة في نفس المجموعة)
+    """
+    n = len(group_codes)
+    has_next = np.zeros(n, dtype=bool)
+    minutes = np.zeros(n)
+    if n > 1:
+        has_next[:-1] = group_codes[1:] == group_codes[:-1]
+        gaps = np.diff(np.asarray(timestamps, dtype=np.int64)) / 60.0
+        minutes[:-1] = np.where(has_next[:-1], gaps, 0.0)
+    return minutes, has_next
+
+
+@dataclass(frozen=True, eq=False)
+class ReadingSeries:
+    """
+    سلسلة قراءات مرتبة زمنياً بتخزين عمودي (مصفوفتان متوازيتان).
+
+    يقرأها محرك القواعد مباشرة مثل دفعات ReadingBatch (temperatures / durations)
+    بدلاً من كائن لكل قراءة. مدة كل قراءة = الزمن حتى القراءة التالية (0 للأخيرة).
+    """
+    temperatures: np.ndarray   # float64 - °C
+    durations: np.ndarray      # float64 - دقائق
+
+    def __len__(self) -> int:
+        return len(self.temperatures)
+
+    @classmethod
+    def from_readings(cls, readings: Sequence[TemperatureReading]) -> 'ReadingSeries':
+        """بناء السلسلة من قراءات مرتبة زمنياً: المدد من فرق واحد (np.diff) للتوقيتات"""
+        n = len(readings)
+        if n == 0:
+            return cls(np.empty(0), np.empty(0))
+
+        t0 = readings[0].recorded_at
+        offsets = np.fromiter(((r.recorded_at - t0).total_seconds() for r in readings), dtype=np.float64, count=n)
+        temperatures = np.fromiter((r.value for r in readings), dtype=np.float64, count=n)
+
+        durations = np.zeros(n)
+        durations[:-1] = np.diff(offsets) / 60.0
+        return cls(temperatures, durations)
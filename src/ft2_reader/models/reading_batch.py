@@ -0,0 +1,159 @@
+# reading_batch.py
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+# التوقيتات بدون منطقة زمنية تُعامل كتوقيت UTC (بدون تحويل محلي)
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_seconds(ts: datetime) -> int:
+    """تحويل datetime إلى ثوانٍ منذ 1970 (int64)"""
+    if ts.tzinfo is not None:
+        return int(ts.timestamp())
+    return (ts - EPOCH) // timedelta(seconds=1)
+
+
+def from_epoch_seconds(seconds: int) -> datetime:
+    """التحويل العكسي إلى datetime (بدون منطقة زمنية)"""
+    return EPOCH + timedelta(seconds=int(seconds))
+
+
+@dataclass(frozen=True, eq=False)
+class ReadingBatch:
+    """
+    دفعة قراءات بتخزين عمودي (Columnar) بدلاً من كائن FT2Entry لكل صف.
+
+    الأعمدة النصية (device_id / vaccine_type / batch) مخزّنة كرموز فئوية (int32)
+    تشير إلى جداول القيم الفريدة المرافقة.
+    """
+    timestamps: np.ndarray        # int64 - ثوانٍ منذ 1970
+    temperatures: np.ndarray      # float32 - °C
+    durations: np.ndarray         # float32 - دقائق
+    device_codes: np.ndarray      # int32 -> device_ids
+    vaccine_codes: np.ndarray     # int32 -> vaccine_types
+    batch_codes: np.ndarray       # int32 -> batches
+    device_ids: Tuple[str, ...] = ()
+    vaccine_types: Tuple[str, ...] = ()
+    batches: Tuple[str, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def empty(cls) -> 'ReadingBatch':
+        return cls(
+            timestamps=np.empty(0, dtype=np.int64),
+            temperatures=np.empty(0, dtype=np.float32),
+            durations=np.empty(0, dtype=np.float32),
+            device_codes=np.empty(0, dtype=np.int32),
+            vaccine_codes=np.empty(0, dtype=np.int32),
+            batch_codes=np.empty(0, dtype=np.int32),
+        )
+
+    def take(self, index) -> 'ReadingBatch':
+        """اقتطاع صفوف (قناع منطقي أو مصفوفة فهارس) مع الاحتفاظ بجداول الفئات"""
+        return ReadingBatch(
+            timestamps=self.timestamps[index],
+            temperatures=self.temperatures[index],
+            durations=self.durations[index],
+            device_codes=self.device_codes[index],
+            vaccine_codes=self.vaccine_codes[index],
+            batch_codes=self.batch_codes[index],
+            device_ids=self.device_ids,
+            vaccine_types=self.vaccine_types,
+            batches=self.batches,
+        )
+
+    def codes_for_devices(self, device_ids: Iterable[str]) -> np.ndarray:
+        """رموز الأجهزة المطلوبة الموجودة في هذه الدفعة"""
+        lookup = {d: i for i, d in enumerate(self.device_ids)}
+        return np.array([lookup[d] for d in device_ids if d in lookup], dtype=np.int32)
+
+    def device_counts(self) -> Dict[str, int]:
+        """عدد القراءات لكل جهاز"""
+        counts = np.bincount(self.device_codes, minlength=len(self.device_ids))
+        return {self.device_ids[i]: int(c) for i, c in enumerate(counts) if c}
+
+    def to_entries(self) -> List:
+        """تحويل إلى كائنات FT2Entry (للتوافق فقط - يلغي فائدة التخزين العمودي)"""
+        from src.ft2_reader.parser.ft2_parser import FT2Entry
+        return [
+            FT2Entry(
+                device_id=self.device_ids[self.device_codes[i]],
+                timestamp=from_epoch_seconds(self.timestamps[i]),
+                temperature=float(self.temperatures[i]),
+                vaccine_type=self.vaccine_types[self.vaccine_codes[i]],
+                batch=self.batches[self.batch_codes[i]],
+                duration_minutes=float(self.durations[i]),
+            )
+            for i in range(len(self))
+        ]
+
+    def save_npz(self, path: str):
+        """حفظ الدفعة في ملف .npz (بدون pickle)"""
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                timestamps=self.timestamps,
+                temperatures=self.temperatures,
+                durations=self.durations,
+                device_codes=self.device_codes,
+                vaccine_codes=self.vaccine_codes,
+                batch_codes=self.batch_codes,
+                device_ids=np.array(self.device_ids, dtype=str),
+                vaccine_types=np.array(self.vaccine_types, dtype=str),
+                batches=np.array(self.batches, dtype=str),
+            )
+
+    @classmethod
+    def load_npz(cls, path: str) -> 'ReadingBatch':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                timestamps=data['timestamps'],
+                temperatures=data['temperatures'],
+                durations=data['durations'],
+                device_codes=data['device_codes'],
+                vaccine_codes=data['vaccine_codes'],
+                batch_codes=data['batch_codes'],
+                device_ids=tuple(str(v) for v in data['device_ids']),
+                vaccine_types=tuple(str(v) for v in data['vaccine_types']),
+                batches=tuple(str(v) for v in data['batches']),
+            )
+
+    @classmethod
+    def concat(cls, batches: Sequence['ReadingBatch']) -> 'ReadingBatch':
+        """دمج عدة دفعات مع توحيد جداول الفئات"""
+        batches = [b for b in batches if len(b)]
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+
+        def _merge(attr_codes: str, attr_values: str):
+            values: Dict[str, int] = {}
+            remapped = []
+            for b in batches:
+                table = np.array([values.setdefault(v, len(values)) for v in getattr(b, attr_values)],
+                                 dtype=np.int32)
+                codes = getattr(b, attr_codes)
+                remapped.append(table[codes] if len(table) else codes)
+            return np.concatenate(remapped), tuple(values)
+
+        device_codes, device_ids = _merge('device_codes', 'device_ids')
+        vaccine_codes, vaccine_types = _merge('vaccine_codes', 'vaccine_types')
+        batch_codes, batch_values = _merge('batch_codes', 'batches')
+
+        return cls(
+            timestamps=np.concatenate([b.timestamps for b in batches]),
+            temperatures=np.concatenate([b.temperatures for b in batches]),
+            durations=np.concatenate([b.durations for b in batches]),
+            device_codes=device_codes,
+            vaccine_codes=vaccine_codes,
+            batch_codes=batch_codes,
+            device_ids=device_ids,
+            vaccine_types=vaccine_types,
+            batches=batch_values,
+        )
@@ -1,11 +1,24 @@
 import os
 import csv
+from array import array
 from datetime import datetime
 from typing import List, Dict, Any
-from src.infrastructure.logging import get_logger
+import numpy as np
+from src.ft2_reader.models.reading_batch import ReadingBatch, to_epoch_seconds
+from src.infrastructure.logging import RowWarnings, get_logger
 
 logger = get_logger(__name__)
 
+
+def _field(row: List[str], index, missing=None):
+    """
+    قيمة عمود من صف csv.reader بنفس نتيجة row.get في csv.DictReader:
+    `missing` إذا لم يكن العمود في الرأس، و None إذا كان الصف أقصر من الرأس.
+    """
+    if index is None:
+        return missing
+    return row[index] if index < len(row) else None
+
 class FT2Entry:
     def __init__(self, device_id: str, timestamp: datetime, temperature: float, 
                  vaccine_type: str, batch: str, duration_minutes: float = 15.0):
@@ -21,14 +34,14 @@ class FT2Entry:
 
 class FT2Parser:
     @staticmethod
-    def parse_file(file_path: str) -> List[FT2Entry]:
+    def parse_file(file_path: str, strict: bool = False) -> List[FT2Entry]:
         entries = []
         
         # دعم لكل من CSV و TSV
         delimiter = '\t' if file_path.endswith('.tsv') else ','
         
         try:
-            with open(file_path, newline='', encoding='utf-8') as f:
+            with open(file_path, newline='', encoding='utf-8') as f, RowWarnings(logger, file_path) as row_warnings:
                 # محاولة اكتشاف الرأس
                 first_line = f.readline()
                 f.seek(0)
@@ -58,12 +71,101 @@ class FT2Parser:
                             )
                             entries.append(entry)
                         except Exception as e:
-                            logger.warning(f"تخطي صف {i} في {file_path}: {e}")
+                            row_warnings.warn("تخطي صف %d في %s: %s", i, file_path, e)
                 else:
-                    logger.warning(f"تنسيق غير معروف في {file_path}")
+                    if strict:
+                        raise ValueError(f"تنسيق غير معروف في {file_path}")
+                    logger.warning("تنسيق غير معروف في %s", file_path)
         
         except Exception as e:
-            logger.error(f"خطأ في تحليل {file_path}: {e}")
+            if strict:
+                raise
+            logger.error("خطأ في تحليل %s: %s", file_path, e)
         
-        logger.info(f"تم تحليل {len(entries)} إدخال من {file_path}")
-        return entries
\ No newline at end of file
+        logger.info("تم تحليل %d إدخال من %s", len(entries), file_path)
+        return entries
+
+    @staticmethod
+    def parse_file_columnar(file_path: str, strict: bool = False) -> ReadingBatch:
+        """
+        تحليل الملف إلى ReadingBatch عمودي دون إنشاء كائن لكل صف.
+
+        نفس قواعد parse_file (الرأس، تخطي الصفوف التالفة، الوقت الافتراضي)
+        لكن القيم تُجمع في مصفوفات مضغوطة ورموز فئوية.
+
+        strict: أخطاء مستوى الملف (تعذر القراءة، تنسيق غير معروف) تُرفع بدلاً
+        من تسجيلها وإرجاع نتيجة فارغة؛ الصفوف التالفة تُتخطى في الحالتين.
+        """
+        timestamps = array('q')
+        temperatures = array('f')
+        device_codes = array('i')
+        vaccine_codes = array('i')
+        batch_codes = array('i')
+        devices: Dict[str, int] = {}
+        vaccines: Dict[str, int] = {}
+        batches: Dict[str, int] = {}
+
+        delimiter = '\t' if file_path.endswith('.tsv') else ','
+
+        try:
+            with open(file_path, newline='', encoding='utf-8') as f, RowWarnings(logger, file_path) as row_warnings:
+                first_line = f.readline()
+                f.seek(0)
+
+                if 'device_id' in first_line and 'temperature' in first_line:
+                    reader = csv.reader(f, delimiter=delimiter)
+                    header = next(reader)
+                    col = {name: i for i, name in enumerate(header)}
+                    i_dev, i_temp = col['device_id'], col['temperature']
+                    i_ts, i_vac, i_batch = col.get('timestamp'), col.get('vaccine_type'), col.get('batch')
+
+                    for i, row in enumerate(reader):
+                        if not row:
+                            continue  # DictReader في parse_file يتجاهل الأسطر الفارغة
+                        try:
+                            temp = float(_field(row, i_temp))
+                            device_id = str(_field(row, i_dev))
+
+                            ts_str = _field(row, i_ts)
+                            if ts_str:
+                                try:
+                                    ts = datetime.fromisoformat(ts_str)
+                                except ValueError:
+                                    ts = datetime.now()
+                            else:
+                                ts = datetime.now()
+
+                            vaccine = _field(row, i_vac, 'UNKNOWN')
+                            batch = _field(row, i_batch, 'UNKNOWN')
+
+                            timestamps.append(to_epoch_seconds(ts))
+                            temperatures.append(temp)
+                            device_codes.append(devices.setdefault(device_id, len(devices)))
+                            vaccine_codes.append(vaccines.setdefault(vaccine, len(vaccines)))
+                            batch_codes.append(batches.setdefault(batch, len(batches)))
+                        except Exception as e:
+                            row_warnings.warn("تخطي صف %d في %s: %s", i, file_path, e)
+                else:
+                    if strict:
+                        raise ValueError(f"تنسيق غير معروف في {file_path}")
+                    logger.warning("تنسيق غير معروف في %s", file_path)
+
+        except Exception as e:
+            if strict:
+                raise
+            logger.error("خطأ في تحليل %s: %s", file_path, e)
+
+        n = len(timestamps)
+        result = ReadingBatch(
+            timestamps=np.array(timestamps, dtype=np.int64),
+            temperatures=np.array(temperatures, dtype=np.float32),
+            durations=np.full(n, 15.0, dtype=np.float32),  # افتراض 15 دقيقة لكل قراءة في CSV
+            device_codes=np.array(device_codes, dtype=np.int32),
+            vaccine_codes=np.array(vaccine_codes, dtype=np.int32),
+            batch_codes=np.array(batch_codes, dtype=np.int32),
+            device_ids=tuple(devices),
+            vaccine_types=tuple(vaccines),
+            batches=tuple(batches),
+        )
+        logger.info("تم تحليل %d إدخال (عمودي) من %s", n, file_path)
+        return result
@@ -1,39 +1,131 @@
 # ft2_linker.py (مُحسّن)
-from typing import List, Dict, TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import List, Dict, Iterable, Optional, Union, TYPE_CHECKING
+import numpy as np
 from src.infrastructure.logging import get_logger
 
 if TYPE_CHECKING:
     from src.core.entities.vaccination_center import VaccinationCenter
+    from src.ft2_reader.models.reading_batch import ReadingBatch
 
 logger = get_logger(__name__)
 
+
+class DeviceIndex:
+    """
+    فهرس جهاز -> مركز يُبنى مرة واحدة لكل تشغيل ويُعاد استخدامه لكل ملف.
+
+    عند تكرار الجهاز في أكثر من مركز يُعتمد آخر مركز (نفس سلوك الخريطة القديمة).
+    """
+
+    def __init__(self, centers: Iterable):
+        self.centers = list(centers)
+        self._center_idx: Dict[str, int] = {}
+        for idx, center in enumerate(self.centers):
+            device_ids = center.get('device_ids', []) if isinstance(center, dict) else getattr(center, 'device_ids', [])
+            for device_id in device_ids:
+                self._center_idx[device_id] = idx
+
+    @classmethod
+    def of(cls, centers: Union['DeviceIndex', Iterable]) -> 'DeviceIndex':
+        """قبول فهرس جاهز أو قائمة مراكز (للتوافق مع الاستدعاءات القديمة)"""
+        return centers if isinstance(centers, DeviceIndex) else cls(centers)
+
+    def __contains__(self, device_id: str) -> bool:
+        return device_id in self._center_idx
+
+    def __len__(self) -> int:
+        return len(self._center_idx)
+
+    def index_of(self, device_id: str) -> int:
+        """فهرس المركز المالك للجهاز (-1 إذا لم يكن مرتبطاً)"""
+        return self._center_idx.get(device_id, -1)
+
+    def center_for(self, device_id: str) -> Optional['VaccinationCenter']:
+        idx = self._center_idx.get(device_id)
+        return self.centers[idx] if idx is not None else None
+
+    def centers_for(self, device_ids: Iterable[str]) -> List:
+        """المراكز المتأثرة بمجموعة أجهزة (بدون تكرار، بترتيب التكوين)"""
+        idxs = {self._center_idx[d] for d in device_ids if d in self._center_idx}
+        return [self.centers[i] for i in sorted(idxs)]
+
+
+@dataclass
+class LinkReport:
+    """نتيجة الربط: عدد الإدخالات المرتبطة والمتخطاة لكل جهاز"""
+    linked_by_device: Dict[str, int] = field(default_factory=dict)
+    skipped_by_device: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def linked(self) -> int:
+        return sum(self.linked_by_device.values())
+
+    @property
+    def skipped(self) -> int:
+        return sum(self.skipped_by_device.values())
+
+
+def _add_entries(center, entries: List):
+    """تسليم المركز شريحته باستدعاء واحد (مع دعم الكائنات القديمة و الـ DTOs)"""
+    add_entries = getattr(center, 'add_ft2_entries', None)
+    if add_entries:
+        add_entries(entries)
+    elif hasattr(center, 'add_ft2_entry'):
+        for entry in entries:
+            center.add_ft2_entry(entry)
+    else:
+        center.ft2_entries.extend(entries)
+
+
 class FT2Linker:
     @staticmethod
-    def link(entries: List, centers: List):
+    def link(entries: List, centers: Union[DeviceIndex, List]) -> LinkReport:
         """
         ربط قائمة من الإدخالات بالمراكز (للتوافق مع الكود القديم)
         """
-        # استخدام المولد داخلياً لتنفيذ المنطق
-        generator = FT2Linker.link_generator(entries, centers)
-        # استهلاك المولد لتنفيذ الربط (تحديث كائنات المراكز)
-        count = 0
-        for _ in generator:
-            count += 1
-        logger.debug(f"تمت معالجة {count} إدخال عبر خدمة الربط")
+        report = FT2Linker.link_grouped(entries, centers)
+        logger.info("تم ربط %d إدخال، تم تخطي %d", report.linked, report.skipped)
+        return report
+
+    @staticmethod
+    def link_grouped(entries: Iterable, centers: Union[DeviceIndex, List]) -> LinkReport:
+        """
+        تقسيم الإدخالات حسب المركز في مرور واحد (تجميع بالـ hash)، ثم تسليم كل مركز
+        شريحته باستدعاء جماعي واحد، دون إرجاع tuple لكل إدخال.
+        """
+        index = DeviceIndex.of(centers)
+        slices: Dict[int, List] = {}
+        report = LinkReport()
+        linked, skipped = report.linked_by_device, report.skipped_by_device
+
+        for entry in entries:
+            device_id = entry.device_id
+            idx = index.index_of(device_id)
+            if idx < 0:
+                skipped[device_id] = skipped.get(device_id, 0) + 1
+                continue
+            group = slices.get(idx)
+            if group is None:
+                group = slices[idx] = []
+            group.append(entry)
+            linked[device_id] = linked.get(device_id, 0) + 1
+
+        for idx, group in slices.items():
+            _add_entries(index.centers[idx], group)
+
+        return report
 
     @staticmethod
-    def link_generator(entries_generator, centers: List['VaccinationCenter']):
+    def link_generator(entries_generator, centers: Union[DeviceIndex, List['VaccinationCenter']]):
         """ربط الإدخالات كـ Generator لتوفير الذاكرة"""
-        device_map = {}
-        for center in centers:
-            for device_id in center.device_ids:
-                device_map[device_id] = center
-        
+        index = DeviceIndex.of(centers)
+
         linked_count = 0
         skipped_count = 0
-        
+
         for entry in entries_generator:
-            center = device_map.get(entry.device_id)
+            center = index.center_for(entry.device_id)
             if center:
                 center.add_ft2_entry(entry)
                 linked_count += 1
@@ -41,5 +133,45 @@ class FT2Linker:
             else:
                 skipped_count += 1
                 yield entry, None
-        
-        logger.info(f"تم ربط {linked_count} إدخال، تم تخطي {skipped_count}")
\ No newline at end of file
+
+        logger.info("تم ربط %d إدخال، تم تخطي %d", linked_count, skipped_count)
+
+    @staticmethod
+    def link_batch(batch: 'ReadingBatch', centers: Union[DeviceIndex, List]) -> LinkReport:
+        """
+        ربط دفعة عمودية (ReadingBatch) بالمراكز دون إنشاء كائن لكل صف.
+
+        يُحسب مالك كل رمز جهاز مرة واحدة من الفهرس، ثم تُقسم الصفوف حسب المركز
+        بفرز واحد، ويتلقى كل مركز شريحته كدفعة واحدة. عدد الصفوف لكل جهاز
+        (مرتبط / متخطى) من np.bincount واحد على رموز الأجهزة.
+        """
+        index = DeviceIndex.of(centers)
+
+        # رمز الجهاز -> فهرس المركز (-1 = غير مرتبط)
+        owner = np.array([index.index_of(d) for d in batch.device_ids], dtype=np.int64)
+
+        row_owner = owner[batch.device_codes] if len(owner) else np.full(len(batch), -1, dtype=np.int64)
+        order = np.argsort(row_owner, kind='stable')
+        sorted_owner = row_owner[order]
+        center_ids, starts = np.unique(sorted_owner, return_index=True)
+        bounds = list(starts) + [len(order)]
+
+        for k, center_idx in enumerate(center_ids):
+            if center_idx < 0:
+                continue
+            rows = order[bounds[k]:bounds[k + 1]]
+            center = index.centers[center_idx]
+            add_batch = getattr(center, 'add_reading_batch', None)
+            if add_batch:
+                add_batch(batch.take(rows))
+            else:
+                center.reading_batches.append(batch.take(rows))
+
+        report = LinkReport()
+        per_device = np.bincount(batch.device_codes, minlength=len(batch.device_ids))
+        for code in np.flatnonzero(per_device):
+            counts = report.linked_by_device if owner[code] >= 0 else report.skipped_by_device
+            counts[batch.device_ids[code]] = int(per_device[code])
+
+        logger.info("تم ربط %d إدخال (عمودي)، تم تخطي %d", report.linked, report.skipped)
+        return report
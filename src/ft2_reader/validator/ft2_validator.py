@@ -1,6 +1,8 @@
 # ft2_validator.py (مُحسّن)
 from typing import List, Dict, Any
+import numpy as np
 from src.ft2_reader.parser.ft2_parser import FT2Entry
+from src.ft2_reader.models.reading_batch import ReadingBatch, from_epoch_seconds
 
 class FT2Validator:
     @staticmethod
@@ -32,4 +34,30 @@ class FT2Validator:
             "gaps": gaps,
             "total_entries": len(entries),
             "time_span_hours": (entries[-1].timestamp - entries[0].timestamp).total_seconds() / 3600
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def validate_batch_temporal_consistency(batch: ReadingBatch) -> Dict[str, Any]:
+        """نفس التحقق الزمني على دفعة عمودية (فرز + فروقات متجهة)"""
+        if len(batch) < 2:
+            return {"status": "INSUFFICIENT_DATA", "gaps": []}
+
+        ts = np.sort(batch.timestamps)
+        gap_minutes = np.diff(ts) / 60
+
+        # فجوة كبيرة (أكثر من ساعتين بين القراءات)
+        gaps = [
+            {
+                "from": from_epoch_seconds(ts[i]).isoformat(),
+                "to": from_epoch_seconds(ts[i + 1]).isoformat(),
+                "minutes": float(gap_minutes[i])
+            }
+            for i in np.flatnonzero(gap_minutes > 120)
+        ]
+
+        return {
+            "status": "WITH_GAPS" if gaps else "GOOD",
+            "gaps": gaps,
+            "total_entries": len(batch),
+            "time_span_hours": float(ts[-1] - ts[0]) / 3600
+        }
@@ -1,6 +1,29 @@
-from typing import List
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple
 from src.ft2_reader.parser.ft2_parser import FT2Parser
+from src.ft2_reader.models.reading_batch import ReadingBatch
 from src.ft2_reader.validator.ft2_validator import FT2Validator
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _parse_file_safe(path: str, columnar: bool = False) -> Tuple[object, Optional[str]]:
+    """Parse one file, isolating failures so one bad export cannot abort the run.
+
+    The parser runs in strict mode, so an unreadable or unrecognised file comes
+    back as an error instead of an empty result (and is never cached as parsed).
+    Module-level so it can be pickled into worker processes.
+    """
+    try:
+        if columnar:
+            return FT2Parser.parse_file_columnar(path, strict=True), None
+        return FT2Parser.parse_file(path, strict=True), None
+    except Exception as e:
+        return None, str(e)
 
 
 class FT2ReaderAdapter:
@@ -8,26 +31,98 @@ class FT2ReaderAdapter:
 
     This adapter wraps the existing parser/validator implementations and
     provides `get_vaccines()` and `read_all()` methods used by Use Cases.
+
+    With `workers > 1` files are parsed in a process pool. At most
+    `max_in_flight` files are pending at any time and results are merged
+    back in sorted file-name order, so output is deterministic and memory
+    does not grow with the number of files.
+
+    `failed_files` holds the (path, error) failures of the latest
+    `iter_parsed` / `read_all` call only.
     """
 
-    def __init__(self, input_dir: str = "data/input_ft2"):
+    def __init__(self, input_dir: str = "data/input_ft2", workers: int = 1,
+                 max_in_flight: Optional[int] = None):
         self.input_dir = input_dir
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.failed_files: List[Tuple[str, str]] = []
 
     def get_vaccines(self) -> List:
         # For now, Use Cases may depend on external vaccine list; return empty to be safe.
         return []
 
-    def read_all(self) -> List:
-        # Parse all files in input_dir using FT2Parser
-        import os
-        entries = []
+    def list_files(self) -> List[str]:
+        """CSV/TSV exports in input_dir, sorted for a deterministic merge order."""
         if not os.path.exists(self.input_dir):
-            return entries
+            return []
+        return [os.path.join(self.input_dir, f) for f in sorted(os.listdir(self.input_dir))
+                if f.endswith(('.csv', '.tsv'))]
+
+    def iter_parsed(self, paths: List[str], workers: Optional[int] = None,
+                    columnar: bool = False) -> Iterator[Tuple[str, object]]:
+        """Yield (path, parsed) in input order; failed files are recorded and skipped."""
+        workers = self.workers if workers is None else workers
+        self.failed_files = []
+
+        if workers <= 1:
+            for path in paths:
+                result, error = _parse_file_safe(path, columnar)
+                if error is None:
+                    yield path, result
+                else:
+                    self._record_failure(path, error)
+            return
 
-        for f in os.listdir(self.input_dir):
-            if f.endswith(('.csv', '.tsv')):
-                path = os.path.join(self.input_dir, f)
-                entries.extend(FT2Parser.parse_file(path))
+        max_in_flight = self.max_in_flight or workers * 2
+        pending = deque()
+        path_iter = iter(paths)
+
+        def submit(path: str) -> bool:
+            try:
+                pending.append((path, pool.submit(_parse_file_safe, path, columnar)))
+            except BrokenProcessPool as e:
+                # A worker died: files not yet submitted cannot be parsed in this pool
+                for failed in (path, *path_iter):
+                    self._record_failure(failed, str(e))
+                return False
+            return True
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Prime the bounded queue, then submit one new file per completed one
+            for path in path_iter:
+                if not submit(path) or len(pending) >= max_in_flight:
+                    break
+
+            while pending:
+                path, future = pending.popleft()
+                try:
+                    result, error = future.result()
+                except Exception as e:
+                    result, error = None, str(e)
+
+                next_path = next(path_iter, None)
+                if next_path is not None:
+                    submit(next_path)
+
+                if error is None:
+                    yield path, result
+                else:
+                    self._record_failure(path, error)
+
+    def read_all(self, workers: Optional[int] = None) -> List:
+        # Parse all files in input_dir using FT2Parser
+        entries = []
+        for _, file_entries in self.iter_parsed(self.list_files(), workers):
+            entries.extend(file_entries)
 
         # Optionally validate (FT2Validator has validate_temporal_consistency)
         return entries
+
+    def read_all_columnar(self, workers: Optional[int] = None) -> ReadingBatch:
+        """Same as read_all but returns one ReadingBatch (cheap to ship between processes)."""
+        return ReadingBatch.concat([batch for _, batch in self.iter_parsed(self.list_files(), workers, columnar=True)])
+
+    def _record_failure(self, path: str, error: str):
+        logger.error("❌ فشل تحليل %s: %s", path, error)
+        self.failed_files.append((path, error))
@@ -1,15 +1,148 @@
+import atexit
 import logging
+import multiprocessing
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+LOG_FILE = 'pipeline.log'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_lock = threading.Lock()
+# Held around every file / console write; a fork waits for it so that a worker
+# never inherits a stream whose buffer lock is held by the writer thread
+_io_lock = threading.Lock()
+_handlers: List[logging.Handler] = []
+_queue_handler: Optional['_SharedQueueHandler'] = None
+_listener: Optional[QueueListener] = None
+_listener_pid: Optional[int] = None
+
+
+class _SharedQueueHandler(QueueHandler):
+    """
+    QueueHandler shared by every logger from get_logger.
+
+    In the process that owns the listener, records are only put on the queue
+    and the listener thread does the file / console I/O. Worker processes
+    (forked or spawned parsers) have no listener, so they write directly,
+    as before, and nothing is left in a queue when they exit.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        if os.getpid() == _listener_pid:
+            super().emit(record)
+            return
+        with _io_lock:
+            for handler in _handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+class _Listener(QueueListener):
+    def handle(self, record: logging.LogRecord):
+        with _io_lock:
+            super().handle(record)
+
+
+def _before_fork():
+    _io_lock.acquire()
+
+
+def _after_fork_in_parent():
+    _io_lock.release()
+
+
+def _after_fork_in_child():
+    global _io_lock
+    _io_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_in_parent,
+                        after_in_child=_after_fork_in_child)
+
+
+def _build_handlers() -> List[logging.Handler]:
+    formatter = logging.Formatter(LOG_FORMAT)
+    fh = logging.FileHandler(LOG_FILE, mode='a', encoding='utf-8')
+    fh.setFormatter(formatter)
+    sh = logging.StreamHandler()
+    sh.setFormatter(formatter)
+    return [fh, sh]
+
+
+def _shared_handler() -> '_SharedQueueHandler':
+    """One file handle and one writer thread for the whole process (created on first use)."""
+    global _queue_handler, _listener, _listener_pid
+    with _lock:
+        if _queue_handler is None:
+            _handlers.extend(_build_handlers())
+            records: queue.SimpleQueue = queue.SimpleQueue()
+            _queue_handler = _SharedQueueHandler(records)
+            # Only the main process runs a listener; see _SharedQueueHandler
+            if multiprocessing.parent_process() is None:
+                _listener = _Listener(records, *_handlers, respect_handler_level=True)
+                _listener.start()
+                _listener_pid = os.getpid()
+                atexit.register(stop_logging)
+        return _queue_handler
 
 
 def get_logger(name: str = None) -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
         logger.setLevel(logging.INFO)
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        fh = logging.FileHandler('pipeline.log', mode='a', encoding='utf-8')
-        fh.setFormatter(formatter)
-        sh = logging.StreamHandler()
-        sh.setFormatter(formatter)
-        logger.addHandler(fh)
-        logger.addHandler(sh)
+        logger.addHandler(_shared_handler())
     return logger
+
+
+def stop_logging():
+    """Writes out every queued record and stops the writer thread (also runs at exit)."""
+    global _listener, _listener_pid
+    with _lock:
+        listener, _listener = _listener, None
+        if listener is not None and os.getpid() == _listener_pid:
+            # Records logged from now on are written directly by the calling thread
+            _listener_pid = None
+            listener.stop()
+
+
+class RowWarnings:
+    """
+    تحذيرات الصفوف التالفة لملف واحد: أول `limit` تحذير تُسجل كما هي، والباقي
+    يُعد فقط ويُلخص في سطر واحد عند الإغلاق (بدلاً من سطر لكل صف في ملف كبير).
+
+    الرسائل بصيغة % الكسولة: لا تُنسق الرسائل المكتومة إطلاقاً.
+
+        with RowWarnings(logger, path) as warnings:
+            ...
+            warnings.warn("تخطي صف %d في %s: %s", i, path, e)
+    """
+
+    def __init__(self, logger: logging.Logger, source: str, limit: int = 5):
+        self.logger = logger
+        self.source = source
+        self.limit = limit
+        self.count = 0
+
+    def warn(self, msg: str, *args):
+        self.count += 1
+        if self.count <= self.limit:
+            self.logger.warning(msg, *args)
+
+    @property
+    def suppressed(self) -> int:
+        return max(self.count - self.limit, 0)
+
+    def summary(self):
+        if self.suppressed:
+            self.logger.warning("تم تخطي %d صف إضافي في %s (إجمالي التحذيرات: %d)",
+                                self.suppressed, self.source, self.count)
+
+    def __enter__(self) -> 'RowWarnings':
+        return self
+
+    def __exit__(self, *exc):
+        self.summary()
@@ -0,0 +1,7 @@
+"""Infrastructure persistence package.
+
+Hosts on-disk caches and stores used to avoid recomputing pipeline results.
+"""
+from src.infrastructure.persistence.ingestion_manifest import IngestionManifest
+
+__all__ = ["IngestionManifest"]
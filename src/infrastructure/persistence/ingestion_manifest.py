@@ -0,0 +1,170 @@
+import os
+import json
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Set
+from src.ft2_reader.models.reading_batch import ReadingBatch
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 لمحتوى الملف (قراءة على دفعات)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestionManifest:
+    """
+    سجل إدخال دائم يربط كل ملف جهاز (المسار، الحجم، وقت التعديل، بصمة المحتوى)
+    بنتيجة تحليله وربطه المخزّنة كـ ReadingBatch (.npz).
+
+    - إذا تطابق الحجم ووقت التعديل: تُستخدم النتيجة المخزنة مباشرة.
+    - إذا تغير وقت التعديل فقط: تُقارن بصمة المحتوى قبل إعادة التحليل.
+    - يحتفظ أيضاً بآخر نتيجة قرار لكل مركز، وتُلغى عند تغير بصمة التكوين.
+    """
+    VERSION = 1
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, cache_dir: str, config_fingerprint: str = ""):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, self.MANIFEST_NAME)
+        self.config_fingerprint = config_fingerprint
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.centers: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ تعذر قراءة سجل الإدخال %s: %s. سيتم إعادة بنائه", self.manifest_path, e)
+            return
+
+        if data.get('version') != self.VERSION:
+            return
+        self.files = data.get('files', {})
+        # نتائج القرار صالحة فقط لنفس التكوين
+        if data.get('config_fingerprint') == self.config_fingerprint:
+            self.centers = data.get('centers', {})
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def _cache_file(self, key: str) -> str:
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest() + ".npz"
+        return os.path.join(self.cache_dir, name)
+
+    def lookup(self, path: str) -> Optional[ReadingBatch]:
+        """إرجاع الدفعة المخزنة إذا لم يتغير الملف، وإلا None"""
+        key = self._key(path)
+        record = self.files.get(key)
+        if record is None:
+            self.misses += 1
+            return None
+
+        st = os.stat(path)
+        unchanged = record['size'] == st.st_size and record['mtime_ns'] == st.st_mtime_ns
+        if not unchanged and record['size'] == st.st_size and file_sha256(path) == record['sha256']:
+            # تم لمس الملف دون تغيير محتواه
+            record['mtime_ns'] = st.st_mtime_ns
+            unchanged = True
+
+        if unchanged:
+            try:
+                batch = ReadingBatch.load_npz(record['cache_file'])
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("⚠️ ملف التخزين المؤقت تالف لـ %s: %s", path, e)
+            else:
+                self.hits += 1
+                return batch
+
+        self.misses += 1
+        return None
+
+    def store(self, path: str, batch: ReadingBatch, center_ids: Iterable[str]):
+        """تخزين نتيجة التحليل والربط لملف"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = self._key(path)
+        cache_file = self._cache_file(key)
+        batch.save_npz(cache_file)
+
+        st = os.stat(path)
+        self.files[key] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'sha256': file_sha256(path),
+            'cache_file': cache_file,
+            'device_ids': list(batch.device_ids),
+            'center_ids': sorted(center_ids),
+        }
+
+    def file_identity(self, path: str) -> Optional[str]:
+        """
+        بصمة محتوى الملف المسجلة (sha256 والحجم)، أو None إذا لم يُسجل. وقت التعديل
+        لا يدخل فيها: لمس الملف دون تغيير محتواه لا يغير قراءاته.
+        """
+        record = self.files.get(self._key(path))
+        return f"{record['sha256']}:{record['size']}" if record else None
+
+    def cached_device_ids(self, path: str) -> Optional[List[str]]:
+        """
+        أجهزة الملف المسجلة إذا لم يتغير حجمه ولا وقت تعديله (دون حساب sha256)،
+        وإلا None: أجهزته غير معروفة قبل تحليله.
+        """
+        record = self.files.get(self._key(path))
+        if record is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if record['size'] != st.st_size or record['mtime_ns'] != st.st_mtime_ns:
+            return None
+        return list(record['device_ids'])
+
+    def device_ids_for(self, path: str) -> List[str]:
+        record = self.files.get(self._key(path))
+        return list(record['device_ids']) if record else []
+
+    def prune(self, live_paths: Iterable[str]) -> Set[str]:
+        """حذف سجلات الملفات المحذوفة، وإرجاع أجهزتها (مراكزها تحتاج إعادة تقييم)"""
+        live = {self._key(p) for p in live_paths}
+        removed_devices: Set[str] = set()
+        for key in [k for k in self.files if k not in live]:
+            record = self.files.pop(key)
+            removed_devices.update(record.get('device_ids', []))
+            try:
+                os.remove(record['cache_file'])
+            except OSError:
+                pass
+        return removed_devices
+
+    def get_center_outcome(self, center_id: str) -> Optional[Dict[str, Any]]:
+        return self.centers.get(str(center_id))
+
+    def set_center_outcome(self, center_id: str, outcome: Dict[str, Any]):
+        self.centers[str(center_id)] = outcome
+
+    def save(self):
+        """كتابة ذرية للسجل"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data = {
+            'version': self.VERSION,
+            'config_fingerprint': self.config_fingerprint,
+            'files': self.files,
+            'centers': self.centers,
+        }
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.manifest_path)
@@ -0,0 +1,213 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Allocation sites written next to the cProfile dump when a profile directory is given
+PROFILE_TOP_ALLOCATIONS = 25
+
+
+class PipelineProfiler:
+    """
+    Per-stage wall time, CPU time and peak traced memory for a pipeline run.
+
+    `stage(name)` measures a sequential block: wall time, process CPU time and
+    the tracemalloc peak reached inside it (nested stages are folded into
+    their parent's peak). `busy(name)` accumulates the time spent in a stage
+    that runs concurrently with others (e.g. a StagedPipeline thread): wall
+    time and that thread's CPU time, with no memory figure of its own since
+    tracemalloc cannot attribute allocations to threads. Their shared peak is
+    the one of the enclosing `stage`.
+
+    With `cprofile=True` every thread that enters `thread()` is profiled too,
+    and `write()` merges them into one .prof file. With `top_allocations` > 0
+    a tracemalloc snapshot is kept from the end of the top-level stage that
+    left the most memory allocated, and its largest allocation sites are
+    written next to it.
+    """
+
+    def __init__(self, cprofile: bool = False, top_allocations: int = 0):
+        self.cprofile = cprofile
+        self.top_allocations = top_allocations
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._stack: List[List[int]] = []  # running peak of each open stage
+        self._profiles: List[cProfile.Profile] = []
+        self._main_profile: Optional[cProfile.Profile] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._snapshot_bytes = -1
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self._wall_start = 0.0
+        self.wall_seconds = 0.0
+
+    def start(self) -> 'PipelineProfiler':
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._wall_start = time.perf_counter()
+        if self.cprofile:
+            self._main_profile = self._enable_profile()
+        return self
+
+    def stop(self) -> 'PipelineProfiler':
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        if self._main_profile:
+            self._main_profile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return self
+
+    def _enable_profile(self) -> Optional[cProfile.Profile]:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Interpreters with a single process-wide profiler already cover this thread
+            return None
+        with self._lock:
+            self._profiles.append(profile)
+        return profile
+
+    def _entry(self, name: str) -> Dict[str, Any]:
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_bytes': None}
+        return entry
+
+    @contextmanager
+    def stage(self, name: str):
+        """A sequential stage (runs in the calling thread, nothing else running)."""
+        if self._stack:
+            self._stack[-1][0] = max(self._stack[-1][0], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self._stack.append([0])
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            peak = max(self._stack.pop()[0], tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                self._stack[-1][0] = max(self._stack[-1][0], peak)
+            elif self.top_allocations:
+                self._keep_largest_snapshot()
+            with self._lock:
+                entry = self._entry(name)
+                entry['calls'] += 1
+                entry['wall_seconds'] += wall
+                entry['cpu_seconds'] += cpu
+                entry['peak_bytes'] = max(entry['peak_bytes'] or 0, peak)
+
+    def _keep_largest_snapshot(self):
+        current = tracemalloc.get_traced_memory()[0]
+        if current > self._snapshot_bytes:
+            self._snapshot = tracemalloc.take_snapshot()
+            self._snapshot_bytes = current
+
+    @contextmanager
+    def busy(self, name: str):
+        """One unit of work of a concurrent stage (wall time and this thread's CPU time)."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            with self._lock:
+                entry = self._entry(name)
+                entry['calls'] += 1
+                entry['wall_seconds'] += wall
+                entry['cpu_seconds'] += cpu
+
+    @contextmanager
+    def thread(self):
+        """Profiles the calling (non-main) thread with cProfile while inside."""
+        profile = self._enable_profile() if self.cprofile else None
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: {'wall_seconds', 'stages': {name: {'calls', 'wall_seconds',
+            'cpu_seconds', 'peak_bytes'}}}; peak_bytes is None for concurrent stages.
+        """
+        return {'wall_seconds': self.wall_seconds, 'stages': {n: dict(e) for n, e in self.stages.items()}}
+
+    def summary_lines(self) -> List[str]:
+        """Fixed-width table for logging, one line per stage."""
+        lines = [f"{'stage':<16}{'calls':>8}{'wall ms':>12}{'cpu ms':>12}{'peak MiB':>10}"]
+        for name, entry in self.stages.items():
+            peak = f"{entry['peak_bytes'] / 2 ** 20:>10.1f}" if entry['peak_bytes'] is not None else f"{'-':>10}"
+            lines.append(f"{name:<16}{entry['calls']:>8}{entry['wall_seconds'] * 1e3:>12.1f}"
+                         f"{entry['cpu_seconds'] * 1e3:>12.1f}{peak}")
+        lines.append(f"{'total':<16}{'':>8}{self.wall_seconds * 1e3:>12.1f}")
+        return lines
+
+    def log_report(self, logger: logging.Logger, output_dir: Optional[str] = None, label: str = "pipeline"):
+        """Logs the stage table and, with output_dir, writes the files of `write()` and logs their paths."""
+        logger.info("Stage profile (concurrent pipeline stages share the 'stream' peak):")
+        for line in self.summary_lines():
+            logger.info("  %s", line)
+        if output_dir:
+            for kind, path in self.write(output_dir, label=label).items():
+                logger.info("  %s: %s", kind, path)
+
+    def write(self, output_dir: str, label: str = "pipeline") -> Dict[str, str]:
+        """
+        Writes <label>_<timestamp>.json (stage table), .prof (merged cProfile
+        stats, if enabled) and _allocations.txt (top allocation sites, if
+        enabled) into output_dir. Returns the written paths by kind.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        paths = {'stages': base + ".json"}
+        with open(paths['stages'], 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+        if self._profiles:
+            paths['cprofile'] = base + ".prof"
+            pstats.Stats(*self._profiles).dump_stats(paths['cprofile'])
+
+        if self._snapshot is not None:
+            paths['allocations'] = base + "_allocations.txt"
+            with open(paths['allocations'], 'w', encoding='utf-8') as f:
+                for stat in self._snapshot.statistics('lineno')[:self.top_allocations]:
+                    f.write(f"{stat}\n")
+        return paths
+
+
+_active: Optional[PipelineProfiler] = None
+
+
+def enable_profiling(cprofile: bool = False, top_allocations: int = 0) -> PipelineProfiler:
+    """Starts the process-wide profiler that `stage()` records into."""
+    global _active
+    _active = PipelineProfiler(cprofile=cprofile, top_allocations=top_allocations).start()
+    return _active
+
+
+def disable_profiling() -> Optional[PipelineProfiler]:
+    """Stops the active profiler and returns it (None if profiling was off)."""
+    global _active
+    profiler, _active = _active, None
+    return profiler.stop() if profiler else None
+
+
+def active_profiler() -> Optional[PipelineProfiler]:
+    return _active
+
+
+def stage(name: str):
+    """`PipelineProfiler.stage` on the active profiler; a no-op when profiling is off."""
+    return _active.stage(name) if _active else nullcontext()
@@ -0,0 +1,150 @@
+import queue
+import threading
+from contextlib import nullcontext
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class Stage:
+    """One step of a staged pipeline, run in its own thread.
+
+    `process` is called for every upstream item and returns the items to pass
+    downstream (zero or more). `finish` is called once after the last upstream
+    item and may emit more items, e.g. a stage that must see all of its input
+    before anything can be released.
+    """
+
+    name = "stage"
+
+    def process(self, item: Any) -> Iterable[Any]:
+        return (item,)
+
+    def finish(self) -> Iterable[Any]:
+        return ()
+
+
+class StagedPipeline:
+    """Source -> stages -> sink, connected by bounded queues.
+
+    The source is iterated in a producer thread, every stage runs in its own
+    thread and the sink runs in the calling thread. Each queue holds at most
+    `maxsize` items, so a slow stage blocks the ones before it (backpressure)
+    and at most `maxsize` items are buffered between any two stages.
+
+    The first exception raised anywhere stops every stage and is re-raised
+    from `run`.
+
+    With a `profiler` (src/infrastructure/profiling.PipelineProfiler) the time
+    spent producing each source item, in each stage call and in each sink call
+    is recorded under `source_name`, the stage names and `sink_name`.
+    """
+
+    def __init__(self, source: Iterable[Any], stages: Sequence[Stage], sink: Callable[[Any], None],
+                 maxsize: int = 4, profiler: Optional[Any] = None,
+                 source_name: str = "source", sink_name: str = "sink"):
+        if maxsize < 1:
+            raise ValueError("Queue size must be at least 1.")
+        self.source = source
+        self.stages = list(stages)
+        self.sink = sink
+        self.maxsize = maxsize
+        self.profiler = profiler
+        self.source_name = source_name
+        self.sink_name = sink_name
+        self.queues: List[queue.Queue] = [queue.Queue(maxsize) for _ in range(len(self.stages) + 1)]
+        # Highest number of items seen waiting in each queue
+        self.high_water: List[int] = [0] * len(self.queues)
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+
+    def _fail(self, error: BaseException):
+        self._errors.append(error)
+        self._stop.set()
+
+    def _put(self, index: int, item: Any) -> bool:
+        q = self.queues[index]
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+            except queue.Full:
+                continue
+            self.high_water[index] = max(self.high_water[index], q.qsize())
+            return True
+        return False
+
+    def _get(self, index: int) -> Any:
+        q = self.queues[index]
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _busy(self, name: str):
+        return self.profiler.busy(name) if self.profiler else nullcontext()
+
+    def _thread(self):
+        return self.profiler.thread() if self.profiler else nullcontext()
+
+    def _produce(self):
+        items = iter(self.source)
+        try:
+            with self._thread():
+                while True:
+                    with self._busy(self.source_name):
+                        item = next(items, _DONE)
+                    if item is _DONE or not self._put(0, item):
+                        return
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(0, _DONE)
+
+    def _work(self, index: int, stage: Stage):
+        try:
+            with self._thread():
+                while True:
+                    item = self._get(index)
+                    if item is _DONE:
+                        break
+                    with self._busy(stage.name):
+                        outputs = list(stage.process(item))
+                    for out in outputs:
+                        if not self._put(index + 1, out):
+                            return
+                if not self._stop.is_set():
+                    with self._busy(stage.name):
+                        outputs = list(stage.finish())
+                    for out in outputs:
+                        if not self._put(index + 1, out):
+                            return
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(index + 1, _DONE)
+
+    def run(self):
+        threads = [threading.Thread(target=self._produce, name="pipeline-source", daemon=True)]
+        threads += [threading.Thread(target=self._work, args=(i, stage), name=f"pipeline-{stage.name}", daemon=True)
+                    for i, stage in enumerate(self.stages)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._get(len(self.stages))
+                if item is _DONE:
+                    break
+                with self._busy(self.sink_name):
+                    self.sink(item)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            raise self._errors[0]
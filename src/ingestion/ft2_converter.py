@@ -3,12 +3,13 @@
 """
 import os
 import csv
-import logging
 import shutil
 from typing import List, Dict, Any
 from datetime import datetime
 
-logger = logging.getLogger(__name__)
+from src.infrastructure.logging import RowWarnings, get_logger
+
+logger = get_logger(__name__)
 
 def convert_csv_to_ft2(csv_path: str, output_path: str):
     """
@@ -35,7 +36,7 @@ def convert_csv_to_ft2(csv_path: str, output_path: str):
             rows = list(reader)
         
         if not rows:
-            logger.warning(f"ملف CSV فارغ: {csv_path}")
+            logger.warning("ملف CSV فارغ: %s", csv_path)
             return
         
         # إنشاء محتوى FT2
@@ -53,44 +54,45 @@ def convert_csv_to_ft2(csv_path: str, output_path: str):
         ft2_content.append("   T AL: +8.0, t AL: 600")
         ft2_content.append("Hist:")
         
-        # إضافة البيانات
-        for i, row in enumerate(rows, 1):
-            try:
-                # تنظيف أسماء الأعمدة من المسافات الزائدة إذا وجدت
-                row = {k.strip(): v for k, v in row.items() if k}
+        # إضافة البيانات (تحذيرات الصفوف محدودة ومُلخصة لكل ملف)
+        with RowWarnings(logger, csv_path) as row_warnings:
+            for i, row in enumerate(rows, 1):
+                try:
+                    # تنظيف أسماء الأعمدة من المسافات الزائدة إذا وجدت
+                    row = {k.strip(): v for k, v in row.items() if k}
                 
-                ts_str = row.get('timestamp', '').strip().replace(' ', 'T')
+                    ts_str = row.get('timestamp', '').strip().replace(' ', 'T')
                 
-                if not ts_str:
-                    logger.warning(f"تخطي صف {i} في {csv_path}: حقل timestamp مفقود أو فارغ")
-                    continue
+                    if not ts_str:
+                        row_warnings.warn("تخطي صف %d في %s: حقل timestamp مفقود أو فارغ", i, csv_path)
+                        continue
 
-                date_str = datetime.fromisoformat(ts_str).strftime('%Y-%m-%d')
-                temp = float(row.get('temperature', 0))
+                    date_str = datetime.fromisoformat(ts_str).strftime('%Y-%m-%d')
+                    temp = float(row.get('temperature', 0))
                 
-                ft2_content.append(f" {i}:")
-                ft2_content.append(f"  Date: {date_str}")
-                ft2_content.append(f"  Min T: {temp:.1f}")
-                ft2_content.append(f"  Max T: {temp:.1f}")
-                ft2_content.append(f"  Avrg T: {temp:.1f}")
-                ft2_content.append(f"  Alarm:")
-                ft2_content.append(f"   0:")
-                ft2_content.append(f"    t Acc: {0 if temp > -0.5 else 60}")
-                ft2_content.append(f"   1:")
-                ft2_content.append(f"    t Acc: {60 if temp > 8.0 else 0}")
+                    ft2_content.append(f" {i}:")
+                    ft2_content.append(f"  Date: {date_str}")
+                    ft2_content.append(f"  Min T: {temp:.1f}")
+                    ft2_content.append(f"  Max T: {temp:.1f}")
+                    ft2_content.append(f"  Avrg T: {temp:.1f}")
+                    ft2_content.append(f"  Alarm:")
+                    ft2_content.append(f"   0:")
+                    ft2_content.append(f"    t Acc: {0 if temp > -0.5 else 60}")
+                    ft2_content.append(f"   1:")
+                    ft2_content.append(f"    t Acc: {60 if temp > 8.0 else 0}")
                 
-            except (KeyError, ValueError) as e:
-                logger.warning(f"تخطي صف {i} في {csv_path}: {e}")
-                continue
+                except (KeyError, ValueError) as e:
+                    row_warnings.warn("تخطي صف %d في %s: %s", i, csv_path, e)
+                    continue
         
         # حفظ الملف
         with open(output_path, 'w', encoding='utf-8') as f_out:
             f_out.write('\n'.join(ft2_content))
         
-        logger.info(f"تم تحويل {csv_path} إلى {output_path} ({len(rows)} صف)")
+        logger.info("تم تحويل %s إلى %s (%d صف)", csv_path, output_path, len(rows))
         
     except Exception as e:
-        logger.error(f"خطأ في تحويل {csv_path}: {e}")
+        logger.error("خطأ في تحويل %s: %s", csv_path, e)
 
 def convert_all_files(input_dir: str, output_dir: str):
     """
@@ -116,15 +118,15 @@ def convert_all_files(input_dir: str, output_dir: str):
             if not is_same_file:
                 try:
                     shutil.copy2(input_path, output_path)
-                    logger.info(f"تم نسخ الملف النصي: {filename}")
+                    logger.info("تم نسخ الملف النصي: %s", filename)
                 except Exception as e:
-                    logger.error(f"فشل نسخ {filename}: {e}")
+                    logger.error("فشل نسخ %s: %s", filename, e)
         
         elif filename.endswith(('.csv', '.tsv')):
             try:
                 convert_csv_to_ft2(input_path, output_path)
                 converted_count += 1
             except Exception as e:
-                logger.error(f"فشل تحويل {filename}: {e}")
+                logger.error("فشل تحويل %s: %s", filename, e)
     
-    logger.info(f"تم تحويل {converted_count} ملف إلى تنسيق FT2")
\ No newline at end of file
+    logger.info("تم تحويل %d ملف إلى تنسيق FT2", converted_count)
\ No newline at end of file
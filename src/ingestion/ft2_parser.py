@@ -1,100 +1,118 @@
 import re
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
+# أنماط مُجمّعة مسبقاً (تُستخدم فقط بعد التوجيه حسب المفتاح الأول في السطر)
+_TEMP_FIELDS = re.compile(r'(?<!TS )(Min T|Max T|Avrg T):\s*([+\-]?\d+\.\d+)')
+_T_ACC = re.compile(r't Acc:\s*(\d+)')
+
+_TEMP_KEYS = {'Min T': 'min_temp', 'Max T': 'max_temp', 'Avrg T': 'avg_temp'}
+
+
 class FT2Parser:
     """
     محلل لملفات Fridge-tag 2 النصية (Legacy Format)
+
+    يقرأ الملف سطراً بسطر (Streaming) ويوجّه كل سطر مرة واحدة حسب مفتاحه الأول
+    (النص قبل أول ':')، ثم يعيد السجلات اليومية كمولّد دون تحميل الملف كاملاً.
     """
-    
-    def parse(self, file_path: str) -> Dict[str, Any]:
+
+    def iter_history(self, file_path: str,
+                     device_info: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
         """
-        تحليل ملف نصي واستخراج البيانات
+        مولّد يعيد سجلاً يومياً واحداً في كل مرة من قسم Hist.
+
+        Args:
+            file_path: مسار الملف النصي
+            device_info: قاموس اختياري يُملأ بمعلومات الجهاز (serial_number, model)
+                أثناء القراءة
+
+        Yields:
+            Dict[str, Any]: سجل يوم واحد (date, min_temp, max_temp, avg_temp, alarms)
         """
-        data = {
-            'device_info': {},
-            'history': []
-        }
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            current_section = None
-            current_entry = {}
-            current_alarm_idx = None
-            
-            for line in lines:
-                line = line.strip()
+        if device_info is None:
+            device_info = {}
+
+        in_history = False
+        day_indent = None
+        current_entry = None
+        current_alarm_idx = None
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for raw in f:
+                line = raw.strip()
                 if not line:
                     continue
-                
-                # استخراج معلومات الجهاز
-                if line.startswith('Serial:'):
-                    data['device_info']['serial_number'] = line.split('Serial:')[1].strip()
-                elif line.startswith('Device:'):
-                    data['device_info']['model'] = line.split('Device:')[1].strip()
-                
-                # تحديد القسم
-                if line.startswith('Hist:'):
-                    current_section = 'history'
+
+                key, sep, rest = line.partition(':')
+                if not sep:
+                    continue
+
+                if not in_history:
+                    # استخراج معلومات الجهاز
+                    if key == 'Serial':
+                        device_info['serial_number'] = rest.strip()
+                    elif key == 'Device':
+                        device_info['model'] = rest.strip()
+                    elif key == 'Hist':
+                        in_history = True
                     continue
-                
-                # معالجة قسم التاريخ
-                if current_section == 'history':
-                    # بداية يوم جديد (رقم متبوع بنقطتين، مثل "1:")
-                    if re.match(r'^\d+:$', line):
+
+                if key.isdigit() and not rest:
+                    indent = len(raw) - len(raw.lstrip())
+                    if day_indent is None:
+                        day_indent = indent
+
+                    if indent <= day_indent:
+                        # بداية يوم جديد (مثل " 1:")
                         if current_entry:
-                            data['history'].append(current_entry)
+                            yield current_entry
                         current_entry = {}
                         current_alarm_idx = None
-                    
-                    # استخراج البيانات لليوم الحالي
-                    elif current_entry is not None:
-                        if line.startswith('Date:'):
-                            current_entry['date'] = line.split('Date:')[1].strip()
-                        
-                        # استخراج درجات الحرارة (قد تكون في سطر واحد أو أسطر متعددة)
-                        # مثال: Min T: +6.1, TS Min T: 16:19
-                        if 'Min T:' in line:
-                            match = re.search(r'Min T:\s*([+\-]?\d+\.\d+)', line)
-                            if match:
-                                current_entry['min_temp'] = float(match.group(1))
-                        
-                        if 'Max T:' in line:
-                            match = re.search(r'Max T:\s*([+\-]?\d+\.\d+)', line)
-                            if match:
-                                current_entry['max_temp'] = float(match.group(1))
-                                
-                        if 'Avrg T:' in line:
-                            match = re.search(r'Avrg T:\s*([+\-]?\d+\.\d+)', line)
-                            if match:
-                                current_entry['avg_temp'] = float(match.group(1))
-                        
-                        # استخراج زمن التنبيهات (t Acc)
-                        if line.startswith('0:'):
-                            current_alarm_idx = '0'
-                        elif line.startswith('1:'):
-                            current_alarm_idx = '1'
-                        
-                        if 't Acc:' in line and current_alarm_idx:
-                            match = re.search(r't Acc:\s*(\d+)', line)
-                            if match:
-                                if 'alarms' not in current_entry: current_entry['alarms'] = {}
-                                current_entry['alarms'][current_alarm_idx] = int(match.group(1))
-
-            # إضافة آخر إدخال
-            if current_entry:
-                data['history'].append(current_entry)
-                
-            logger.info(f"تم استخراج {len(data['history'])} سجل يومي من {file_path}")
+                    else:
+                        # فهرس التنبيه داخل اليوم ("0:" تجميد، "1:" حرارة)
+                        current_alarm_idx = key
+                    continue
+
+                if current_entry is None:
+                    continue
+
+                if key == 'Date':
+                    current_entry['date'] = rest.strip()
+                elif key in _TEMP_KEYS:
+                    # قد تكون درجات الحرارة في سطر واحد أو أسطر متعددة
+                    # مثال: Min T: +6.1, TS Min T: 16:19
+                    for name, value in _TEMP_FIELDS.findall(line):
+                        current_entry[_TEMP_KEYS[name]] = float(value)
+                elif key == 't Acc' and current_alarm_idx is not None:
+                    # استخراج زمن التنبيهات (t Acc)
+                    match = _T_ACC.match(line)
+                    if match:
+                        current_entry.setdefault('alarms', {})[current_alarm_idx] = int(match.group(1))
+
+        # إضافة آخر إدخال
+        if current_entry:
+            yield current_entry
+
+    def parse(self, file_path: str) -> Dict[str, Any]:
+        """
+        تحليل ملف نصي واستخراج البيانات (واجهة متوافقة مع الكود القديم)
+        """
+        data = {
+            'device_info': {},
+            'history': []
+        }
+
+        try:
+            data['history'] = list(self.iter_history(file_path, data['device_info']))
+            logger.info("تم استخراج %d سجل يومي من %s", len(data['history']), file_path)
             return data
-            
+
         except Exception as e:
-            logger.error(f"خطأ في تحليل الملف النصي {file_path}: {e}")
+            logger.error("خطأ في تحليل الملف النصي %s: %s", file_path, e)
             return {}
 
     def get_summary(self):
-        return {}
\ No newline at end of file
+        return {}
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import csv
 import logging
-from typing import Optional
+import os
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from src.infrastructure import profiling
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +21,8 @@ def evaluate_command(input_dir: Optional[str] = None, repository: Optional[objec
     """Run the evaluate use case via the factory. The factory is expected to be monkeypatched in tests."""
     uc = create_evaluate_cold_chain_uc(reader=input_dir, repository=repository)
     logger.info("Running EvaluateColdChainSafetyUC...")
-    results = uc.execute()
+    with profiling.stage("evaluate"):
+        results = uc.execute()
     for r in results:
         logger.info("Vaccine=%s status=%s alert=%s HER=%.3f CCM=%.2f",
                     r.vaccine_id, r.status.value, r.alert_level, r.her, r.ccm)
@@ -24,21 +30,174 @@ def evaluate_command(input_dir: Optional[str] = None, repository: Optional[objec
             logger.info("  - %s", rec)
 
 
+def her_sweep_command(input_dir: str = "data/input_ft2",
+                      q10_values: Sequence[float] = (2.0,),
+                      ideal_temps: Sequence[float] = (5.0,),
+                      shelf_life_days: float = 30,
+                      workers: int = 1,
+                      output: Optional[str] = None) -> List[dict]:
+    """
+    Sweep a (Q10, ideal_temp) grid over the whole fleet from time-at-temperature histograms.
+
+    Each vaccine's HER budget is its profile's shelf life (the vaccines the reader
+    serves to EvaluateColdChainSafetyUC); `shelf_life_days` covers vaccines without one.
+    """
+    from src.infrastructure.adapters.ft2_reader_adapter import FT2ReaderAdapter
+    from src.application.use_cases.what_if_her_uc import WhatIfHeatExposureUC, shelf_life_hours_by_vaccine
+
+    reader = FT2ReaderAdapter(input_dir, workers=workers)
+    with profiling.stage("parse"):
+        batch = reader.read_all_columnar()
+    with profiling.stage("histograms"):
+        what_if = WhatIfHeatExposureUC.from_batch(batch, shelf_life_hours=shelf_life_days * 24,
+                                                  vaccine_shelf_life_hours=shelf_life_hours_by_vaccine(
+                                                      reader.get_vaccines()))
+    logger.info("Built %d device/vaccine histograms from %d readings", len(what_if.keys), len(batch))
+
+    with profiling.stage("sweep"):
+        rows = what_if.sweep(q10_values, ideal_temps)
+    for row in rows:
+        logger.info("Q10=%.2f ideal=%.1f mean HER=%.4f max HER=%.4f over budget=%d/%d",
+                    row['q10_value'], row['ideal_temp'], row['mean_her'], row['max_her'],
+                    row['over_budget'], len(what_if.keys))
+
+    if output:
+        with profiling.stage("report"), open(output, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter='\t')
+            writer.writerow(['key', 'q10_value', 'ideal_temp', 'her'])
+            for row in rows:
+                for key, her in row['her'].items():
+                    writer.writerow([key, row['q10_value'], row['ideal_temp'], f"{her:.6f}"])
+        logger.info("Sweep written to %s", output)
+    return rows
+
+
+def exposure_index_command(input_dir: str = "data/input_ft2",
+                           index_path: str = "data/output/exposure_index.npz",
+                           q10_value: float = 2.0,
+                           ideal_temp: float = 5.0,
+                           max_temp: float = 8.0,
+                           workers: int = 1):
+    """Build the per-device cumulative exposure index and persist it for range queries."""
+    from src.infrastructure.adapters.ft2_reader_adapter import FT2ReaderAdapter
+    from src.core.calculators.vvm_q10_model import VVMQ10Model
+    from src.core.engines.exposure_index import ExposureIndex
+
+    with profiling.stage("parse"):
+        batch = FT2ReaderAdapter(input_dir, workers=workers).read_all_columnar()
+    with profiling.stage("build"):
+        index = ExposureIndex.from_batch(batch, VVMQ10Model(q10_value=q10_value, ideal_temp=ideal_temp),
+                                         max_limit=max_temp)
+    with profiling.stage("save"):
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        index.save_npz(index_path)
+    logger.info("Exposure index for %d devices (%d readings) written to %s",
+                len(index.device_ids), len(index), index_path)
+    return index
+
+
+def her_range_command(index_path: str, device_ids: Sequence[str], start: str, end: str,
+                      shelf_life_days: float = 30) -> List[dict]:
+    """HER accumulated by each device between two ISO timestamps (start inclusive, end exclusive)."""
+    from src.core.engines.exposure_index import ExposureIndex
+    from src.ft2_reader.models.reading_batch import to_epoch_seconds
+
+    with profiling.stage("load"):
+        index = ExposureIndex.load_npz(index_path)
+    start_s = to_epoch_seconds(datetime.fromisoformat(start))
+    end_s = to_epoch_seconds(datetime.fromisoformat(end))
+
+    rows = []
+    for device_id in device_ids:
+        if device_id not in index:
+            logger.warning("Device %s is not in the exposure index", device_id)
+            continue
+        row = dict(index.query(device_id, start_s, end_s, shelf_life_hours=shelf_life_days * 24), device_id=device_id)
+        logger.info("Device=%s %s -> %s readings=%d degradation=%.3fh HER=%.4f above %.1f°C=%.0f min",
+                    device_id, start, end, row['readings'], row['degradation_hours'], row['her'],
+                    index.max_limit, row['above_limit_minutes'])
+        rows.append(row)
+    return rows
+
+
+def pipeline_command(config_path: str, input_dir: str, output_dir: str, incremental: bool = True,
+                     workers: int = 1) -> Optional[dict]:
+    """Run the full FT2 pipeline (scripts/run_ft2_pipeline.py); its stages report to an active profiler."""
+    from scripts.run_ft2_pipeline import run_pipeline
+
+    return run_pipeline(config_path=config_path, input_dir=input_dir, output_dir=output_dir,
+                        incremental=incremental, workers=workers)
+
+
 def main(argv: Optional[list] = None):
     parser = argparse.ArgumentParser(prog="cci-ft2-intelligence")
     parser.add_argument('--verbose', action='store_true', help='enable verbose logging')
+    parser.add_argument('--profile', action='store_true',
+                        help='record wall time, CPU time and peak traced memory per stage')
+    parser.add_argument('--profile-dump', action='store_true', dest='profile_dump',
+                        help='with --profile: also write a cProfile dump and top allocation sites')
+    parser.add_argument('--profile-dir', default="data/output/profiles", help='where --profile-dump writes')
 
     sub = parser.add_subparsers(dest="cmd")
     sub.add_parser("evaluate", help="Run safety evaluation use case")
+    pipeline = sub.add_parser("pipeline", help="Run the full FT2 pipeline (parse, link, rules, report)")
+    pipeline.add_argument('--config', default='config/center_profiles.yaml', help='center profiles YAML')
+    pipeline.add_argument('--input', default='data/input_raw', help='directory of FT2 CSV/TSV exports')
+    pipeline.add_argument('--output', default='data/output', help='output directory')
+    pipeline.add_argument('--full', action='store_true', help='ignore the ingestion manifest')
+    pipeline.add_argument('--workers', type=int, default=1, help='parser processes')
     sub.add_parser("simple-pipeline", help="Run the demo simple pipeline script")
+    sweep = sub.add_parser("her-sweep", help="What-if HER over a grid of Q10 / ideal temperature values")
+    sweep.add_argument('--input-dir', default="data/input_ft2", help='directory of FT2 CSV/TSV exports')
+    sweep.add_argument('--q10', type=float, nargs='+', default=[2.0], help='Q10 values to evaluate')
+    sweep.add_argument('--ideal-temp', type=float, nargs='+', default=[5.0], help='ideal temperatures (°C)')
+    sweep.add_argument('--shelf-life-days', type=float, default=30,
+                       help='HER budget for vaccines without a shelf life in their profile')
+    sweep.add_argument('--workers', type=int, default=1, help='parser processes')
+    sweep.add_argument('--output', help='optional TSV with HER per device/vaccine and grid point')
+    build = sub.add_parser("exposure-index", help="Build the cumulative exposure index for HER range queries")
+    build.add_argument('--input-dir', default="data/input_ft2", help='directory of FT2 CSV/TSV exports')
+    build.add_argument('--index', default="data/output/exposure_index.npz", help='index file to write')
+    build.add_argument('--q10', type=float, default=2.0, help='Q10 value')
+    build.add_argument('--ideal-temp', type=float, default=5.0, help='ideal temperature (°C)')
+    build.add_argument('--max-temp', type=float, default=8.0, help='upper limit for above-limit minutes (°C)')
+    build.add_argument('--workers', type=int, default=1, help='parser processes')
+    her_range = sub.add_parser("her-range", help="HER accumulated by devices over a time range")
+    her_range.add_argument('--index', default="data/output/exposure_index.npz", help='index built by exposure-index')
+    her_range.add_argument('--device', nargs='+', required=True, help='device ids')
+    her_range.add_argument('--start', required=True, help='range start, ISO format (inclusive)')
+    her_range.add_argument('--end', required=True, help='range end, ISO format (exclusive)')
+    her_range.add_argument('--shelf-life-days', type=float, default=30, help='shelf life used as the HER budget')
 
     args = parser.parse_args(argv)
 
     # simple logging setup suitable for tests
     logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
 
+    profile_dir = args.profile_dir if args.profile_dump else None
+    if args.profile or args.profile_dump:
+        profiling.enable_profiling(cprofile=profile_dir is not None,
+                                   top_allocations=profiling.PROFILE_TOP_ALLOCATIONS if profile_dir else 0)
+    try:
+        _run_command(parser, args)
+    finally:
+        profiler = profiling.disable_profiling()
+        if profiler:
+            profiler.log_report(logger, profile_dir, label=args.cmd or "main")
+
+
+def _run_command(parser: argparse.ArgumentParser, args: argparse.Namespace):
     if args.cmd == "evaluate":
         evaluate_command()
+    elif args.cmd == "pipeline":
+        pipeline_command(args.config, args.input, args.output, not args.full, args.workers)
+    elif args.cmd == "her-sweep":
+        her_sweep_command(args.input_dir, args.q10, args.ideal_temp, args.shelf_life_days,
+                          args.workers, args.output)
+    elif args.cmd == "exposure-index":
+        exposure_index_command(args.input_dir, args.index, args.q10, args.ideal_temp, args.max_temp, args.workers)
+    elif args.cmd == "her-range":
+        her_range_command(args.index, args.device, args.start, args.end, args.shelf_life_days)
     elif args.cmd == "simple-pipeline":
         try:
             from scripts.simple_pipeline import run_simple_pipeline
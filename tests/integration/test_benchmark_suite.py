@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from benchmarks.bench_suite import compare, run_suite
+from benchmarks.fleet import FleetSpec, generate_fleet
+from src.ft2_reader.parser.ft2_parser import FT2Parser
+from src.ingestion.ft2_parser import FT2Parser as FT2TextParser
+
+
+def test_fleet_exports_round_trip_through_the_parsers(tmp_path):
+    fleet = generate_fleet(FleetSpec(devices=4, days=3, cadence_minutes=30,
+                                     profile_mix={'stable': 1, 'heat': 1}, seed=3))
+    assert fleet.temperatures.shape == (4, 3 * 48)
+    assert set(fleet.profiles) <= {'stable', 'heat'}
+
+    paths = fleet.write_csv(str(tmp_path / "csv"))
+    batch = FT2Parser.parse_file_columnar(paths[2])
+    assert batch.device_ids == (fleet.device_ids[2],)
+    np.testing.assert_array_equal(batch.timestamps, fleet.timestamps)
+    np.testing.assert_array_equal(batch.temperatures, fleet.temperatures[2])
+
+    history = FT2TextParser().parse(fleet.write_ft2_text(str(tmp_path / "ft2"))[2])['history']
+    assert [day['date'] for day in history] == ["2024-01-03", "2024-01-02", "2024-01-01"]
+    assert history[-1]['max_temp'] == pytest.approx(fleet.temperatures[2, :48].max(), abs=0.051)
+
+
+def test_excursion_profiles_shift_temperatures():
+    def fleet(profile):
+        return generate_fleet(FleetSpec(devices=20, days=30, profile_mix={profile: 1.0})).temperatures
+
+    assert (fleet('heat') > 10).any() and not (fleet('stable') > 10).any()
+    assert (fleet('freeze') < -0.5).any()
+    with pytest.raises(ValueError):
+        generate_fleet(FleetSpec(cadence_minutes=7))
+
+
+def test_suite_runs_and_compares_against_a_baseline():
+    spec = FleetSpec(devices=3, days=2, profile_mix={'freeze': 1.0})
+    results = run_suite(spec, repeat=1, only=['parse_csv', 'link', 'apply_rules', 'evaluate_uc', 'csv_report'])
+
+    scenarios = results['scenarios']
+    assert scenarios['parse_csv']['items'] == scenarios['link']['items'] == 3 * 2 * 96
+    assert scenarios['apply_rules']['items'] == scenarios['csv_report']['items'] == 3
+    assert scenarios['evaluate_uc']['items'] == 3
+    assert compare(results, results) == []
+
+    faster = {**results, 'scenarios': {n: dict(r, seconds=r['seconds'] / 10 - 0.01) for n, r in scenarios.items()}}
+    assert [line.split(':')[0] for line in compare(results, faster)] == list(scenarios)
+    assert compare(results, dict(results, fleet={})) != []
@@ -53,3 +53,71 @@ def test_cli_simple_pipeline_invokes_run(monkeypatch, caplog):
 
     assert called.get("ok") is True
     assert "simple-pipeline-run" in caplog.text
+
+
+def test_cli_her_sweep_writes_grid(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "d1.csv").write_text(
+        "device_id,timestamp,temperature,vaccine_type\n"
+        "D1,2023-10-01T10:00:00,15.0,BCG\n"
+        "D1,2023-10-01T10:15:00,5.0,BCG\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "sweep.tsv"
+
+    main.main(["her-sweep", "--input-dir", str(input_dir), "--q10", "2", "2.5",
+               "--ideal-temp", "4", "5", "--output", str(output)])
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "key\tq10_value\tideal_temp\ther"
+    assert len(lines) == 1 + 4
+    assert "Q10=2.50 ideal=4.0" in caplog.text
+
+
+def test_cli_exposure_index_and_her_range(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "d1.csv").write_text(
+        "device_id,timestamp,temperature,vaccine_type\n"
+        "D1,2026-01-30T01:00:00,5.0,BCG\n"
+        "D1,2026-01-30T02:00:00,15.0,BCG\n"
+        "D1,2026-01-30T02:15:00,5.0,BCG\n"
+        "D1,2026-02-04T00:00:00,15.0,BCG\n",
+        encoding="utf-8",
+    )
+    index_path = tmp_path / "index" / "exposure_index.npz"
+
+    main.main(["exposure-index", "--input-dir", str(input_dir), "--index", str(index_path)])
+    assert index_path.exists()
+
+    rows = main.her_range_command(str(index_path), ["D1", "D9"], "2026-01-30 02:00", "2026-02-03 14:00",
+                                  shelf_life_days=1)
+    assert len(rows) == 1
+    # One segment between the two readings in range: 15 min at 15°C (Q10=2, ideal 5°C => x2**1)
+    assert rows[0]['readings'] == 2
+    assert rows[0]['degradation_hours'] == pytest.approx(0.25 * 2)
+    assert rows[0]['above_limit_minutes'] == pytest.approx(15.0)
+    assert rows[0]['her'] == pytest.approx(0.5 / 24)
+    assert "Device D9 is not in the exposure index" in caplog.text
+
+    main.main(["her-range", "--index", str(index_path), "--device", "D1",
+               "--start", "2026-01-30T00:00", "--end", "2026-02-05T00:00"])
+    assert "readings=4" in caplog.text
+
+
+def test_cli_profile_logs_stage_table(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    (input_dir / "d1.csv").write_text(
+        "device_id,timestamp,temperature\nD1,2026-01-30T01:00:00,5.0\n", encoding="utf-8")
+
+    main.main(["--profile", "exposure-index", "--input-dir", str(input_dir),
+               "--index", str(tmp_path / "exposure_index.npz")])
+
+    table = caplog.text[caplog.text.index("Stage profile"):]
+    for stage in ("parse", "build", "save", "total"):
+        assert f"  {stage} " in table
@@ -143,4 +143,56 @@ class TestEvaluateColdChainSafetyUCWithQ10:
         uc = EvaluateColdChainSafetyUC(mock_reader, mock_repo)
         results = uc.execute()
         
-        assert len(results) == 0
\ No newline at end of file
+        assert len(results) == 0
+
+    def test_what_if_her_reuses_histograms_from_execute(self, mock_reader, mock_repo):
+        """
+        Tests that HER can be re-evaluated under other Q10 parameters from the
+        histograms kept by execute(), without re-reading.
+        """
+        vaccine = Vaccine(
+            id="v1", name="Polio",
+            full_loss_threshold_low=0.0, full_loss_threshold_high=40.0,
+            shelf_life_days=30, reference_table=[],
+            q10_value=2.0, ideal_temp=5.0
+        )
+        mock_reader.get_vaccines.return_value = [vaccine]
+        t0 = datetime.now()
+        mock_reader.read_all.return_value = [
+            TemperatureReading("v1", 15.0, t0),
+            TemperatureReading("v1", 5.0, t0 + timedelta(hours=12)),
+        ]
+
+        uc = EvaluateColdChainSafetyUC(mock_reader, mock_repo)
+        result = uc.execute()[0]
+        mock_reader.read_all.reset_mock()
+
+        assert uc.what_if_her(2.0, 5.0)["v1"] == pytest.approx(result.her)
+        # 12 h at 15 °C with Q10 = 2.5 and ideal 4 °C: 12 * 2.5 ** 1.1 / 720
+        assert uc.what_if_her(2.5, 4.0)["v1"] == pytest.approx(12 * 2.5 ** 1.1 / 720)
+        mock_reader.read_all.assert_not_called()
+
+    def test_interleaved_readings_are_grouped_per_vaccine_in_time_order(self, mock_reader, mock_repo):
+        """
+        Tests that readings from several vaccines, delivered interleaved and out
+        of order, are partitioned once and evaluated chronologically per vaccine.
+        """
+        vaccines = [
+            Vaccine(id=v_id, name=v_id, full_loss_threshold_low=0.0, full_loss_threshold_high=40.0,
+                    shelf_life_days=30, reference_table=[], q10_value=2.0, ideal_temp=5.0)
+            for v_id in ("v1", "v2")
+        ]
+        mock_reader.get_vaccines.return_value = vaccines
+        t0 = datetime.now()
+        mock_reader.read_all.return_value = [
+            TemperatureReading("v2", 5.0, t0 + timedelta(hours=6)),
+            TemperatureReading("v1", 5.0, t0 + timedelta(hours=12)),
+            TemperatureReading("v2", 25.0, t0),
+            TemperatureReading("v1", 15.0, t0),
+        ]
+
+        results = {r.vaccine_id: r for r in EvaluateColdChainSafetyUC(mock_reader, mock_repo).execute()}
+
+        assert results["v1"].her == pytest.approx(12 * 2.0 / 720)
+        assert results["v2"].her == pytest.approx(6 * 4.0 / 720)
+        assert results["v2"].ccm == pytest.approx(20.0)
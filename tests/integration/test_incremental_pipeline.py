@@ -0,0 +1,202 @@
+import json
+
+import pytest
+
+import scripts.run_ft2_pipeline as pipeline
+
+CENTERS_YAML = """
+- id: "C1"
+  name: "Center 1"
+  device_ids: ["D1"]
+  temperature_ranges: {min: 2, max: 8}
+  decision_thresholds: {ccm_limit: 600}
+- id: "C2"
+  name: "Center 2"
+  device_ids: ["D2"]
+  temperature_ranges: {min: 2, max: 8}
+  decision_thresholds: {ccm_limit: 600}
+"""
+
+
+def _write_export(path, device_id, temps):
+    rows = "\n".join(f"{device_id},2024-01-15T08:{15 * i:02d}:00,{t}" for i, t in enumerate(temps))
+    path.write_text(f"device_id,timestamp,temperature\n{rows}\n", encoding="utf-8")
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "centers.yaml").write_text(CENTERS_YAML, encoding="utf-8")
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    _write_export(input_dir / "d1.csv", "D1", [5.0, 5.5])
+    _write_export(input_dir / "d2.csv", "D2", [4.0, 4.5])
+    return tmp_path
+
+
+def _run(workspace, monkeypatch):
+    evaluated = []
+    real_apply_rules = pipeline.apply_rules
+
+    def spy(center, *args, **kwargs):
+        evaluated.append(center.id)
+        return real_apply_rules(center, *args, **kwargs)
+
+    monkeypatch.setattr(pipeline, "apply_rules", spy)
+    pipeline.run_pipeline(config_path=str(workspace / "centers.yaml"),
+                          input_dir=str(workspace / "input"),
+                          output_dir=str(workspace / "output"))
+    report = (workspace / "output" / "centers_report.tsv").read_text(encoding="utf-8")
+    return sorted(evaluated), report
+
+
+def test_rerun_reuses_unchanged_files_and_centers(workspace, monkeypatch):
+    evaluated, first_report = _run(workspace, monkeypatch)
+    assert evaluated == ["C1", "C2"]
+
+    evaluated, second_report = _run(workspace, monkeypatch)
+    assert evaluated == []
+    assert second_report == first_report
+
+
+def test_rerun_recomputes_only_changed_device_centers(workspace, monkeypatch):
+    _run(workspace, monkeypatch)
+
+    _write_export(workspace / "input" / "d2.csv", "D2", [4.0, -3.0, 4.5])
+    evaluated, report = _run(workspace, monkeypatch)
+
+    assert evaluated == ["C2"]
+    c2_row = next(line for line in report.splitlines() if line.startswith("C2"))
+    assert "REJECTED_FREEZE" in c2_row
+
+
+def test_corrupt_file_fails_on_every_run_and_is_not_cached(workspace):
+    (workspace / "input" / "d2.csv").write_bytes(b"\xff\xfe\x00garbage")
+
+    for _ in range(2):
+        summary = pipeline.run_pipeline(config_path=str(workspace / "centers.yaml"),
+                                        input_dir=str(workspace / "input"),
+                                        output_dir=str(workspace / "output"))
+        assert (summary['processed_files'], summary['failed_files']) == (1, 1)
+
+def test_config_edit_recomputes_only_affected_centers(workspace, monkeypatch):
+    _run(workspace, monkeypatch)
+    config = workspace / "centers.yaml"
+
+    # تعديل لا يغير مدخلات القواعد: لا إعادة تقييم، والتقرير يعكس الاسم الجديد
+    config.write_text(CENTERS_YAML.replace('"Center 2"', '"Center Two"'), encoding="utf-8")
+    evaluated, report = _run(workspace, monkeypatch)
+    assert evaluated == []
+    assert "Center Two" in report
+
+    # نقل الجهاز D2 إلى C1: قراءات C1 تغيرت فقط
+    config.write_text(CENTERS_YAML.replace('["D1"]', '["D1", "D2"]').replace('["D2"]', '[]'), encoding="utf-8")
+    evaluated, _ = _run(workspace, monkeypatch)
+    assert evaluated == ["C1"]
+
+
+def test_rule_metrics_written_next_to_report(workspace):
+    summary = pipeline.run_pipeline(config_path=str(workspace / "centers.yaml"),
+                                    input_dir=str(workspace / "input"),
+                                    output_dir=str(workspace / "output"),
+                                    incremental=False, rule_metrics=True)
+
+    metrics = json.loads((workspace / "output" / "rule_metrics.json").read_text(encoding="utf-8"))
+    assert metrics == summary['rule_metrics']
+    assert metrics['centers'] == summary['evaluated_centers'] == 2
+    assert metrics['rules']['DefaultRule']['decisions'] == 2
+
+
+def test_parallel_parsing_and_small_queues_give_the_same_report(workspace):
+    reports = []
+    for workers, queue_depth in ((1, 4), (2, 1)):
+        output_dir = workspace / f"output_{workers}"
+        summary = pipeline.run_pipeline(config_path=str(workspace / "centers.yaml"),
+                                        input_dir=str(workspace / "input"),
+                                        output_dir=str(output_dir),
+                                        incremental=False, workers=workers, queue_depth=queue_depth)
+        assert summary['evaluated_centers'] == 2
+        reports.append((output_dir / "centers_report.tsv").read_text(encoding="utf-8"))
+    assert reports[0] == reports[1]
+
+
+def test_profile_reports_every_stage_and_dumps_profiles(workspace):
+    profile_dir = workspace / "profiles"
+    summary = pipeline.run_pipeline(config_path=str(workspace / "centers.yaml"),
+                                    input_dir=str(workspace / "input"),
+                                    output_dir=str(workspace / "output"),
+                                    profile=True, profile_dir=str(profile_dir))
+
+    stages = summary['profile']['stages']
+    assert {"setup", "load_centers", "parse", "link", "rules", "report"} <= set(stages)
+    assert stages["report"]['calls'] == 2
+    assert stages["stream"]['peak_bytes'] > 0
+    assert sorted(p.suffix for p in profile_dir.iterdir()) == [".json", ".prof", ".txt"]
+
+
+def _link_stage(workspace, file_devices):
+    centers = pipeline.load_centers(str(workspace / "centers.yaml"))
+    centers.append(pipeline.CenterDTO(id="C3", name="Center 3", device_ids=["D3"]))
+    return pipeline._LinkStage(centers, pipeline.DeviceIndex(centers), None, str(workspace / "input"),
+                               sorted(file_devices), [], file_devices)
+
+
+def _batch(workspace, name):
+    return pipeline.FT2Parser.parse_file_columnar(str(workspace / "input" / name))
+
+
+def test_link_stage_releases_each_center_after_its_last_known_file(workspace):
+    stage = _link_stage(workspace, {"d1.csv": ["D1"], "d2.csv": ["D2"]})
+
+    assert [c.id for c in stage.process(("d1.csv", _batch(workspace, "d1.csv")))] == ["C1"]
+    assert [c.id for c in stage.process(("d2.csv", _batch(workspace, "d2.csv")))] == ["C2"]
+    # Centers without files are released once linking is done
+    assert [c.id for c in stage.finish()] == ["C3"]
+
+
+def test_link_stage_holds_every_center_until_unknown_files_are_linked(workspace):
+    stage = _link_stage(workspace, {"d1.csv": ["D1"], "d2.csv": None, "d3.csv": None})
+
+    # Unknown files could hold readings of any center: nothing is released before they are linked
+    assert stage.process(("d2.csv", _batch(workspace, "d2.csv"))) == ()
+    # A failed file (batch None) still counts as linked
+    assert [c.id for c in stage.process(("d3.csv", None))] == ["C2", "C3"]
+    assert [c.id for c in stage.process(("d1.csv", _batch(workspace, "d1.csv")))] == ["C1"]
+    assert stage.finish() == []
+
+
+def test_known_file_that_changed_mid_run_never_links_into_a_released_center(workspace):
+    # d2.csv was planned as a D2 export but now also holds D1 readings
+    _write_export(workspace / "input" / "d2.csv", "D1", [9.0, 9.5])
+    changed = _batch(workspace, "d2.csv")
+
+    stage = _link_stage(workspace, {"d1.csv": ["D1"], "d2.csv": ["D2"]})
+    assert [c.id for c in stage.process(("d1.csv", _batch(workspace, "d1.csv")))] == ["C1"]
+    assert [c.id for c in stage.process(("d2.csv", changed))] == ["C2"]
+    c1 = stage.centers[0]
+    assert len(c1.reading_batches) == 1
+    assert [f for f, _ in stage.failed_files] == ["d2.csv"] and "C1" in stage.failed_files[0][1]
+
+    # Before C1 is released the extra readings are linked and C1 still waits for its own file
+    stage = _link_stage(workspace, {"d1.csv": ["D1"], "d2.csv": ["D2"]})
+    assert [c.id for c in stage.process(("d2.csv", changed))] == ["C2"]
+    assert [c.id for c in stage.process(("d1.csv", _batch(workspace, "d1.csv")))] == ["C1"]
+    assert len(stage.centers[0].reading_batches) == 2 and stage.failed_files == []
+
+
+def test_reading_batches_are_released_once_the_report_row_is_written(workspace, monkeypatch):
+    written = []
+    real_write = pipeline.CentersReportWriter.write
+
+    def spy(self, center):
+        written.append((center, len(center.reading_batches)))
+        return real_write(self, center)
+
+    monkeypatch.setattr(pipeline.CentersReportWriter, "write", spy)
+    for _ in range(2):  # cold run, then warm run from the manifest
+        written.clear()
+        pipeline.run_pipeline(config_path=str(workspace / "centers.yaml"),
+                              input_dir=str(workspace / "input"),
+                              output_dir=str(workspace / "output"))
+        assert [(center.id, batches) for center, batches in written] == [("C1", 1), ("C2", 1)]
+        assert all(center.reading_batches == [] for center, _ in written)
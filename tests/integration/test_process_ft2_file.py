@@ -0,0 +1,44 @@
+from src.application.dtos.center_dto import CenterDTO
+from src.ft2_reader.parser.ft2_parser import FT2Parser
+from src.ft2_reader.services.ft2_linker import DeviceIndex
+
+import scripts.run_ft2_pipeline as pipeline
+
+
+def _write_export(path, device_id, temps):
+    rows = "\n".join(f"{device_id},2024-01-15T08:{15 * i:02d}:00,{t}" for i, t in enumerate(temps))
+    path.write_text(f"device_id,timestamp,temperature\n{rows}\n", encoding="utf-8")
+
+
+def test_each_file_is_parsed_and_linked_once(tmp_path, monkeypatch):
+    paths = []
+    for i, temps in enumerate([[5.0, 5.5], [4.0, -3.0], [6.0], [5.0]]):
+        path = tmp_path / f"d{i}.csv"
+        _write_export(path, f"D{i}", temps)
+        paths.append(str(path))
+    centers = [CenterDTO(id="C0", name="Center 0", device_ids=["D0", "D3"]),
+               CenterDTO(id="C1", name="Center 1", device_ids=["D1"]),
+               CenterDTO(id="C2", name="Center 2", device_ids=["D2"])]
+    device_index = DeviceIndex(centers)
+
+    parsed = []
+    real_parse = FT2Parser.parse_file_columnar
+    monkeypatch.setattr(FT2Parser, "parse_file_columnar",
+                        staticmethod(lambda path: parsed.append(path) or real_parse(path)))
+
+    results = [pipeline.process_ft2_file_new(p, centers, device_index) for p in paths]
+
+    assert parsed == paths
+    assert [len(c.reading_batches) for c in centers] == [2, 1, 1]
+    assert [[a['center_id'] for a in r['centers_affected']] for r in results] == [["C0"], ["C1"], ["C2"], ["C0"]]
+    assert results[1]['centers_affected'][0]['decision'] == "REJECTED_FREEZE"
+    assert results[3]['entries_count'] == 1
+    assert results[3]['centers_affected'][0]['entries_count'] == 3
+
+
+def test_regression_benchmark_parses_each_file_once():
+    from benchmarks.bench_process_ft2_files import run
+
+    result = run(files=5, rows=8)
+    assert result['parse_calls'] == result['files'] == 5
+    assert result['batches_per_center'] == [1]
@@ -1,7 +1,9 @@
+import random
 import pytest
 from datetime import datetime, timedelta
 from src.core.calculators.ccm_calculator import CCMCalculator
 from src.core.entities.temperature_reading import TemperatureReading
+from src.core.value_objects.reading_series import ReadingSeries
 
 class TestCCMCalculator:
     
@@ -78,3 +80,52 @@ class TestCCMCalculator:
         assert "ccm_delta" in result
         assert "ccm_auc" in result
         assert result["method_used"] == "both"
+
+    def test_calculate_sorts_once_and_presorted_skips_sort(self, calculator):
+        t0 = datetime.now()
+        readings = [
+            TemperatureReading("v1", 4.0, t0 + timedelta(minutes=60)),
+            TemperatureReading("v1", 5.0, t0),
+            TemperatureReading("v1", 10.0, t0 + timedelta(minutes=30)),
+        ]
+        chronological = sorted(readings, key=lambda r: r.recorded_at)
+
+        result = calculator.calculate(readings)
+        assert result == calculator.calculate(chronological, presorted=True)
+        assert result["ccm_delta"] == 11.0
+        # presorted=True trusts the caller's order
+        assert calculator.calculate_delta(readings, presorted=True) == 6.0
+
+    def test_fused_pass_matches_separate_metrics(self, calculator):
+        rng = random.Random(7)
+        t0 = datetime(2024, 1, 15)
+        readings, minutes = [], 0
+        for _ in range(300):
+            minutes += rng.choice([5, 15, 30])
+            readings.append(TemperatureReading("v1", round(rng.uniform(2.0, 14.0), 1), t0 + timedelta(minutes=minutes)))
+
+        result = calculator.calculate(readings, presorted=True)
+        assert result["ccm_delta"] == pytest.approx(calculator.calculate_delta(readings))
+        assert result["ccm_auc"] == pytest.approx(calculator.calculate_auc(readings))
+
+        epoch = [r.recorded_at.timestamp() for r in readings]
+        temps = [r.value for r in readings]
+        assert calculator.calculate_arrays(epoch, temps) == pytest.approx(result)
+        assert calculator.calculate(ReadingSeries.from_readings(readings)) == pytest.approx(result)
+
+    def test_fused_pass_short_inputs(self, calculator):
+        assert calculator.calculate_arrays([], [])["ccm_auc"] == 0.0
+        assert calculator.calculate(ReadingSeries.from_readings([]))["ccm_delta"] == 0.0
+        with pytest.raises(ValueError):
+            calculator.calculate_arrays([0.0, 60.0], [5.0])
+
+    def test_calculate_rejects_reading_batches(self, calculator, tmp_path):
+        from src.ft2_reader.parser.ft2_parser import FT2Parser
+
+        p = tmp_path / "mixed.csv"
+        p.write_text("device_id,timestamp,temperature\nD1,2024-01-15T08:00:00,5.0\n"
+                     "D2,2024-01-15T08:00:00,12.0\nD1,2024-01-15T08:15:00,9.0\n", encoding="utf-8")
+
+        # durations are per reading and devices are mixed: not a time-to-next series
+        with pytest.raises(TypeError):
+            calculator.calculate(FT2Parser.parse_file_columnar(str(p)), presorted=True)
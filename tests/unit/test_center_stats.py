@@ -0,0 +1,113 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from src.core.entities.vaccination_center import VaccinationCenter
+from src.core.services.rules_engine import (LazyCenterStats, apply_rules, apply_rules_batch,
+                                            calculate_center_stats)
+from src.core.value_objects.center_stats import CenterStatsAccumulator
+from src.ft2_reader.parser.ft2_parser import FT2Entry
+
+
+def _entry(temp, minutes=15.0, device_id="D1"):
+    return FT2Entry(device_id, datetime(2024, 1, 15), temp, "VaxA", "B1", duration_minutes=minutes)
+
+
+@pytest.fixture
+def center():
+    return VaccinationCenter(id="C1", name="Center 1", device_ids=["D1"],
+                             temperature_ranges={"min": 2, "max": 8},
+                             decision_thresholds={"ccm_limit": 20})
+
+
+def test_accumulator_is_built_on_first_read_and_shared_with_rules(center):
+    center.add_ft2_entries([_entry(5.0), _entry(-1.0, 10.0), _entry(9.5, 30.0)])
+    assert center.stats_accumulator is None  # linking does not scan the readings
+
+    stats = calculate_center_stats(center)
+    acc = center.stats_accumulator
+    assert (acc.count, acc.min_temp, acc.max_temp) == (3, -1.0, 9.5)
+    assert calculate_center_stats(center) == stats and center.stats_accumulator is acc
+    assert stats == {
+        'freeze_duration': 10.0, 'heat_duration': 30.0, 'has_freeze': True,
+        'has_ccm_violation': True, 'avg_temp': pytest.approx(13.5 / 3),
+        'min_temp': -1.0, 'max_temp': 9.5,
+    }
+
+
+def test_only_new_entries_are_folded(center):
+    center.add_ft2_entries([_entry(5.0)])
+    center.ft2_entries.append(_entry(7.0))  # appended outside the linker
+    assert calculate_center_stats(center)['avg_temp'] == 6.0
+
+    center.ft2_entries = [_entry(3.0)]  # replaced list -> rebuilt
+    assert calculate_center_stats(center)['max_temp'] == 3.0
+
+
+def test_threshold_change_rebuilds_accumulator(center):
+    center.add_ft2_entries([_entry(7.0)])
+    assert calculate_center_stats(center)['heat_duration'] == 0
+    center.temperature_ranges = {"min": 2, "max": 6}
+    assert calculate_center_stats(center)['heat_duration'] == 15.0
+
+
+def test_shards_merge_to_the_same_result():
+    entries = [_entry(t) for t in (4.0, -2.0, 11.0, 6.5, 8.5)]
+    whole = CenterStatsAccumulator()
+    whole.add_entries(entries)
+
+    left, right = CenterStatsAccumulator(), CenterStatsAccumulator()
+    left.add_entries(entries[:2])
+    right.add_entries(entries[2:])
+
+    assert (left + right).to_stats() == whole.to_stats()
+    with pytest.raises(ValueError):
+        left.merge(CenterStatsAccumulator(max_limit=10.0))
+
+
+def _plain_center(**attrs):
+    """مركز بدون مُجمّع مسبق: يظهر stats_accumulator فقط إذا مُسحت القراءات"""
+    return SimpleNamespace(id="C1", temperature_ranges={"min": 2, "max": 8}, decision_thresholds={},
+                           ft2_entries=[_entry(5.0), _entry(9.5, 30.0)], **attrs)
+
+
+def test_lazy_stats_compute_on_first_read_only():
+    center = _plain_center()
+    stats = LazyCenterStats(center, {'her': 0.3, 'max_temp': 4.0})
+
+    assert 'min_temp' in stats and stats.get('critical_temp_limit', 10.0) == 10.0
+    assert stats['her'] == 0.3 and not stats.computed
+
+    assert stats['max_temp'] == 4.0  # القيم الممررة تتقدم على المحسوبة
+    assert stats['min_temp'] == 5.0 and stats.computed
+    assert dict(stats) == dict(calculate_center_stats(center), her=0.3, max_temp=4.0)
+
+
+@pytest.mark.parametrize("attrs, extra, decision", [
+    ({'expiry_date': "2001-01-01"}, None, "REJECTED_EXPIRED"),
+    ({}, {'her': 1.2}, "REJECTED_HEAT_C"),
+])
+def test_centers_decided_before_temperature_rules_skip_the_scan(attrs, extra, decision):
+    center = _plain_center(**attrs)
+    apply_rules(center, extra_stats=extra)
+    assert center.decision == decision
+    assert not hasattr(center, 'stats_accumulator')
+
+    batch_center = _plain_center(**attrs)
+    assert apply_rules_batch([batch_center], [extra]) == [decision]
+    assert not hasattr(batch_center, 'stats_accumulator')
+
+    linked_center = VaccinationCenter(id="C2", name="Center 2", device_ids=["D1"],
+                                      temperature_ranges={"min": 2, "max": 8}, decision_thresholds={})
+    for name, value in attrs.items():
+        setattr(linked_center, name, value)
+    linked_center.add_ft2_entries([_entry(5.0), _entry(9.5, 30.0)])
+    apply_rules(linked_center, extra_stats=extra)
+    assert linked_center.decision == decision
+    assert linked_center.stats_accumulator is None
+
+
+def test_centers_reaching_temperature_rules_are_scanned():
+    center = _plain_center()
+    apply_rules(center)
+    assert center.decision == "ACCEPTED" and center.has_warning  # 9.5°C > 8°C
+    assert center.stats_accumulator.count == 2
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from src.core.calculators.vvm_q10_model import VVMQ10Model
+from src.core.engines.exposure_index import ExposureIndex
+from src.ft2_reader.models.reading_batch import ReadingBatch
+
+MODEL = VVMQ10Model(q10_value=2.0, ideal_temp=5.0)
+
+
+def _batch(seed=0, n=300):
+    rng = np.random.default_rng(seed)
+    return ReadingBatch(
+        timestamps=(1_700_000_000 + rng.permutation(n) * 900).astype(np.int64),
+        temperatures=rng.uniform(0.0, 16.0, n).round(1).astype(np.float32),
+        durations=np.full(n, 15.0, dtype=np.float32),
+        device_codes=rng.integers(0, 3, n).astype(np.int32),
+        vaccine_codes=np.zeros(n, dtype=np.int32),
+        batch_codes=np.zeros(n, dtype=np.int32),
+        device_ids=("D1", "D2", "D3"), vaccine_types=("VaxA",), batches=("B1",),
+    )
+
+
+def _brute_force(batch, device_id, start, end):
+    """The readings in range evaluated alone: segments up to the next reading, last one excluded"""
+    rows = ((batch.device_codes == batch.device_ids.index(device_id))
+            & (batch.timestamps >= start) & (batch.timestamps < end))
+    order = np.argsort(batch.timestamps[rows], kind="stable")
+    temps = batch.temperatures[rows][order].astype(np.float64)[:-1]
+    minutes = np.diff(batch.timestamps[rows][order]) / 60.0
+    hours = MODEL.calculate_cumulative_degradation_hours_array(temps, minutes / 60.0)
+    return int(rows.sum()), hours, float(minutes[temps > 8.0].sum())
+
+
+def test_range_queries_match_brute_force():
+    batch = _batch()
+    index = ExposureIndex.from_batch(batch, MODEL)
+    assert len(index) == len(batch) and set(index.device_ids) == {"D1", "D2", "D3"}
+
+    rng = np.random.default_rng(1)
+    t_min, t_max = int(batch.timestamps.min()), int(batch.timestamps.max())
+    for _ in range(50):
+        start, end = sorted(rng.integers(t_min - 3600, t_max + 3600, 2).tolist())
+        device_id = str(rng.choice(index.device_ids))
+        readings, hours, above = _brute_force(batch, device_id, start, end)
+
+        result = index.query(device_id, start, end, shelf_life_hours=720.0)
+        assert result['readings'] == readings
+        assert result['degradation_hours'] == pytest.approx(hours, abs=1e-9)
+        assert result['above_limit_minutes'] == pytest.approx(above)
+        assert result['her'] == pytest.approx(hours / 720.0, abs=1e-12)
+
+
+def test_empty_and_inverted_ranges():
+    index = ExposureIndex.from_batch(_batch(), MODEL)
+    assert index.query("D1", 0, 0)['readings'] == 0
+    assert index.query("D1", 2_000_000_000, 1_000_000_000)['degradation_hours'] == 0.0
+    assert 'her' not in index.query("D1", 0, 1)
+    with pytest.raises(KeyError):
+        index.query("D9", 0, 1)
+
+    empty = ExposureIndex.from_batch(ReadingBatch.empty(), MODEL)
+    assert len(empty) == 0 and "D1" not in empty
+
+
+def test_round_trip_through_npz(tmp_path):
+    index = ExposureIndex.from_batch(_batch(), MODEL, max_limit=10.0)
+    path = tmp_path / "exposure_index.npz"
+    index.save_npz(str(path))
+
+    loaded = ExposureIndex.load_npz(str(path))
+    assert loaded.device_ids == index.device_ids
+    assert (loaded.q10_value, loaded.ideal_temp, loaded.max_limit) == (2.0, 5.0, 10.0)
+    start, end = 1_700_000_000, 1_700_100_000
+    assert loaded.query("D2", start, end, 720.0) == index.query("D2", start, end, 720.0)
+
+
+def test_range_her_matches_evaluated_her_for_the_same_readings():
+    from datetime import datetime, timezone
+    from unittest.mock import MagicMock
+    from src.application.use_cases.evaluate_cold_chain_safety_uc import EvaluateColdChainSafetyUC
+    from src.core.entities.temperature_reading import TemperatureReading
+    from src.core.entities.vaccine import Vaccine
+
+    batch = _batch(seed=3)
+    index = ExposureIndex.from_batch(batch, MODEL)
+    start, end = 1_700_020_000, 1_700_200_000
+    rows = ((batch.device_codes == 1) & (batch.timestamps >= start) & (batch.timestamps < end))
+
+    reader = MagicMock()
+    reader.get_vaccines.return_value = [Vaccine(id="VaxA", name="A", full_loss_threshold_low=0.0,
+                                                full_loss_threshold_high=40.0, shelf_life_days=30,
+                                                reference_table=[])]
+    reader.read_all.return_value = [TemperatureReading("VaxA", float(t), datetime.fromtimestamp(int(s), timezone.utc))
+                                    for s, t in zip(batch.timestamps[rows], batch.temperatures[rows])]
+    evaluated = EvaluateColdChainSafetyUC(reader).execute()[0].her
+
+    assert index.query("D2", start, end, shelf_life_hours=30 * 24)['her'] == pytest.approx(evaluated, rel=1e-9)
@@ -1,8 +1,9 @@
 # tests/unit/test_ft2_linker.py
 import pytest
 from datetime import datetime
-from src.ft2_reader.services.ft2_linker import FT2Linker
-from src.ft2_reader.parser.ft2_parser import FT2Entry
+from src.ft2_reader.services.ft2_linker import FT2Linker, DeviceIndex
+from src.ft2_reader.parser.ft2_parser import FT2Entry, FT2Parser
+from src.core.services.rules_engine import calculate_center_stats
 from src.core.entities.vaccination_center import VaccinationCenter, FreezeTolerance
 
 # Fixtures for test data
@@ -137,3 +138,84 @@ def test_link_with_empty_centers_list(sample_entries):
     # All entries should be yielded with None as the center
     assert len(linked_results) == len(sample_entries)
     assert all(center is None for entry, center in linked_results)
+
+def test_link_batch_hands_each_center_one_slice(sample_centers, tmp_path):
+    """
+    Tests that `link_batch` partitions a columnar batch by center without
+    creating per-row entries and reports per-device counts like `link_grouped`.
+    """
+    # Arrange
+    p = tmp_path / "readings.csv"
+    p.write_text(
+        "device_id,timestamp,temperature\n"
+        "device_A1,2023-10-01T10:00:00,5.0\n"
+        "device_B1,2023-10-01T10:00:00,4.0\n"
+        "device_A2,2023-10-01T10:15:00,-1.0\n"
+        "device_C1,2023-10-01T10:15:00,6.0\n",
+        encoding="utf-8",
+    )
+    batch = FT2Parser.parse_file_columnar(str(p))
+    center_a, center_b = sample_centers
+
+    # Act
+    report = FT2Linker.link_batch(batch, sample_centers)
+
+    # Assert
+    assert report.linked_by_device == {"device_A1": 1, "device_A2": 1, "device_B1": 1}
+    assert report.skipped_by_device == {"device_C1": 1}
+    assert (report.linked, report.skipped) == (3, 1)
+    assert center_a.ft2_entries == [] and center_b.ft2_entries == []
+    assert len(center_a.reading_batches) == 1
+    assert center_a.reading_batches[0].device_counts() == {"device_A1": 1, "device_A2": 1}
+    assert center_b.reading_batches[0].device_counts() == {"device_B1": 1}
+    # Freeze reading in the batch triggers the zero-tolerance policy
+    assert center_a.decision == "REJECTED_FREEZE_SENSITIVE"
+    assert calculate_center_stats(center_a)["min_temp"] == -1.0
+
+def test_link_grouped_makes_one_bulk_call_per_center(sample_entries, sample_centers):
+    """
+    Tests that `link_grouped` hands each center its whole slice in a single
+    `add_ft2_entries` call and reports per-device counts.
+    """
+    # Arrange
+    calls = []
+
+    class RecordingCenter:
+        def __init__(self, center_id, device_ids):
+            self.id = center_id
+            self.device_ids = device_ids
+
+        def add_ft2_entries(self, entries):
+            calls.append((self.id, [e.device_id for e in entries]))
+
+    centers = [RecordingCenter("center1", ["device_A1", "device_A2"]), RecordingCenter("center2", ["device_B1"])]
+
+    # Act
+    report = FT2Linker.link_grouped(sample_entries, centers)
+
+    # Assert
+    assert sorted(calls) == [("center1", ["device_A1", "device_A2"]), ("center2", ["device_B1"])]
+    assert report.linked_by_device == {"device_A1": 1, "device_A2": 1, "device_B1": 1}
+    assert report.skipped_by_device == {"device_C1": 1}
+    assert (report.linked, report.skipped) == (3, 1)
+
+def test_device_index_is_reusable_across_link_calls(sample_entries, sample_centers):
+    """
+    Tests that a DeviceIndex built once can be passed to every linker entry
+    point instead of the raw centers list.
+    """
+    # Arrange
+    index = DeviceIndex(sample_centers)
+    center_a, center_b = sample_centers
+
+    # Act
+    FT2Linker.link(sample_entries[:2], index)
+    FT2Linker.link(sample_entries[2:], index)
+
+    # Assert
+    assert "device_A2" in index and "device_C1" not in index
+    assert index.center_for("device_B1") is center_b
+    assert index.index_of("device_C1") == -1
+    assert index.centers_for(["device_A2", "device_A1", "device_C1"]) == [center_a]
+    assert len(center_a.ft2_entries) == 2
+    assert len(center_b.ft2_entries) == 1
@@ -2,7 +2,9 @@ import pytest
 import os
 import csv
 from datetime import datetime
+import numpy as np
 from src.ft2_reader.parser.ft2_parser import FT2Parser, FT2Entry
+from src.ft2_reader.models.reading_batch import ReadingBatch
 
 class TestFT2Parser:
     
@@ -54,3 +56,72 @@ class TestFT2Parser:
         entries = FT2Parser.parse_file(str(p))
         assert len(entries) == 1
         assert entries[0].device_id == "FT2-002"
+
+    def test_parse_file_columnar_matches_row_parser(self, sample_csv):
+        entries = FT2Parser.parse_file(sample_csv)
+        batch = FT2Parser.parse_file_columnar(sample_csv)
+
+        assert len(batch) == len(entries)
+        assert batch.timestamps.dtype == np.int64
+        assert batch.temperatures.dtype == np.float32
+        assert batch.device_ids == ("FT2-001",)
+        assert list(batch.device_codes) == [0, 0]
+        assert batch.vaccine_types == ("Pfizer",)
+        assert batch.timestamps[1] - batch.timestamps[0] == 15 * 60
+
+        roundtrip = batch.to_entries()
+        assert [e.timestamp for e in roundtrip] == [e.timestamp for e in entries]
+        assert [e.temperature for e in roundtrip] == [e.temperature for e in entries]
+
+    def test_parse_file_columnar_skips_malformed_rows(self, tmp_path):
+        p = tmp_path / "bad_readings.csv"
+        p.write_text("device_id,temperature\nFT2-001,invalid_temp\nFT2-002,5.0\n", encoding="utf-8")
+
+        batch = FT2Parser.parse_file_columnar(str(p))
+        assert len(batch) == 1
+        assert batch.device_ids == ("FT2-002",)
+        assert batch.batches == ("UNKNOWN",)
+
+    def test_reading_batch_concat_remaps_categories(self, tmp_path):
+        a = tmp_path / "a.csv"
+        b = tmp_path / "b.csv"
+        a.write_text("device_id,timestamp,temperature\nD1,2023-10-01T10:00:00,5.0\n", encoding="utf-8")
+        b.write_text("device_id,timestamp,temperature\nD2,2023-10-01T10:00:00,6.0\nD1,2023-10-01T10:15:00,7.0\n",
+                     encoding="utf-8")
+
+        merged = ReadingBatch.concat([FT2Parser.parse_file_columnar(str(a)), FT2Parser.parse_file_columnar(str(b))])
+        assert merged.device_counts() == {"D1": 2, "D2": 1}
+        assert [merged.device_ids[c] for c in merged.device_codes] == ["D1", "D2", "D1"]
+
+    def test_parse_file_columnar_boundary_readings_match_row_parser(self, tmp_path):
+        from src.core.value_objects.center_stats import CenterStatsAccumulator
+
+        p = tmp_path / "boundaries.csv"
+        p.write_text("device_id,timestamp,temperature\n"
+                     "D1,2023-10-01T10:00:00,-0.5\n"
+                     "D1,2023-10-01T10:15:00,2.1\n"
+                     "D1,2023-10-01T10:30:00,8.0\n"
+                     "D1,2023-10-01T10:45:00,8.05\n", encoding="utf-8")
+
+        # Thresholds equal to readings, as float64 (e.g. from a config table); 2.1 and 8.05 are inexact in float32
+        for freeze, heat in [(-0.5, 8.0), (np.float64(2.1), np.float64(8.05))]:
+            by_entry = CenterStatsAccumulator(freeze, heat)
+            by_entry.add_entries(FT2Parser.parse_file(str(p)))
+            by_batch = CenterStatsAccumulator(freeze, heat)
+            by_batch.add_batch(FT2Parser.parse_file_columnar(str(p)))
+
+            assert (by_batch.freeze_duration, by_batch.heat_duration) == \
+                (by_entry.freeze_duration, by_entry.heat_duration)
+
+    def test_parse_file_columnar_short_rows_match_row_parser(self, tmp_path):
+        p = tmp_path / "short_rows.csv"
+        p.write_text("device_id,temperature,vaccine_type,batch\n"
+                     "D1,5.0\n"
+                     "\n"
+                     "D1,6.0,Pfizer\n", encoding="utf-8")
+
+        entries = FT2Parser.parse_file(str(p))
+        roundtrip = FT2Parser.parse_file_columnar(str(p)).to_entries()
+
+        assert [(e.vaccine_type, e.batch) for e in roundtrip] == [(e.vaccine_type, e.batch) for e in entries]
+        assert [(e.vaccine_type, e.batch) for e in entries] == [(None, None), ("Pfizer", None)]
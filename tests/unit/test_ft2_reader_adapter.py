@@ -0,0 +1,93 @@
+import os
+import pytest
+from src.infrastructure.adapters.ft2_reader_adapter import FT2ReaderAdapter
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    d = tmp_path / "input_ft2"
+    d.mkdir()
+    for n in range(6):
+        rows = "\n".join(f"DEV-{n},2023-10-01T10:{m:02d}:00,{n + m / 100:.2f}" for m in range(0, 60, 15))
+        (d / f"export_{n}.csv").write_text(f"device_id,timestamp,temperature\n{rows}\n", encoding="utf-8")
+    (d / "notes.txt").write_text("ignored", encoding="utf-8")
+    return d
+
+
+def _summary(entries):
+    return [(e.device_id, e.timestamp, e.temperature) for e in entries]
+
+
+def test_read_all_parallel_matches_sequential_order(input_dir):
+    sequential = FT2ReaderAdapter(str(input_dir)).read_all()
+    parallel = FT2ReaderAdapter(str(input_dir), workers=2, max_in_flight=2).read_all()
+
+    assert len(sequential) == 24
+    assert _summary(parallel) == _summary(sequential)
+    assert [e.device_id for e in sequential[::4]] == [f"DEV-{n}" for n in range(6)]
+
+
+def test_read_all_isolates_failing_files(input_dir):
+    # A directory with a .csv suffix cannot be opened as a file
+    (input_dir / "export_3.csv").unlink()
+    (input_dir / "export_3.csv").mkdir()
+
+    adapter = FT2ReaderAdapter(str(input_dir), workers=2)
+    entries = adapter.read_all()
+
+    assert len(entries) == 20
+    assert "DEV-3" not in {e.device_id for e in entries}
+
+
+def test_read_all_columnar_parallel(input_dir):
+    batch = FT2ReaderAdapter(str(input_dir), workers=3).read_all_columnar()
+
+    assert len(batch) == 24
+    assert batch.device_counts() == {f"DEV-{n}": 4 for n in range(6)}
+
+
+def test_read_all_missing_dir_returns_empty(tmp_path):
+    assert FT2ReaderAdapter(str(tmp_path / "missing"), workers=2).read_all() == []
+
+
+def test_corrupt_file_is_reported_as_failed(input_dir):
+    (input_dir / "export_2.csv").write_bytes(b"\xff\xfe\x00garbage")
+    (input_dir / "export_4.csv").write_text("", encoding="utf-8")
+
+    adapter = FT2ReaderAdapter(str(input_dir))
+    batch = adapter.read_all_columnar()
+
+    assert len(batch) == 16
+    assert [os.path.basename(path) for path, _ in adapter.failed_files] == ["export_2.csv", "export_4.csv"]
+
+
+def test_failed_files_are_reported_per_call(input_dir):
+    (input_dir / "export_2.csv").write_bytes(b"\xff\xfe\x00garbage")
+    adapter = FT2ReaderAdapter(str(input_dir))
+    adapter.read_all()
+
+    healthy = [str(input_dir / f"export_{n}.csv") for n in (0, 1)]
+    assert len(list(adapter.iter_parsed(healthy))) == 2
+    assert adapter.failed_files == []
+
+
+def test_broken_pool_marks_unsubmitted_files_as_failed(input_dir, monkeypatch):
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    import src.infrastructure.adapters.ft2_reader_adapter as adapter_module
+
+    class BreaksAfterTwoSubmits(ProcessPoolExecutor):
+        submitted = 0
+
+        def submit(self, *args, **kwargs):
+            BreaksAfterTwoSubmits.submitted += 1
+            if BreaksAfterTwoSubmits.submitted > 2:
+                raise BrokenProcessPool("worker died")
+            return super().submit(*args, **kwargs)
+
+    monkeypatch.setattr(adapter_module, "ProcessPoolExecutor", BreaksAfterTwoSubmits)
+    adapter = FT2ReaderAdapter(str(input_dir), workers=2, max_in_flight=2)
+    parsed = [os.path.basename(path) for path, _ in adapter.iter_parsed(FT2ReaderAdapter(str(input_dir)).list_files())]
+
+    assert parsed == ["export_0.csv", "export_1.csv"]
+    assert [os.path.basename(path) for path, _ in adapter.failed_files] == [f"export_{n}.csv" for n in range(2, 6)]
@@ -0,0 +1,72 @@
+import types
+import pytest
+from src.ingestion.ft2_parser import FT2Parser
+
+SAMPLE = """Device: Q-tag Fridge-tag 2 E
+Vers: 0.5
+Conf:
+ Serial: 130600112764
+ Alarm:
+  0:
+   T AL: -0.5, t AL: 60
+  1:
+   T AL: +8.0, t AL: 600
+Hist:
+ TS Actv: 2021-08-07 07:36
+ 1:
+  Date: 2022-01-24
+  Min T: +6.1, TS Min T: 16:19
+  Max T: +16.0, TS Max T: 19:34
+  Avrg T: +8.4
+  Alarm:
+   0:
+    t Acc: 0
+   1:
+    t Acc: 924, TS A: 11:35, C A: 0
+  Events: 16
+ 2:
+  Date: 2022-01-23
+  Min T: -1.2, TS Min T: 23:59
+  Max T: +9.3, TS Max T: 17:52
+  Avrg T: +4.2
+  Alarm:
+   0:
+    t Acc: 75
+   1:
+    t Acc: 0
+"""
+
+
+class TestFT2TextParser:
+
+    @pytest.fixture
+    def sample_file(self, tmp_path):
+        p = tmp_path / "130600112764.txt"
+        p.write_text(SAMPLE, encoding="utf-8")
+        return str(p)
+
+    def test_iter_history_is_generator(self, sample_file):
+        gen = FT2Parser().iter_history(sample_file)
+        assert isinstance(gen, types.GeneratorType)
+        first = next(gen)
+        assert first['date'] == "2022-01-24"
+
+    def test_parse_extracts_device_info_and_days(self, sample_file):
+        data = FT2Parser().parse(sample_file)
+        assert data['device_info'] == {'model': 'Q-tag Fridge-tag 2 E', 'serial_number': '130600112764'}
+        assert len(data['history']) == 2
+
+        day1, day2 = data['history']
+        assert day1['min_temp'] == 6.1
+        assert day1['max_temp'] == 16.0
+        assert day1['avg_temp'] == 8.4
+        assert day2['min_temp'] == -1.2
+
+    def test_alarm_indices_do_not_split_days(self, sample_file):
+        """Alarm sub-indices ("0:", "1:") belong to the current day record."""
+        day1, day2 = FT2Parser().parse(sample_file)['history']
+        assert day1['alarms'] == {'0': 0, '1': 924}
+        assert day2['alarms'] == {'0': 75, '1': 0}
+
+    def test_parse_missing_file_returns_empty(self, tmp_path):
+        assert FT2Parser().parse(str(tmp_path / "missing.txt")) == {}
@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime, timedelta
 from src.ft2_reader.validator.ft2_validator import FT2Validator
-from src.ft2_reader.parser.ft2_parser import FT2Entry
+from src.ft2_reader.parser.ft2_parser import FT2Entry, FT2Parser
 
 class TestFT2Validator:
     
@@ -37,3 +37,19 @@ class TestFT2Validator:
         ]
         result = FT2Validator.validate_temporal_consistency(entries)
         assert result["status"] == "INSUFFICIENT_DATA"
+
+    def test_validate_batch_matches_entries(self, tmp_path):
+        p = tmp_path / "gaps.csv"
+        p.write_text(
+            "device_id,timestamp,temperature\n"
+            "d1,2023-10-01T13:00:00,5.0\n"
+            "d1,2023-10-01T10:00:00,5.0\n"
+            "d1,2023-10-01T13:15:00,5.0\n",
+            encoding="utf-8",
+        )
+        batch = FT2Parser.parse_file_columnar(str(p))
+
+        result = FT2Validator.validate_batch_temporal_consistency(batch)
+        expected = FT2Validator.validate_temporal_consistency(FT2Parser.parse_file(str(p)))
+        assert result == expected
+        assert result["gaps"][0]["minutes"] == 180.0
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.core.engines.heat_exposure_engine import (
+    HeatExposureEngine,
+    compute_her_fleet,
+    get_heat_exposure_engine,
+)
+
+# (°C, max exposure minutes) - unsorted on purpose
+TABLE = [(37.0, 600), (9.0, 14400), (25.0, 2880), (45.0, 60)]
+
+
+def _linear_scan(table, temp):
+    """المسح الخطي الأصلي كمرجع"""
+    table = sorted(table)
+    if temp <= table[0][0]:
+        return float(table[0][1])
+    if temp >= table[-1][0]:
+        return float(table[-1][1])
+    for (t_low, d_low), (t_high, d_high) in zip(table, table[1:]):
+        if t_low <= temp <= t_high:
+            return d_low + (temp - t_low) / (t_high - t_low) * (d_high - d_low)
+
+
+@pytest.fixture
+def engine():
+    return HeatExposureEngine(TABLE)
+
+
+@pytest.mark.parametrize("temp", [-5.0, 9.0, 12.3, 25.0, 30.0, 37.0, 44.9, 45.0, 60.0])
+def test_bisect_matches_linear_scan(engine, temp):
+    assert engine._linear_interpolate_duration(temp) == pytest.approx(_linear_scan(TABLE, temp))
+
+
+def test_batch_matches_scalar_her(engine):
+    rng = np.random.default_rng(0)
+    temps = rng.uniform(0.0, 50.0, 500).round(1)
+    minutes = rng.uniform(0.0, 3000.0, 500)
+
+    batch = engine.compute_her_batch(temps, minutes)
+    scalar = [engine.compute_her(t, m) for t, m in zip(temps.tolist(), minutes.tolist())]
+    np.testing.assert_allclose(batch, scalar, rtol=1e-12)
+    assert batch.max() <= 1.0
+
+
+def test_scalar_and_batch_paths_share_one_contract(engine):
+    temps = [-np.inf, -5.0, 9.0, 9.0 + 1e-12, 12.3, 25.0, 36.99, 37.0, 45.0, 60.0, np.inf, np.nan]
+    scalar = [engine._linear_interpolate_duration(t) for t in temps]
+
+    np.testing.assert_allclose(engine.interpolate_durations(temps), scalar, rtol=1e-12)
+    # NaN falls through every interval to the last duration, as the original linear scan did
+    assert scalar[-1] == 60.0
+
+
+@pytest.mark.parametrize("table", [[(30, 100), (40, 50), (40, 40), (50, 10)], [(float("nan"), 10), (5.0, 20)]])
+def test_ambiguous_reference_tables_are_rejected(table):
+    with pytest.raises(ValueError):
+        HeatExposureEngine(table)
+
+
+def test_empty_table_gives_zero_her():
+    engine = HeatExposureEngine([])
+    assert engine.compute_her(30.0, 100) == 0
+    np.testing.assert_array_equal(engine.compute_her_batch([30.0, 5.0], [100, 5]), [0.0, 0.0])
+
+
+def test_engines_are_cached_per_table():
+    vaccine = SimpleNamespace(reference_table=list(TABLE))
+    assert HeatExposureEngine.for_vaccine(vaccine) is get_heat_exposure_engine(TABLE)
+    assert get_heat_exposure_engine([(9.0, 100)]) is not get_heat_exposure_engine(TABLE)
+
+
+def test_fleet_her_in_one_call():
+    tables = {"VaxA": TABLE, "VaxB": [(8.0, 1000), (30.0, 100)]}
+    keys = ["VaxA", "VaxB", "VaxA", "VaxB"]
+    temps = [25.0, 19.0, 40.0, 50.0]
+    minutes = [1440, 100, 10, 200]
+
+    her = compute_her_fleet(tables, keys, temps, minutes)
+    expected = [get_heat_exposure_engine(tables[k]).compute_her(t, m) for k, t, m in zip(keys, temps, minutes)]
+    np.testing.assert_allclose(her, expected)
+
+    with pytest.raises(KeyError):
+        compute_her_fleet(tables, ["VaxC"], [5.0], [1])
+    with pytest.raises(ValueError):
+        compute_her_fleet(tables, keys, temps[:2], minutes)
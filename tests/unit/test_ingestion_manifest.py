@@ -0,0 +1,79 @@
+import os
+import pytest
+from src.ft2_reader.parser.ft2_parser import FT2Parser
+from src.infrastructure.persistence.ingestion_manifest import IngestionManifest
+
+
+@pytest.fixture
+def export_file(tmp_path):
+    p = tmp_path / "dev1.csv"
+    p.write_text("device_id,timestamp,temperature\nD1,2023-10-01T10:00:00,5.0\n", encoding="utf-8")
+    return str(p)
+
+
+def test_unchanged_file_is_served_from_cache(tmp_path, export_file):
+    cache_dir = str(tmp_path / "cache")
+    manifest = IngestionManifest(cache_dir)
+    assert manifest.lookup(export_file) is None
+
+    manifest.store(export_file, FT2Parser.parse_file_columnar(export_file), ["C1"])
+    manifest.save()
+
+    reloaded = IngestionManifest(cache_dir)
+    batch = reloaded.lookup(export_file)
+    assert batch is not None
+    assert batch.device_ids == ("D1",)
+    assert float(batch.temperatures[0]) == 5.0
+    assert (reloaded.hits, reloaded.misses) == (1, 0)
+
+
+def test_touched_file_with_same_content_is_a_hit(tmp_path, export_file):
+    manifest = IngestionManifest(str(tmp_path / "cache"))
+    manifest.store(export_file, FT2Parser.parse_file_columnar(export_file), [])
+
+    identity = manifest.file_identity(export_file)
+
+    st = os.stat(export_file)
+    os.utime(export_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert manifest.lookup(export_file) is not None
+    # Same content, same identity: decisions fingerprinted from it stay valid
+    assert manifest.file_identity(export_file) == identity
+
+
+def test_modified_file_is_a_miss(tmp_path, export_file):
+    manifest = IngestionManifest(str(tmp_path / "cache"))
+    manifest.store(export_file, FT2Parser.parse_file_columnar(export_file), [])
+
+    with open(export_file, "a", encoding="utf-8") as f:
+        f.write("D1,2023-10-01T10:15:00,6.0\n")
+    assert manifest.lookup(export_file) is None
+
+
+def test_cached_device_ids_only_for_unchanged_files(tmp_path, export_file):
+    manifest = IngestionManifest(str(tmp_path / "cache"))
+    assert manifest.cached_device_ids(export_file) is None
+
+    manifest.store(export_file, FT2Parser.parse_file_columnar(export_file), [])
+    assert manifest.cached_device_ids(export_file) == ["D1"]
+
+    with open(export_file, "a", encoding="utf-8") as f:
+        f.write("D2,2023-10-01T10:15:00,6.0\n")
+    assert manifest.cached_device_ids(export_file) is None
+
+
+def test_center_outcomes_reset_when_config_changes(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    manifest = IngestionManifest(cache_dir, config_fingerprint="a")
+    manifest.set_center_outcome("C1", {"decision": "ACCEPTED"})
+    manifest.save()
+
+    assert IngestionManifest(cache_dir, config_fingerprint="a").get_center_outcome("C1") == {"decision": "ACCEPTED"}
+    assert IngestionManifest(cache_dir, config_fingerprint="b").get_center_outcome("C1") is None
+
+
+def test_prune_returns_devices_of_removed_files(tmp_path, export_file):
+    manifest = IngestionManifest(str(tmp_path / "cache"))
+    manifest.store(export_file, FT2Parser.parse_file_columnar(export_file), [])
+
+    assert manifest.prune([]) == {"D1"}
+    assert manifest.files == {}
@@ -0,0 +1,53 @@
+import logging
+
+from src.ft2_reader.parser.ft2_parser import FT2Parser
+from src.infrastructure import logging as pipeline_logging
+from src.infrastructure.logging import RowWarnings, get_logger
+
+
+class _Tracked:
+    """يسجل أي القيم نُسقت كنص"""
+    formatted = set()
+
+    def __init__(self, i):
+        self.i = i
+
+    def __str__(self):
+        _Tracked.formatted.add(self.i)
+        return "value"
+
+
+def test_loggers_share_one_queue_handler_and_one_file():
+    first, second = get_logger("test.logging.a"), get_logger("test.logging.b")
+    assert first.handlers == second.handlers == [pipeline_logging._queue_handler]
+    assert isinstance(first.handlers[0], logging.handlers.QueueHandler)
+    assert sum(isinstance(h, logging.FileHandler) for h in pipeline_logging._handlers) == 1
+
+
+def test_row_warnings_log_the_first_rows_and_summarise_the_rest(caplog):
+    caplog.set_level(logging.WARNING)
+    logger = get_logger("test.logging.rows")
+    _Tracked.formatted = set()
+
+    with RowWarnings(logger, "f.csv", limit=3) as warnings:
+        for i in range(10):
+            warnings.warn("تخطي صف %d في %s: %s", i, "f.csv", _Tracked(i))
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages[:3] == [f"تخطي صف {i} في f.csv: value" for i in range(3)]
+    assert messages[3] == "تم تخطي 7 صف إضافي في f.csv (إجمالي التحذيرات: 10)"
+    assert len(messages) == 4
+    # الرسائل المكتومة لا تُنسق
+    assert _Tracked.formatted == {0, 1, 2}
+
+
+def test_parser_rate_limits_bad_row_warnings(tmp_path, caplog):
+    caplog.set_level(logging.WARNING)
+    path = tmp_path / "bad.csv"
+    rows = "\n".join(f"D1,2024-01-01T00:{i:02d}:00,{'x' if i % 2 else 5.0}" for i in range(40))
+    path.write_text(f"device_id,timestamp,temperature\n{rows}\n", encoding="utf-8")
+
+    assert len(FT2Parser.parse_file_columnar(str(path))) == 20
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert len(warnings) == 6
+    assert warnings[-1].startswith("تم تخطي 15 صف إضافي")
@@ -0,0 +1,84 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from src.infrastructure import profiling
+from src.infrastructure.profiling import PipelineProfiler
+
+
+def test_stage_records_time_and_nested_peak():
+    profiler = PipelineProfiler().start()
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            block = bytearray(4 * 2 ** 20)
+            del block
+        small = bytearray(1024)
+    profiler.stop()
+
+    stages = profiler.to_dict()['stages']
+    assert list(stages) == ["inner", "outer"]
+    assert stages["inner"]['peak_bytes'] >= 4 * 2 ** 20
+    # بلوك المرحلة الداخلية يُحتسب في ذروة المرحلة الخارجية رغم إعادة ضبط الذروة
+    assert stages["outer"]['peak_bytes'] >= stages["inner"]['peak_bytes']
+    assert stages["outer"]['wall_seconds'] >= stages["inner"]['wall_seconds']
+    assert len(small) == 1024
+
+
+def test_busy_accumulates_across_threads():
+    profiler = PipelineProfiler().start()
+
+    def work():
+        for _ in range(10):
+            with profiler.busy("worker"):
+                sum(range(1000))
+
+    threads = [threading.Thread(target=work) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    profiler.stop()
+
+    entry = profiler.to_dict()['stages']["worker"]
+    assert entry['calls'] == 30
+    assert entry['peak_bytes'] is None
+    assert profiler.summary_lines()[1].split()[:2] == ["worker", "30"]
+
+
+def test_write_dumps_cprofile_allocations_and_stages(tmp_path):
+    profiler = profiling.enable_profiling(cprofile=True, top_allocations=5)
+    with profiling.stage("work"):
+        data = [str(i) for i in range(10_000)]
+    assert profiling.disable_profiling() is profiler
+    assert profiling.active_profiler() is None
+
+    paths = profiler.write(str(tmp_path), label="test")
+    assert set(paths) == {'stages', 'cprofile', 'allocations'}
+    assert json.loads(open(paths['stages'], encoding='utf-8').read())['stages']['work']['calls'] == 1
+    assert len(open(paths['allocations'], encoding='utf-8').read().splitlines()) == 5
+    assert len(data) == 10_000
+
+
+def test_stage_is_a_no_op_without_an_active_profiler():
+    assert profiling.active_profiler() is None
+    with profiling.stage("ignored"):
+        pass
+    assert profiling.disable_profiling() is None
+
+
+def test_log_report_logs_the_table_and_written_paths(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    profiler = PipelineProfiler().start()
+    with profiler.stage("work"):
+        pass
+    profiler.stop()
+
+    profiler.log_report(logging.getLogger("test_profiling"))
+    assert "Stage profile" in caplog.text and "work" in caplog.text
+    assert not list(tmp_path.iterdir())
+
+    profiler.log_report(logging.getLogger("test_profiling"), str(tmp_path), label="report")
+    written = [p.name for p in tmp_path.iterdir()]
+    assert len(written) == 1 and written[0].startswith("report_") and written[0] in caplog.text
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+import pytest
+from src.core.entities.temperature_reading import TemperatureReading
+from src.core.entities.vaccine import Vaccine
+from src.core.services.rules_engine import calculate_center_stats, has_readings
+from src.core.value_objects.reading_series import ReadingSeries
+from src.application.use_cases.evaluate_cold_chain_safety_uc import EvaluationTarget
+
+
+@pytest.fixture
+def readings():
+    t0 = datetime(2024, 1, 15, 8, 0)
+    return [
+        TemperatureReading("v1", 5.0, t0),
+        TemperatureReading("v1", -1.5, t0 + timedelta(minutes=30)),
+        TemperatureReading("v1", 9.25, t0 + timedelta(minutes=45)),
+        TemperatureReading("v1", 6.0, t0 + timedelta(minutes=105)),
+    ]
+
+
+def test_durations_come_from_time_to_next_reading(readings):
+    series = ReadingSeries.from_readings(readings)
+    assert len(series) == 4
+    assert series.temperatures.tolist() == [5.0, -1.5, 9.25, 6.0]
+    assert series.durations.tolist() == [30.0, 15.0, 60.0, 0.0]
+
+
+def test_empty_series():
+    assert len(ReadingSeries.from_readings([])) == 0
+
+
+def test_rules_engine_reads_evaluation_target_arrays(readings):
+    vaccine = Vaccine(id="v1", name="Polio", full_loss_threshold_low=0.0, full_loss_threshold_high=40.0,
+                      shelf_life_days=30, reference_table=[])
+    target = EvaluationTarget("v1", ReadingSeries.from_readings(readings), vaccine)
+
+    stats = calculate_center_stats(target)
+    assert has_readings(target)
+    assert stats['freeze_duration'] == 15.0
+    assert stats['heat_duration'] == 60.0
+    assert (stats['min_temp'], stats['max_temp']) == (-1.5, 9.25)
+    assert stats['avg_temp'] == pytest.approx((5.0 - 1.5 + 9.25 + 6.0) / 4)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.core.calculators.ccm_calculator import CCMCalculator
+from src.core.calculators.vvm_q10_model import VVMQ10Model
+from src.core.engines.rolling_exposure_engine import RollingExposureEngine
+from src.ft2_reader.models.reading_batch import ReadingBatch
+
+SHELF_LIFE_HOURS = 30 * 24.0
+
+
+def _batch(seed=0, n=400):
+    """جهازان بقراءات متداخلة وغير مرتبة، بفواصل 5-60 دقيقة"""
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, 2, n).astype(np.int32)
+    timestamps = 1_700_000_000 + np.cumsum(rng.choice([300, 900, 3600], n)).astype(np.int64)
+    shuffle = rng.permutation(n)
+    return ReadingBatch(
+        timestamps=timestamps[shuffle],
+        temperatures=rng.uniform(0.0, 16.0, n).round(1).astype(np.float32)[shuffle],
+        durations=np.full(n, 15.0, dtype=np.float32),
+        device_codes=codes[shuffle],
+        vaccine_codes=np.zeros(n, dtype=np.int32),
+        batch_codes=np.zeros(n, dtype=np.int32),
+        device_ids=("D1", "D2"), vaccine_types=("VaxA",), batches=("B1",),
+    )
+
+
+@pytest.fixture
+def engine():
+    return RollingExposureEngine(VVMQ10Model(q10_value=2.0, ideal_temp=5.0), SHELF_LIFE_HOURS,
+                                 windows={'6h': 6 * 3600, '24h': 24 * 3600, 'all': 10 ** 9})
+
+
+def test_windows_match_brute_force(engine):
+    batch = _batch()
+    series = engine.compute(batch)
+    assert set(series) == {"D1", "D2"}
+
+    for device_id, s in series.items():
+        rows = batch.device_codes == batch.device_ids.index(device_id)
+        order = np.argsort(batch.timestamps[rows], kind="stable")
+        ts = batch.timestamps[rows][order]
+        temps = batch.temperatures[rows][order].astype(np.float64)
+        np.testing.assert_array_equal(s.timestamps, ts)
+
+        degradation, deltas, areas = engine.contributions(ts, temps)
+        for name, seconds in engine.windows.items():
+            for i in range(0, len(ts), 17):
+                inside = (ts > ts[i] - seconds) & (np.arange(len(ts)) <= i)
+                assert s.her[name][i] == pytest.approx(degradation[inside].sum() / SHELF_LIFE_HOURS, abs=1e-12)
+                assert s.ccm_delta[name][i] == pytest.approx(deltas[inside].sum(), abs=1e-9)
+                assert s.ccm_auc[name][i] == pytest.approx(areas[inside].sum(), abs=1e-9)
+
+
+def test_unbounded_window_matches_all_time_calculators(engine):
+    batch = _batch(seed=1)
+    s = engine.compute(batch)["D1"]
+    rows = batch.device_codes == 0
+    order = np.argsort(batch.timestamps[rows], kind="stable")
+    temps = batch.temperatures[rows][order].astype(np.float64)
+
+    ccm = CCMCalculator().calculate_arrays(batch.timestamps[rows][order], temps)
+    assert s.ccm_delta['all'][-1] == pytest.approx(ccm["ccm_delta"])
+    assert s.ccm_auc['all'][-1] == pytest.approx(ccm["ccm_auc"])
+
+    # HER and CCM share one time base: segment durations from the timestamp gaps, last reading excluded
+    step_hours = np.diff(batch.timestamps[rows][order]) / 3600.0
+    hours = engine.q10_model.calculate_cumulative_degradation_hours_array(temps[:-1], step_hours)
+    assert s.her['all'][-1] == pytest.approx(hours / SHELF_LIFE_HOURS)
+
+
+def test_empty_batch_and_per_device_shelf_life():
+    model = VVMQ10Model(q10_value=2.0, ideal_temp=5.0)
+    assert RollingExposureEngine(model, 100.0).compute(ReadingBatch.empty()) == {}
+
+    engine = RollingExposureEngine(model, {"D1": 1.0, "D2": 0.0})
+    series = engine.compute(_batch(n=20))
+    assert (series["D2"].her['24h'] == 1.0).all()  # مدة صلاحية غير موجبة
+    assert list(series["D1"].her) == ['24h', '7d', '30d']
@@ -0,0 +1,154 @@
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.core.services.rules_engine import (
+    RulesEngine,
+    apply_rules,
+    StatsTable,
+    apply_rules_batch,
+    build_stats_table,
+    calculate_center_stats,
+    disable_rule_metrics,
+    enable_rule_metrics,
+    has_readings,
+)
+
+
+@dataclass
+class MockEntry:
+    temperature: float
+    duration_minutes: int
+
+
+def _population(seed: int, n: int):
+    """Centers covering every rule branch: expiry, VVM stages, thaw, freeze, heat, CCM, warnings, no data."""
+    rng = random.Random(seed)
+    centers, extras = [], []
+    for k in range(n):
+        entries = [MockEntry(round(rng.uniform(-3.0, 14.0), 1), rng.choice([15, 30, 60]))
+                   for _ in range(rng.randint(0, 6))]
+        center = SimpleNamespace(
+            id=f"C{k}",
+            temperature_ranges={'min': 2.0, 'max': 8.0},
+            decision_thresholds={'ccm_limit': rng.choice([30, 600])},
+            ft2_entries=entries,
+            decision="UNKNOWN",
+        )
+        if rng.random() < 0.15:
+            center.expiry_date = rng.choice(["2001-01-01", "2999-01-01", "not-a-date"])
+        if rng.random() < 0.3:
+            center.is_freeze_stable = rng.random() < 0.5
+        if rng.random() < 0.2:
+            center.actions = {'on_freeze': "اختبار الرج", 'on_heat': "افحص VVM"}
+        if rng.random() < 0.1:
+            center.ultra_cold_chain_required = True
+            center.thaw_start_time = datetime.now() - timedelta(days=rng.choice([5, 100]))
+            center.thaw_duration_days = 70
+        if rng.random() < 0.3:
+            center.critical_temp_limit = rng.choice([9.0, 12.0])
+        centers.append(center)
+        extras.append({'her': rng.choice([0.0, 0.05, 0.2, 0.5, 0.8, 1.2])} if rng.random() < 0.6 else None)
+    return centers, extras
+
+
+def _outcome(center):
+    return (center.decision, list(center.decision_reasons), getattr(center, 'vvm_stage', None),
+            getattr(center, 'has_warning', False))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_batch_matches_per_center_path(seed):
+    single, extras = _population(seed, 300)
+    batch, _ = _population(seed, 300)
+
+    for center, extra in zip(single, extras):
+        apply_rules(center, extra_stats=extra)
+    decisions = apply_rules_batch(batch, extras)
+
+    assert decisions == [c.decision for c in single]
+    assert {"NO_DATA", "ACCEPTED", "REJECTED_FREEZE", "REJECTED_HEAT_C", "REJECTED_EXPIRED"} <= set(decisions)
+    assert [_outcome(c) for c in batch] == [_outcome(c) for c in single]
+
+
+def test_evaluate_batch_accepts_columnar_arrays():
+    centers = [SimpleNamespace(decision_reasons=[]) for _ in range(3)]
+    table = {
+        'her': np.array([0.0, 1.5, 0.0]),
+        'has_freeze': np.array([False, False, True]),
+        'freeze_duration': np.array([0.0, 0.0, 15.0]),
+        'has_ccm_violation': np.array([False, False, False]),
+        'heat_duration': np.zeros(3),
+        'min_temp': np.array([4.0, 4.0, -1.0]),
+        'max_temp': np.array([6.0, 6.0, 6.0]),
+    }
+
+    decisions = RulesEngine().evaluate_batch(centers, table)
+
+    assert decisions == ["ACCEPTED", "REJECTED_HEAT_C", "REJECTED_FREEZE"]
+    assert centers[2].decision_reasons[-1].startswith("انتهاك تجميد: 15.0 دقيقة")
+
+
+def test_extra_stats_missing_for_some_centers_stay_missing():
+    centers, _ = _population(3, 2)
+    table = StatsTable(centers, build_stats_table(centers, [{'her': 0.5}, None]))
+
+    assert table.row(0)['her'] == 0.5
+    assert 'her' not in table.row(1)
+    assert table.column('her', 0.0).tolist() == [0.5, 0.0]
+
+
+def test_rule_metrics_agree_between_run_and_batch_paths():
+    centers, _ = _population(3, 200)
+    centers = [c for c in centers if has_readings(c)]
+    for c in centers:
+        c.decision_reasons = []
+
+    engine = RulesEngine()
+    assert engine.metrics is None
+    per_center = engine.enable_metrics()
+    for c in centers:
+        engine.run(c, calculate_center_stats(c))
+    engine.disable_metrics()
+
+    for c in centers:
+        c.decision_reasons = []
+    batch = engine.enable_metrics()
+    engine.evaluate_batch(centers, build_stats_table(centers))
+    assert engine.disable_metrics() is batch and engine.metrics is None
+
+    for metrics in (per_center, batch):
+        summary = metrics.to_dict()
+        assert summary['centers'] == len(centers)
+        assert list(summary['rules']) == [type(r).__name__ for r in engine.rules]
+        assert sum(r['decisions'] for r in summary['rules'].values()) == len(centers)
+        # كل قاعدة تُقيَّم للمراكز التي لم تحسمها القواعد السابقة فقط
+        remaining = len(centers)
+        for entry in summary['rules'].values():
+            assert entry['evaluations'] == remaining
+            remaining -= entry['decisions']
+    assert ({k: v['decisions'] for k, v in per_center.to_dict()['rules'].items()}
+            == {k: v['decisions'] for k, v in batch.to_dict()['rules'].items()})
+
+
+def test_module_level_rule_metrics_wrap_apply_rules(tmp_path):
+    centers, extras = _population(4, 30)
+    metrics = enable_rule_metrics()
+    try:
+        for c, extra in zip(centers, extras):
+            apply_rules(c, extra_stats=extra)
+    finally:
+        assert disable_rule_metrics() is metrics
+
+    with_data = sum(1 for c in centers if has_readings(c))
+    assert metrics.centers == with_data
+    assert len(metrics.summary_lines()) == len(metrics.rules) + 1
+
+    path = tmp_path / "rule_metrics.json"
+    metrics.write_json(str(path))
+    assert json.loads(path.read_text(encoding="utf-8"))['centers'] == with_data
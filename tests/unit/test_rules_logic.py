@@ -15,7 +15,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 # استيراد المحرك الحقيقي للقواعد
-from src.core.services.rules_engine import apply_rules, calculate_center_stats
+from src.core.services.rules_engine import apply_rules, calculate_center_stats, decision_fingerprint
 from src.core.enums.vvm_stage import VVMStage
 
 @dataclass
@@ -229,5 +229,36 @@ class TestRulesLogic(unittest.TestCase):
         self.assertEqual(self.center.decision, "REJECTED_HEAT_C")
         self.assertTrue(any("حرارة حرجة" in r for r in self.center.decision_reasons))
 
+    def test_decision_fingerprint_tracks_inputs(self):
+        """البصمة تتغير مع القراءات أو الإعدادات فقط"""
+        self.center.ft2_entries = [MockEntry(temperature=5.0, duration_minutes=10)]
+        base = decision_fingerprint(self.center)
+        self.assertEqual(decision_fingerprint(self.center), base)
+
+        # القرار نفسه لا يدخل في البصمة
+        apply_rules(self.center)
+        self.assertEqual(decision_fingerprint(self.center), base)
+
+        self.center.ft2_entries.append(MockEntry(temperature=9.0, duration_minutes=10))
+        with_reading = decision_fingerprint(self.center)
+        self.assertNotEqual(with_reading, base)
+
+        self.center.decision_thresholds = dict(self.center.decision_thresholds, ccm_limit=120)
+        self.assertNotEqual(decision_fingerprint(self.center), with_reading)
+
+    def test_decision_fingerprint_from_sources_skips_readings(self):
+        """مع بصمات الملفات لا تُقرأ القراءات؛ البصمة تتبع الملفات والأجهزة والإعدادات"""
+        self.center.device_ids = ["D1"]
+        self.center.ft2_entries = [MockEntry(temperature=5.0, duration_minutes=10)]
+        base = decision_fingerprint(self.center, ["a:10", "b:20"])
+        self.assertEqual(decision_fingerprint(self.center, ["b:20", "a:10"]), base)
+
+        self.center.ft2_entries = None  # لا تُمسح
+        self.assertEqual(decision_fingerprint(self.center, ["a:10", "b:20"]), base)
+        self.assertNotEqual(decision_fingerprint(self.center, ["a:10", "b:21"]), base)
+
+        self.center.device_ids = ["D1", "D2"]
+        self.assertNotEqual(decision_fingerprint(self.center, ["a:10", "b:20"]), base)
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
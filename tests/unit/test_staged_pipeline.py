@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from src.infrastructure.staged_pipeline import Stage, StagedPipeline
+
+
+class Double(Stage):
+    name = "double"
+
+    def process(self, item):
+        return (item * 2,)
+
+
+class CollectThenRelease(Stage):
+    """لا يمرر شيئاً قبل آخر عنصر (مثل مرحلة الربط)"""
+    name = "collect"
+
+    def __init__(self):
+        self.items = []
+
+    def process(self, item):
+        self.items.append(item)
+        return ()
+
+    def finish(self):
+        return self.items
+
+
+def test_items_flow_in_order_through_every_stage():
+    out = []
+    StagedPipeline(range(50), [Double(), CollectThenRelease(), Double()], out.append, maxsize=2).run()
+    assert out == [4 * i for i in range(50)]
+
+
+def test_slow_sink_bounds_every_queue():
+    out = []
+
+    def slow_sink(item):
+        time.sleep(0.001)
+        out.append(item)
+
+    pipeline = StagedPipeline(range(100), [Double(), Double()], slow_sink, maxsize=3)
+    pipeline.run()
+    assert len(out) == 100
+    assert max(pipeline.high_water) <= 3
+
+
+def test_first_error_stops_the_pipeline_and_is_raised():
+    produced = []
+    threads_before = threading.active_count()
+
+    def source():
+        for i in range(10_000):
+            produced.append(i)
+            yield i
+
+    class Boom(Stage):
+        def process(self, item):
+            if item == 5:
+                raise RuntimeError("boom")
+            return (item,)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        StagedPipeline(source(), [Boom()], lambda item: None, maxsize=2).run()
+    assert len(produced) < 10_000
+    assert threading.active_count() == threads_before
+
+
+def test_queue_size_must_be_positive():
+    with pytest.raises(ValueError):
+        StagedPipeline([], [], print, maxsize=0)
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from src.core.calculators.time_at_temperature import TimeAtTemperatureHistogram
+from src.core.calculators.vvm_q10_model import VVMQ10Model
+from src.application.use_cases.what_if_her_uc import WhatIfHeatExposureUC, shelf_life_hours_by_vaccine
+from src.application.use_cases.evaluate_cold_chain_safety_uc import EvaluateColdChainSafetyUC
+from src.core.entities.temperature_reading import TemperatureReading
+from src.core.entities.vaccine import Vaccine
+from src.ft2_reader.parser.ft2_parser import FT2Parser
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(1)
+    temps = np.round(rng.uniform(-5.0, 20.0, 2000), 1)
+    minutes = np.full(temps.shape, 15.0)
+    return temps, minutes
+
+
+@pytest.mark.parametrize("q10_value, ideal_temp", [(2.0, 5.0), (2.5, 5.0), (2.0, 4.0), (3.0, 2.5)])
+def test_histogram_degradation_matches_reading_level_model(series, q10_value, ideal_temp):
+    temps, minutes = series
+    histogram = TimeAtTemperatureHistogram.from_arrays(temps, minutes)
+    model = VVMQ10Model(q10_value=q10_value, ideal_temp=ideal_temp)
+
+    expected = model.calculate_cumulative_degradation_hours_array(temps, minutes / 60.0)
+    assert histogram.degradation_hours(q10_value, ideal_temp) == pytest.approx(expected, rel=1e-9)
+
+
+def test_histograms_merge(series):
+    temps, minutes = series
+    whole = TimeAtTemperatureHistogram.from_arrays(temps, minutes)
+    merged = TimeAtTemperatureHistogram.from_arrays(temps[:700], minutes[:700]) + \
+        TimeAtTemperatureHistogram.from_arrays(temps[700:], minutes[700:])
+
+    np.testing.assert_allclose(merged.minutes, whole.minutes)
+    assert merged.total_minutes == pytest.approx(2000 * 15.0)
+
+
+def test_out_of_grid_readings_are_kept_exactly():
+    histogram = TimeAtTemperatureHistogram.from_arrays([75.0, 75.0, 5.0], [30.0, 30.0, 60.0])
+    assert histogram.outliers == {75.0: 60.0}
+    # 1 h at 75 °C (Q10=2 -> 2**7) + 1 h at ideal
+    assert histogram.degradation_hours(2.0, 5.0) == pytest.approx(2.0 ** 7 + 1.0)
+    assert histogram.her(2.0, 5.0, shelf_life_hours=0) == 1.0
+
+
+def test_what_if_builds_one_histogram_per_device_and_vaccine(tmp_path):
+    p = tmp_path / "fleet.csv"
+    p.write_text(
+        "device_id,timestamp,temperature,vaccine_type\n"
+        "D1,2023-10-01T10:00:00,15.0,BCG\n"
+        "D1,2023-10-01T10:45:00,5.0,BCG\n"
+        "D1,2023-10-01T10:30:00,5.0,BCG\n"
+        "D1,2023-10-01T10:30:00,25.0,OPV\n"
+        "D2,2023-10-01T10:00:00,-2.0,BCG\n",
+        encoding="utf-8",
+    )
+    what_if = WhatIfHeatExposureUC.from_batch(FT2Parser.parse_file_columnar(str(p)), shelf_life_hours=1.0,
+                                              vaccine_shelf_life_hours={"OPV": 2.0})
+
+    assert what_if.keys == ["D1/BCG", "D1/OPV", "D2/BCG"]
+    # Sorted segments up to the next reading, last reading excluded: 30 min at 15 °C + 15 min at 5 °C
+    assert what_if.evaluate(2.0, 5.0) == pytest.approx({"D1/BCG": 1.25, "D1/OPV": 0.0, "D2/BCG": 0.0})
+    assert what_if.shelf_life_hours.tolist() == [1.0, 2.0, 1.0]
+
+    rows = what_if.sweep([2.0, 1.0], [5.0])
+    assert [(r['q10_value'], r['over_budget']) for r in rows] == [(2.0, 1), (1.0, 0)]
+
+
+def test_what_if_at_profile_parameters_reproduces_evaluated_her(tmp_path):
+    t0 = datetime(2023, 10, 1, 8, 0)
+    # Irregular cadence, heat excursions and an out-of-grid reading
+    offsets = [0, 15, 20, 65, 125, 130, 400, 415]
+    temps = [5.0, 12.4, 18.0, 75.0, 3.5, 9.1, 6.0, 30.0]
+    p = tmp_path / "d1.csv"
+    p.write_text("device_id,timestamp,temperature,vaccine_type\n" + "".join(
+        f"D1,{(t0 + timedelta(minutes=m)).isoformat()},{t},v1\n" for m, t in zip(offsets, temps)), encoding="utf-8")
+
+    vaccine = Vaccine(id="v1", name="Polio", full_loss_threshold_low=0.0, full_loss_threshold_high=40.0,
+                      shelf_life_days=2, reference_table=[], q10_value=2.5, ideal_temp=4.0)
+    reader = MagicMock()
+    reader.get_vaccines.return_value = [vaccine]
+    reader.read_all.return_value = [TemperatureReading("v1", t, t0 + timedelta(minutes=m))
+                                    for m, t in zip(offsets, temps)]
+    evaluated = EvaluateColdChainSafetyUC(reader).execute()[0].her
+
+    what_if = WhatIfHeatExposureUC.from_batch(FT2Parser.parse_file_columnar(str(p)),
+                                              vaccine_shelf_life_hours=shelf_life_hours_by_vaccine([vaccine]))
+    assert what_if.evaluate(vaccine.q10_value, vaccine.ideal_temp)["D1/v1"] == pytest.approx(evaluated, rel=1e-9)
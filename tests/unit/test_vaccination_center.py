@@ -90,3 +90,83 @@ def test_add_boundary_temp_entry_does_not_reject(zero_tolerance_center):
 
     # Assert
     assert zero_tolerance_center.decision != "REJECTED_FREEZE_SENSITIVE"
+
+def test_add_ft2_entries_bulk_updates_counters_once(zero_tolerance_center):
+    """
+    Tests that the bulk API folds all entries into the freeze counters and
+    applies the zero-tolerance policy.
+    """
+    # Arrange
+    entries = [FT2Entry("device_zt1", datetime.now(), t, "Vax", "B1") for t in (4.0, -1.0, 5.0, -2.0)]
+
+    # Act
+    zero_tolerance_center.add_ft2_entries(entries)
+
+    # Assert
+    assert len(zero_tolerance_center.ft2_entries) == 4
+    assert zero_tolerance_center.freeze_event_total == 2
+    assert zero_tolerance_center.freeze_event_counter == {"device_zt1": 2}
+    assert zero_tolerance_center.decision == "REJECTED_FREEZE_SENSITIVE"
+
+def test_freeze_counters_are_incremental(zero_tolerance_center):
+    """
+    Tests that each add only folds the new entries, and that counters are
+    rebuilt if the entries list is replaced.
+    """
+    # Arrange / Act
+    for i in range(100):
+        zero_tolerance_center.add_ft2_entry(FT2Entry("device_zt1", datetime.now(), -1.0 if i % 10 == 0 else 5.0, "Vax", "B1"))
+
+    # Assert
+    assert zero_tolerance_center._counted_entries == 100
+    assert zero_tolerance_center._count_freeze_events()["total"] == 10
+
+    zero_tolerance_center.ft2_entries = [FT2Entry("device_zt1", datetime.now(), 5.0, "Vax", "B1")]
+    assert zero_tolerance_center._count_freeze_events()["total"] == 0
+
+def test_batch_linked_readings_update_freeze_counters(zero_tolerance_center, tmp_path):
+    """
+    Tests that readings linked as a ReadingBatch are folded into the freeze
+    counters exactly like the same readings added as entries.
+    """
+    # Arrange
+    from src.ft2_reader.parser.ft2_parser import FT2Parser
+    from src.ft2_reader.services.ft2_linker import FT2Linker
+
+    p = tmp_path / "export.csv"
+    p.write_text("device_id,timestamp,temperature\n"
+                 "device_zt1,2024-01-15T08:00:00,4.0\n"
+                 "device_zt1,2024-01-15T08:15:00,-1.0\n"
+                 "device_zt2,2024-01-15T08:30:00,-2.0\n"
+                 "device_zt1,2024-01-15T08:45:00,-0.5\n"
+                 "other,2024-01-15T09:00:00,-3.0\n", encoding="utf-8")
+    zero_tolerance_center.device_ids.append("device_zt2")
+    by_entry = VaccinationCenter(id="c2", name="Entries", device_ids=["device_zt1", "device_zt2"],
+                                 temperature_ranges={}, decision_thresholds={})
+
+    # Act
+    FT2Linker.link_batch(FT2Parser.parse_file_columnar(str(p)), [zero_tolerance_center])
+    FT2Linker.link_grouped(FT2Parser.parse_file(str(p)), [by_entry])
+
+    # Assert
+    assert zero_tolerance_center._count_freeze_events() == by_entry._count_freeze_events() == {
+        "total": 2, "durations": [15.0, 15.0], "by_device": {"device_zt1": 1, "device_zt2": 1}}
+    assert zero_tolerance_center.decision == "REJECTED_FREEZE_SENSITIVE"
+
+def test_initial_freeze_counter_is_kept():
+    """
+    Tests that freeze events passed at construction survive the first sync
+    and count towards the zero-tolerance policy.
+    """
+    # Arrange
+    center = VaccinationCenter(id="c3", name="Carried over", device_ids=["device_zt1"],
+                               temperature_ranges={}, decision_thresholds={},
+                               freeze_event_counter={"device_zt1": 2})
+
+    # Act
+    center.add_ft2_entry(FT2Entry("device_zt1", datetime.now(), -1.0, "Vax", "B1"))
+
+    # Assert
+    assert center.freeze_event_counter == {"device_zt1": 3}
+    assert center._count_freeze_events()["total"] == 3
+    assert center.decision == "REJECTED_FREEZE_SENSITIVE"
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from src.core.calculators.vvm_q10_model import VVMQ10Model
 
@@ -130,3 +131,62 @@ class TestCumulativeDegradation:
         # by checking a very large temperature that might return inf without raising.
         factor = model.calculate_acceleration_factor(20000.0)
         assert factor == float('inf')
+
+class TestVectorizedKernel:
+    """Tests the array API against the scalar path."""
+
+    def test_factors_match_scalar_path(self, model):
+        temps = [-20.0, 0.0, IDEAL_TEMP, 7.5, 15.0, 25.0, 11000.0]
+        factors = model.calculate_acceleration_factors(temps)
+        expected = [model.calculate_acceleration_factor(t) for t in temps]
+        assert factors.tolist() == pytest.approx(expected)
+        assert factors[-1] == float('inf')
+
+    def test_cumulative_array_matches_scalar_path(self, model):
+        readings = [(15.0, 2.0), (5.0, 3.0), (25.0, 1.0), (-1.0, 0.5)]
+        temps, hours = zip(*readings)
+        assert model.calculate_cumulative_degradation_hours_array(temps, hours) == \
+            pytest.approx(model.calculate_cumulative_degradation_hours(readings))
+
+    def test_empty_arrays(self, model):
+        assert model.calculate_cumulative_degradation_hours_array([], []) == 0.0
+
+    @pytest.mark.parametrize("temps, hours", [
+        ([10.0], [-1.0]),          # negative duration
+        ([10.0, 12.0], [1.0]),     # length mismatch
+        (["abc"], [1.0]),          # non-numeric temperature
+    ])
+    def test_invalid_arrays_raise_error(self, model, temps, hours):
+        with pytest.raises(ValueError):
+            model.calculate_cumulative_degradation_hours_array(temps, hours)
+
+
+class TestAccelerationFactorTable:
+    """Tests the quantized 0.1 °C lookup table."""
+
+    def test_table_is_cached_per_profile(self, model):
+        assert model.acceleration_table() is VVMQ10Model(Q10_VALUE, IDEAL_TEMP).acceleration_table()
+        assert model.acceleration_table() is not VVMQ10Model(2.5, IDEAL_TEMP).acceleration_table()
+        assert model.acceleration_table().size == 901
+
+    def test_on_grid_lookup_matches_exact_factors(self, model):
+        temps = np.round(np.arange(-300, 601) * 0.1, 1)
+        table = model.acceleration_table()
+        np.testing.assert_allclose(table.lookup(temps), model.calculate_acceleration_factors(temps), rtol=1e-12)
+
+    def test_off_grid_error_is_within_bound(self, model):
+        table = model.acceleration_table()
+        temps = np.random.default_rng(0).uniform(-30.0, 60.0, 10_000)
+        rel_err = np.abs(table.lookup(temps) / model.calculate_acceleration_factors(temps) - 1.0)
+        assert rel_err.max() <= table.max_relative_error
+        assert table.max_relative_error == pytest.approx(2.0 ** 0.005 - 1.0)
+
+    def test_out_of_range_falls_back_to_exact(self, model):
+        factors = model.acceleration_table().lookup([-45.0, 75.0, 11000.0])
+        assert factors.tolist() == pytest.approx([1.0, 2.0 ** 7.0, float('inf')])
+
+    def test_quantized_degradation_matches_exact_on_grid(self, model):
+        readings = [(15.0, 2.0), (5.0, 3.0), (25.0, 1.0), (-1.0, 0.5)]
+        temps, hours = zip(*readings)
+        assert model.calculate_cumulative_degradation_hours_array(temps, hours, quantized=True) == \
+            pytest.approx(model.calculate_cumulative_degradation_hours(readings))